@@ -4,6 +4,8 @@ from datetime import datetime
 
 
 class Cliente:
+    __slots__ = ("endereco", "contas")
+
     def __init__(self, endereco):
         self.endereco = endereco
         self.contas = []
@@ -16,6 +18,8 @@ class Cliente:
 
 
 class PessoaFisica(Cliente):
+    __slots__ = ("nome", "data_nascimento", "cpf")
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self.nome = nome
@@ -24,6 +28,8 @@ class PessoaFisica(Cliente):
 
 
 class Conta:
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico")
+
     def __init__(self, numero, cliente):
         self._saldo = 0
         self._numero = numero
@@ -84,6 +90,8 @@ class Conta:
 
 
 class ContaCorrente(Conta):
+    __slots__ = ("_limite", "_limite_saques")
+
     def __init__(self, numero, cliente, limite=500, limite_saques=3):
         super().__init__(numero, cliente)
         self._limite = limite
@@ -117,6 +125,8 @@ class ContaCorrente(Conta):
 
 
 class Historico:
+    __slots__ = ("_transacoes",)
+
     def __init__(self):
         self._transacoes = []
 
@@ -135,6 +145,8 @@ class Historico:
 
 
 class Transacao(ABC):
+    __slots__ = ()
+
     @property
     @abstractproperty
     def valor(self):
@@ -146,6 +158,8 @@ class Transacao(ABC):
 
 
 class Saque(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -161,6 +175,8 @@ class Saque(Transacao):
 
 
 class Deposito(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -175,6 +191,56 @@ class Deposito(Transacao):
             conta.historico.adicionar_transacao(self)
 
 
+class RegistroClientes:
+    def __init__(self):
+        self._clientes = {}
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def adicionar(self, cliente):
+        self._clientes[cliente.cpf] = cliente
+
+    def buscar(self, cpf):
+        return self._clientes.get(cpf)
+
+
+class RegistroContas:
+    def __init__(self, agencia="0001"):
+        self.agencia = agencia
+        self._contas = []
+        self._contas_por_chave = {}
+        self._contas_por_cliente = {}
+        self._proximo_numero = 1
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def __len__(self):
+        return len(self._contas)
+
+    def __getitem__(self, indice):
+        return self._contas[indice]
+
+    def proximo_numero(self):
+        return self._proximo_numero
+
+    def adicionar(self, conta):
+        self._contas.append(conta)
+        self._contas_por_chave[(conta.agencia, conta.numero)] = conta
+        self._contas_por_cliente.setdefault(conta.cliente, []).append(conta)
+        self._proximo_numero = max(self._proximo_numero, conta.numero + 1)
+
+    def buscar(self, numero, agencia=None):
+        return self._contas_por_chave.get((agencia or self.agencia, numero))
+
+    def contas_do_cliente(self, cliente):
+        return self._contas_por_cliente.get(cliente, [])
+
+
 def menu():
     menu = """\n
     ================ MENU ================
@@ -190,20 +256,30 @@ def menu():
 
 
 def filtrar_cliente(cpf, clientes):
-    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
-    return clientes_filtrados[0] if clientes_filtrados else None
+    return clientes.buscar(cpf)
 
 
-def recuperar_conta_cliente(cliente):
-    if not cliente.contas:
+def recuperar_conta_cliente(cliente, contas):
+    contas_cliente = contas.contas_do_cliente(cliente)
+    if not contas_cliente:
         print("\n@@@ Cliente não possui conta! @@@")
         return
 
-    # FIXME: não permite cliente escolher a conta
-    return cliente.contas[0]
+    if len(contas_cliente) == 1:
+        return contas_cliente[0]
+
+    numeros = ", ".join(str(conta.numero) for conta in contas_cliente)
+    numero_conta = input(f"Informe o número da conta ({numeros}): ")
+    conta = contas.buscar(int(numero_conta)) if numero_conta.isdigit() else None
+
+    if not conta or conta.cliente is not cliente:
+        print("\n@@@ Conta não encontrada para este cliente! @@@")
+        return
+
+    return conta
 
 
-def depositar(clientes):
+def depositar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -214,14 +290,14 @@ def depositar(clientes):
     valor = float(input("Informe o valor do depósito: "))
     transacao = Deposito(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     cliente.realizar_transacao(conta, transacao)
 
 
-def sacar(clientes):
+def sacar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -232,14 +308,14 @@ def sacar(clientes):
     valor = float(input("Informe o valor do saque: "))
     transacao = Saque(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     cliente.realizar_transacao(conta, transacao)
 
 
-def exibir_extrato(clientes):
+def exibir_extrato(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -247,7 +323,7 @@ def exibir_extrato(clientes):
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
@@ -280,12 +356,12 @@ def criar_cliente(clientes):
 
     cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
 
-    clientes.append(cliente)
+    clientes.adicionar(cliente)
 
     print("\n=== Cliente criado com sucesso! ===")
 
 
-def criar_conta(numero_conta, clientes, contas):
+def criar_conta(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -293,8 +369,9 @@ def criar_conta(numero_conta, clientes, contas):
         print("\n@@@ Cliente não encontrado, fluxo de criação de conta encerrado! @@@")
         return
 
+    numero_conta = contas.proximo_numero()
     conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
-    contas.append(conta)
+    contas.adicionar(conta)
     cliente.contas.append(conta)
 
     print("\n=== Conta criada com sucesso! ===")
@@ -307,27 +384,26 @@ def listar_contas(contas):
 
 
 def main():
-    clientes = []
-    contas = []
+    clientes = RegistroClientes()
+    contas = RegistroContas()
 
     while True:
         opcao = menu()
 
         if opcao == "d":
-            depositar(clientes)
+            depositar(clientes, contas)
 
         elif opcao == "s":
-            sacar(clientes)
+            sacar(clientes, contas)
 
         elif opcao == "e":
-            exibir_extrato(clientes)
+            exibir_extrato(clientes, contas)
 
         elif opcao == "nu":
             criar_cliente(clientes)
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
-            criar_conta(numero_conta, clientes, contas)
+            criar_conta(clientes, contas)
 
         elif opcao == "lc":
             listar_contas(contas)
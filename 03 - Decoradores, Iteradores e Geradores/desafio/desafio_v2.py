@@ -1,6 +1,8 @@
 import textwrap
 from abc import ABC, abstractclassmethod, abstractproperty
-from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
 
 
 class ContasIterador:
@@ -27,6 +29,8 @@ class ContasIterador:
 
 
 class Cliente:
+    __slots__ = ("endereco", "contas", "indice_conta")
+
     def __init__(self, endereco):
         self.endereco = endereco
         self.contas = []
@@ -40,6 +44,8 @@ class Cliente:
 
 
 class PessoaFisica(Cliente):
+    __slots__ = ("nome", "data_nascimento", "cpf")
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self.nome = nome
@@ -48,6 +54,8 @@ class PessoaFisica(Cliente):
 
 
 class Conta:
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico")
+
     def __init__(self, numero, cliente):
         self._saldo = 0
         self._numero = numero
@@ -108,15 +116,15 @@ class Conta:
 
 
 class ContaCorrente(Conta):
+    __slots__ = ("_limite", "_limite_saques")
+
     def __init__(self, numero, cliente, limite=500, limite_saques=3):
         super().__init__(numero, cliente)
         self._limite = limite
         self._limite_saques = limite_saques
 
     def sacar(self, valor):
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == Saque.__name__]
-        )
+        numero_saques = self.historico.quantidade_transacoes(Saque.__name__)
 
         excedeu_limite = valor > self._limite
         excedeu_saques = numero_saques >= self._limite_saques
@@ -141,29 +149,90 @@ class ContaCorrente(Conta):
 
 
 class Historico:
+    __slots__ = ("_valores", "_datas", "_tipos", "_quantidade_por_tipo", "_quantidade_por_dia")
+
+    _EPOCA = datetime(1970, 1, 1)
+    _tipos_transacao = []
+
     def __init__(self):
-        self._transacoes = []
+        # Livro-razão colunar: uma posição por transação em cada array
+        self._valores = array("d")
+        self._datas = array("q")
+        self._tipos = array("B")
+        self._quantidade_por_tipo = {}
+        self._quantidade_por_dia = {}
+
+    def __len__(self):
+        return len(self._valores)
 
     @property
     def transacoes(self):
-        return self._transacoes
+        return list(self.gerar_relatorio())
+
+    @classmethod
+    def _codigo_tipo(cls, tipo):
+        if tipo not in cls._tipos_transacao:
+            cls._tipos_transacao.append(tipo)
+        return cls._tipos_transacao.index(tipo)
+
+    def _transacao(self, indice):
+        return {
+            "tipo": self._tipos_transacao[self._tipos[indice]],
+            "valor": self._valores[indice],
+            "data": self._EPOCA + timedelta(microseconds=self._datas[indice]),
+        }
+
+    @classmethod
+    def _marca_tempo(cls, data, fim_do_dia=False):
+        if not isinstance(data, datetime):
+            horario = datetime.max.time() if fim_do_dia else datetime.min.time()
+            data = datetime.combine(data, horario)
+        return (data - cls._EPOCA) // timedelta(microseconds=1)
 
     def adicionar_transacao(self, transacao):
-        self._transacoes.append(
-            {
-                "tipo": transacao.__class__.__name__,
-                "valor": transacao.valor,
-                "data": datetime.now().strftime("%d-%m-%Y %H:%M:%s"),
-            }
-        )
+        tipo = transacao.__class__.__name__
+        data = datetime.now()
+
+        self._valores.append(transacao.valor)
+        self._datas.append(self._marca_tempo(data))
+        self._tipos.append(self._codigo_tipo(tipo))
 
-    def gerar_relatorio(self, tipo_transacao=None):
-        for transacao in self._transacoes:
-            if tipo_transacao is None or transacao["tipo"].lower() == tipo_transacao.lower():
-                yield transacao
+        self._quantidade_por_tipo[tipo] = self._quantidade_por_tipo.get(tipo, 0) + 1
+        quantidade_dia = self._quantidade_por_dia.setdefault(data.date(), {})
+        quantidade_dia[tipo] = quantidade_dia.get(tipo, 0) + 1
+
+    def quantidade_transacoes(self, tipo_transacao=None, data=None):
+        quantidades = self._quantidade_por_tipo if data is None else self._quantidade_por_dia.get(data, {})
+
+        if tipo_transacao is None:
+            return sum(quantidades.values())
+
+        return quantidades.get(tipo_transacao, 0)
+
+    def gerar_relatorio(self, tipo_transacao=None, data_inicio=None, data_fim=None):
+        codigo = None
+        if tipo_transacao is not None:
+            tipos = [tipo.lower() for tipo in self._tipos_transacao]
+            if tipo_transacao.lower() not in tipos:
+                return
+            codigo = tipos.index(tipo_transacao.lower())
+
+        # Datas gravadas em ordem crescente: o intervalo sai de uma busca binária
+        inicio, fim = 0, len(self._valores)
+        if data_inicio is not None:
+            inicio = bisect_left(self._datas, self._marca_tempo(data_inicio))
+        if data_fim is not None:
+            marca_fim = self._marca_tempo(data_fim, fim_do_dia=True)
+            fim = bisect_right(self._datas, marca_fim)
+
+        for indice in range(inicio, fim):
+            if codigo is None or self._tipos[indice] == codigo:
+                yield self._transacao(indice)
 
 
 class Transacao(ABC):
+    __slots__ = ()
+
     @property
     @abstractproperty
     def valor(self):
@@ -175,6 +244,8 @@ class Transacao(ABC):
 
 
 class Saque(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -190,6 +261,8 @@ class Saque(Transacao):
 
 
 class Deposito(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -204,6 +277,56 @@ class Deposito(Transacao):
             conta.historico.adicionar_transacao(self)
 
 
+class RegistroClientes:
+    def __init__(self):
+        self._clientes = {}
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def adicionar(self, cliente):
+        self._clientes[cliente.cpf] = cliente
+
+    def buscar(self, cpf):
+        return self._clientes.get(cpf)
+
+
+class RegistroContas:
+    def __init__(self, agencia="0001"):
+        self.agencia = agencia
+        self._contas = []
+        self._contas_por_chave = {}
+        self._contas_por_cliente = {}
+        self._proximo_numero = 1
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def __len__(self):
+        return len(self._contas)
+
+    def __getitem__(self, indice):
+        return self._contas[indice]
+
+    def proximo_numero(self):
+        return self._proximo_numero
+
+    def adicionar(self, conta):
+        self._contas.append(conta)
+        self._contas_por_chave[(conta.agencia, conta.numero)] = conta
+        self._contas_por_cliente.setdefault(conta.cliente, []).append(conta)
+        self._proximo_numero = max(self._proximo_numero, conta.numero + 1)
+
+    def buscar(self, numero, agencia=None):
+        return self._contas_por_chave.get((agencia or self.agencia, numero))
+
+    def contas_do_cliente(self, cliente):
+        return self._contas_por_cliente.get(cliente, [])
+
+
 def log_transacao(func):
     def envelope(*args, **kwargs):
         resultado = func(*args, **kwargs)
@@ -228,21 +351,31 @@ def menu():
 
 
 def filtrar_cliente(cpf, clientes):
-    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
-    return clientes_filtrados[0] if clientes_filtrados else None
+    return clientes.buscar(cpf)
 
 
-def recuperar_conta_cliente(cliente):
-    if not cliente.contas:
+def recuperar_conta_cliente(cliente, contas):
+    contas_cliente = contas.contas_do_cliente(cliente)
+    if not contas_cliente:
         print("\n@@@ Cliente não possui conta! @@@")
         return
 
-    # FIXME: não permite cliente escolher a conta
-    return cliente.contas[0]
+    if len(contas_cliente) == 1:
+        return contas_cliente[0]
+
+    numeros = ", ".join(str(conta.numero) for conta in contas_cliente)
+    numero_conta = input(f"Informe o número da conta ({numeros}): ")
+    conta = contas.buscar(int(numero_conta)) if numero_conta.isdigit() else None
+
+    if not conta or conta.cliente is not cliente:
+        print("\n@@@ Conta não encontrada para este cliente! @@@")
+        return
+
+    return conta
 
 
 @log_transacao
-def depositar(clientes):
+def depositar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -253,7 +386,7 @@ def depositar(clientes):
     valor = float(input("Informe o valor do depósito: "))
     transacao = Deposito(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
@@ -261,7 +394,7 @@ def depositar(clientes):
 
 
 @log_transacao
-def sacar(clientes):
+def sacar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -272,15 +405,28 @@ def sacar(clientes):
     valor = float(input("Informe o valor do saque: "))
     transacao = Saque(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     cliente.realizar_transacao(conta, transacao)
 
 
+def gerar_extrato(conta, tamanho_pagina=50, tipo_transacao=None, data_inicio=None, data_fim=None):
+    pagina = []
+    relatorio = conta.historico.gerar_relatorio(tipo_transacao, data_inicio, data_fim)
+    for transacao in relatorio:
+        pagina.append(f"\n{transacao['tipo']}:\n\tR$ {transacao['valor']:.2f}")
+        if len(pagina) == tamanho_pagina:
+            yield "".join(pagina)
+            pagina = []
+
+    if pagina:
+        yield "".join(pagina)
+
+
 @log_transacao
-def exibir_extrato(clientes):
+def exibir_extrato(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -288,21 +434,17 @@ def exibir_extrato(clientes):
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     print("\n================ EXTRATO ================")
-    extrato = ""
     tem_transacao = False
-    for transacao in conta.historico.gerar_relatorio(tipo_transacao="saque"):
+    for pagina in gerar_extrato(conta, tipo_transacao="saque"):
         tem_transacao = True
-        extrato += f"\n{transacao['tipo']}:\n\tR$ {transacao['valor']:.2f}"
-
-    if not tem_transacao:
-        extrato = "Não foram realizadas movimentações"
+        print(pagina, end="")
 
-    print(extrato)
+    print("" if tem_transacao else "Não foram realizadas movimentações")
     print(f"\nSaldo:\n\tR$ {conta.saldo:.2f}")
     print("==========================================")
 
@@ -322,13 +464,13 @@ def criar_cliente(clientes):
 
     cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
 
-    clientes.append(cliente)
+    clientes.adicionar(cliente)
 
     print("\n=== Cliente criado com sucesso! ===")
 
 
 @log_transacao
-def criar_conta(numero_conta, clientes, contas):
+def criar_conta(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -336,8 +478,9 @@ def criar_conta(numero_conta, clientes, contas):
         print("\n@@@ Cliente não encontrado, fluxo de criação de conta encerrado! @@@")
         return
 
+    numero_conta = contas.proximo_numero()
     conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
-    contas.append(conta)
+    contas.adicionar(conta)
     cliente.contas.append(conta)
 
     print("\n=== Conta criada com sucesso! ===")
@@ -350,27 +493,26 @@ def listar_contas(contas):
 
 
 def main():
-    clientes = []
-    contas = []
+    clientes = RegistroClientes()
+    contas = RegistroContas()
 
     while True:
         opcao = menu()
 
         if opcao == "d":
-            depositar(clientes)
+            depositar(clientes, contas)
 
         elif opcao == "s":
-            sacar(clientes)
+            sacar(clientes, contas)
 
         elif opcao == "e":
-            exibir_extrato(clientes)
+            exibir_extrato(clientes, contas)
 
         elif opcao == "nu":
             criar_cliente(clientes)
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
-            criar_conta(numero_conta, clientes, contas)
+            criar_conta(clientes, contas)
 
         elif opcao == "lc":
             listar_contas(contas)
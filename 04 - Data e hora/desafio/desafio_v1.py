@@ -214,6 +214,23 @@ class Deposito(Transacao):
             conta.historico.adicionar_transacao(self)
 
 
+class RegistroClientes:
+    def __init__(self):
+        self._clientes = {}
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def adicionar(self, cliente):
+        self._clientes[cliente.cpf] = cliente
+
+    def buscar(self, cpf):
+        return self._clientes.get(cpf)
+
+
 def log_transacao(func):
     def envelope(*args, **kwargs):
         resultado = func(*args, **kwargs)
@@ -238,8 +255,7 @@ def menu():
 
 
 def filtrar_cliente(cpf, clientes):
-    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
-    return clientes_filtrados[0] if clientes_filtrados else None
+    return clientes.buscar(cpf)
 
 
 def recuperar_conta_cliente(cliente):
@@ -332,7 +348,7 @@ def criar_cliente(clientes):
 
     cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
 
-    clientes.append(cliente)
+    clientes.adicionar(cliente)
 
     print("\n=== Cliente criado com sucesso! ===")
 
@@ -361,7 +377,7 @@ def listar_contas(contas):
 
 
 def main():
-    clientes = []
+    clientes = RegistroClientes()
     contas = []
 
     while True:
@@ -1,6 +1,9 @@
+import atexit
 import textwrap
 from abc import ABC, abstractclassmethod, abstractproperty
-from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
 from pathlib import Path
 
 ROOT_PATH = Path(__file__).parent
@@ -30,13 +33,15 @@ class ContasIterador:
 
 
 class Cliente:
+    __slots__ = ("endereco", "contas", "indice_conta")
+
     def __init__(self, endereco):
         self.endereco = endereco
         self.contas = []
         self.indice_conta = 0
 
     def realizar_transacao(self, conta, transacao):
-        if len(conta.historico.transacoes_do_dia()) >= 2:
+        if conta.historico.quantidade_transacoes(data=datetime.utcnow().date()) >= 2:
             print("\n@@@ Você excedeu o número de transações permitidas para hoje! @@@")
             return
 
@@ -47,6 +52,8 @@ class Cliente:
 
 
 class PessoaFisica(Cliente):
+    __slots__ = ("nome", "data_nascimento", "cpf")
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self.nome = nome
@@ -58,6 +65,8 @@ class PessoaFisica(Cliente):
 
 
 class Conta:
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico")
+
     def __init__(self, numero, cliente):
         self._saldo = 0
         self._numero = numero
@@ -118,6 +127,8 @@ class Conta:
 
 
 class ContaCorrente(Conta):
+    __slots__ = ("_limite", "_limite_saques")
+
     def __init__(self, numero, cliente, limite=500, limite_saques=3):
         super().__init__(numero, cliente)
         self._limite = limite
@@ -128,9 +139,7 @@ class ContaCorrente(Conta):
         return cls(numero, cliente, limite, limite_saques)
 
     def sacar(self, valor):
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == Saque.__name__]
-        )
+        numero_saques = self.historico.quantidade_transacoes(Saque.__name__)
 
         excedeu_limite = valor > self._limite
         excedeu_saques = numero_saques >= self._limite_saques
@@ -158,38 +167,101 @@ class ContaCorrente(Conta):
 
 
 class Historico:
+    __slots__ = ("_valores", "_datas", "_tipos", "_quantidade_por_tipo", "_quantidade_por_dia", "_transacoes_por_dia")
+
+    _EPOCA = datetime(1970, 1, 1)
+    _tipos_transacao = []
+
     def __init__(self):
-        self._transacoes = []
+        # Livro-razão colunar: uma posição por transação em cada array
+        self._valores = array("d")
+        self._datas = array("q")
+        self._tipos = array("B")
+        self._quantidade_por_tipo = {}
+        self._quantidade_por_dia = {}
+        self._transacoes_por_dia = {}
+
+    def __len__(self):
+        return len(self._valores)
 
     @property
     def transacoes(self):
-        return self._transacoes
+        return list(self.gerar_relatorio())
+
+    @classmethod
+    def _codigo_tipo(cls, tipo):
+        if tipo not in cls._tipos_transacao:
+            cls._tipos_transacao.append(tipo)
+        return cls._tipos_transacao.index(tipo)
+
+    def _transacao(self, indice):
+        return {
+            "tipo": self._tipos_transacao[self._tipos[indice]],
+            "valor": self._valores[indice],
+            "data": self._EPOCA + timedelta(microseconds=self._datas[indice]),
+        }
+
+    @classmethod
+    def _marca_tempo(cls, data, fim_do_dia=False):
+        if not isinstance(data, datetime):
+            horario = datetime.max.time() if fim_do_dia else datetime.min.time()
+            data = datetime.combine(data, horario)
+        return (data - cls._EPOCA) // timedelta(microseconds=1)
 
     def adicionar_transacao(self, transacao):
-        self._transacoes.append(
-            {
-                "tipo": transacao.__class__.__name__,
-                "valor": transacao.valor,
-                "data": datetime.utcnow().strftime("%d-%m-%Y %H:%M:%S"),
-            }
-        )
+        tipo = transacao.__class__.__name__
+        data = datetime.utcnow()
+        indice = len(self._valores)
+
+        self._valores.append(transacao.valor)
+        self._datas.append(self._marca_tempo(data))
+        self._tipos.append(self._codigo_tipo(tipo))
+
+        intervalo_dia = self._transacoes_por_dia.setdefault(data.date(), [indice, indice])
+        intervalo_dia[1] = indice + 1
+
+        self._quantidade_por_tipo[tipo] = self._quantidade_por_tipo.get(tipo, 0) + 1
+        quantidade_dia = self._quantidade_por_dia.setdefault(data.date(), {})
+        quantidade_dia[tipo] = quantidade_dia.get(tipo, 0) + 1
 
-    def gerar_relatorio(self, tipo_transacao=None):
-        for transacao in self._transacoes:
-            if tipo_transacao is None or transacao["tipo"].lower() == tipo_transacao.lower():
-                yield transacao
+    def quantidade_transacoes(self, tipo_transacao=None, data=None):
+        quantidades = self._quantidade_por_tipo if data is None else self._quantidade_por_dia.get(data, {})
 
-    def transacoes_do_dia(self):
-        data_atual = datetime.utcnow().date()
-        transacoes = []
-        for transacao in self._transacoes:
-            data_transacao = datetime.strptime(transacao["data"], "%d-%m-%Y %H:%M:%S").date()
-            if data_atual == data_transacao:
-                transacoes.append(transacao)
-        return transacoes
+        if tipo_transacao is None:
+            return sum(quantidades.values())
+
+        return quantidades.get(tipo_transacao, 0)
+
+    def gerar_relatorio(self, tipo_transacao=None, data_inicio=None, data_fim=None):
+        codigo = None
+        if tipo_transacao is not None:
+            tipos = [tipo.lower() for tipo in self._tipos_transacao]
+            if tipo_transacao.lower() not in tipos:
+                return
+            codigo = tipos.index(tipo_transacao.lower())
+
+        # Datas gravadas em ordem crescente: o intervalo sai de uma busca binária
+        inicio, fim = 0, len(self._valores)
+        if data_inicio is not None:
+            inicio = bisect_left(self._datas, self._marca_tempo(data_inicio))
+        if data_fim is not None:
+            marca_fim = self._marca_tempo(data_fim, fim_do_dia=True)
+            fim = bisect_right(self._datas, marca_fim)
+
+        for indice in range(inicio, fim):
+            if codigo is None or self._tipos[indice] == codigo:
+                yield self._transacao(indice)
+
+    def transacoes_do_dia(self, data=None):
+        data = data or datetime.utcnow().date()
+        inicio, fim = self._transacoes_por_dia.get(data, (0, 0))
+        transacoes = (self._transacao(indice) for indice in range(inicio, fim))
+        return [transacao for transacao in transacoes if transacao["data"].date() == data]
 
 
 class Transacao(ABC):
+    __slots__ = ()
+
     @property
     @abstractproperty
     def valor(self):
@@ -201,6 +273,8 @@ class Transacao(ABC):
 
 
 class Saque(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -216,6 +290,8 @@ class Saque(Transacao):
 
 
 class Deposito(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
         self._valor = valor
 
@@ -230,15 +306,98 @@ class Deposito(Transacao):
             conta.historico.adicionar_transacao(self)
 
 
+class RegistroClientes:
+    def __init__(self):
+        self._clientes = {}
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self)} clientes>"
+
+    def adicionar(self, cliente):
+        self._clientes[cliente.cpf] = cliente
+
+    def buscar(self, cpf):
+        return self._clientes.get(cpf)
+
+
+class EscritorLog:
+    def __init__(self, caminho, registros_por_escrita=100):
+        # Junta os registros em memória e grava em lote: a cada N registros e no encerramento do programa
+        self.caminho = caminho
+        self.registros_por_escrita = registros_por_escrita
+        self._buffer = []
+        atexit.register(self.descarregar)
+
+    def escrever(self, registro):
+        self._buffer.append(registro)
+        if len(self._buffer) >= self.registros_por_escrita:
+            self.descarregar()
+
+    def descarregar(self):
+        if not self._buffer:
+            return
+
+        try:
+            with open(self.caminho, "a") as arquivo:
+                arquivo.writelines(self._buffer)
+        except OSError as exc:
+            print(f"ERRO AO ESCREVER LOG: {exc}")
+        self._buffer = []
+
+
+escritor_log = EscritorLog(ROOT_PATH / "log.txt")
+
+
+class RegistroContas:
+    def __init__(self, agencia="0001"):
+        self.agencia = agencia
+        self._contas = []
+        self._contas_por_chave = {}
+        self._contas_por_cliente = {}
+        self._proximo_numero = 1
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def __len__(self):
+        return len(self._contas)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self)} contas>"
+
+    def __getitem__(self, indice):
+        return self._contas[indice]
+
+    def proximo_numero(self):
+        return self._proximo_numero
+
+    def adicionar(self, conta):
+        self._contas.append(conta)
+        self._contas_por_chave[(conta.agencia, conta.numero)] = conta
+        self._contas_por_cliente.setdefault(conta.cliente, []).append(conta)
+        self._proximo_numero = max(self._proximo_numero, conta.numero + 1)
+
+    def buscar(self, numero, agencia=None):
+        return self._contas_por_chave.get((agencia or self.agencia, numero))
+
+    def contas_do_cliente(self, cliente):
+        return self._contas_por_cliente.get(cliente, [])
+
+
 def log_transacao(func):
     def envelope(*args, **kwargs):
         resultado = func(*args, **kwargs)
         data_hora = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        with open(ROOT_PATH / "log.txt", "a") as arquivo:
-            arquivo.write(
-                f"[{data_hora}] Função '{func.__name__}' executada com argumentos {args} e {kwargs}. "
-                f"Retornou {resultado}\n"
-            )
+        escritor_log.escrever(
+            f"[{data_hora}] Função '{func.__name__}' executada com argumentos {args} e {kwargs}. "
+            f"Retornou {resultado}\n"
+        )
         return resultado
 
     return envelope
@@ -259,21 +418,31 @@ def menu():
 
 
 def filtrar_cliente(cpf, clientes):
-    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
-    return clientes_filtrados[0] if clientes_filtrados else None
+    return clientes.buscar(cpf)
 
 
-def recuperar_conta_cliente(cliente):
-    if not cliente.contas:
+def recuperar_conta_cliente(cliente, contas):
+    contas_cliente = contas.contas_do_cliente(cliente)
+    if not contas_cliente:
         print("\n@@@ Cliente não possui conta! @@@")
         return
 
-    # FIXME: não permite cliente escolher a conta
-    return cliente.contas[0]
+    if len(contas_cliente) == 1:
+        return contas_cliente[0]
+
+    numeros = ", ".join(str(conta.numero) for conta in contas_cliente)
+    numero_conta = input(f"Informe o número da conta ({numeros}): ")
+    conta = contas.buscar(int(numero_conta)) if numero_conta.isdigit() else None
+
+    if not conta or conta.cliente is not cliente:
+        print("\n@@@ Conta não encontrada para este cliente! @@@")
+        return
+
+    return conta
 
 
 @log_transacao
-def depositar(clientes):
+def depositar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -284,7 +453,7 @@ def depositar(clientes):
     valor = float(input("Informe o valor do depósito: "))
     transacao = Deposito(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
@@ -292,7 +461,7 @@ def depositar(clientes):
 
 
 @log_transacao
-def sacar(clientes):
+def sacar(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -303,15 +472,28 @@ def sacar(clientes):
     valor = float(input("Informe o valor do saque: "))
     transacao = Saque(valor)
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     cliente.realizar_transacao(conta, transacao)
 
 
+def gerar_extrato(conta, tamanho_pagina=50, tipo_transacao=None, data_inicio=None, data_fim=None):
+    pagina = []
+    relatorio = conta.historico.gerar_relatorio(tipo_transacao, data_inicio, data_fim)
+    for transacao in relatorio:
+        pagina.append(f"\n{transacao['data']:%d-%m-%Y %H:%M:%S}\n{transacao['tipo']}:\n\tR$ {transacao['valor']:.2f}")
+        if len(pagina) == tamanho_pagina:
+            yield "".join(pagina)
+            pagina = []
+
+    if pagina:
+        yield "".join(pagina)
+
+
 @log_transacao
-def exibir_extrato(clientes):
+def exibir_extrato(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -319,21 +501,17 @@ def exibir_extrato(clientes):
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
-    conta = recuperar_conta_cliente(cliente)
+    conta = recuperar_conta_cliente(cliente, contas)
     if not conta:
         return
 
     print("\n================ EXTRATO ================")
-    extrato = ""
     tem_transacao = False
-    for transacao in conta.historico.gerar_relatorio():
+    for pagina in gerar_extrato(conta):
         tem_transacao = True
-        extrato += f"\n{transacao['data']}\n{transacao['tipo']}:\n\tR$ {transacao['valor']:.2f}"
-
-    if not tem_transacao:
-        extrato = "Não foram realizadas movimentações"
+        print(pagina, end="")
 
-    print(extrato)
+    print("" if tem_transacao else "Não foram realizadas movimentações")
     print(f"\nSaldo:\n\tR$ {conta.saldo:.2f}")
     print("==========================================")
 
@@ -353,13 +531,13 @@ def criar_cliente(clientes):
 
     cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
 
-    clientes.append(cliente)
+    clientes.adicionar(cliente)
 
     print("\n=== Cliente criado com sucesso! ===")
 
 
 @log_transacao
-def criar_conta(numero_conta, clientes, contas):
+def criar_conta(clientes, contas):
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
 
@@ -367,8 +545,9 @@ def criar_conta(numero_conta, clientes, contas):
         print("\n@@@ Cliente não encontrado, fluxo de criação de conta encerrado! @@@")
         return
 
+    numero_conta = contas.proximo_numero()
     conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta, limite=500, limite_saques=50)
-    contas.append(conta)
+    contas.adicionar(conta)
     cliente.contas.append(conta)
 
     print("\n=== Conta criada com sucesso! ===")
@@ -381,27 +560,26 @@ def listar_contas(contas):
 
 
 def main():
-    clientes = []
-    contas = []
+    clientes = RegistroClientes()
+    contas = RegistroContas()
 
     while True:
         opcao = menu()
 
         if opcao == "d":
-            depositar(clientes)
+            depositar(clientes, contas)
 
         elif opcao == "s":
-            sacar(clientes)
+            sacar(clientes, contas)
 
         elif opcao == "e":
-            exibir_extrato(clientes)
+            exibir_extrato(clientes, contas)
 
         elif opcao == "nu":
             criar_cliente(clientes)
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
-            criar_conta(numero_conta, clientes, contas)
+            criar_conta(clientes, contas)
 
         elif opcao == "lc":
             listar_contas(contas)
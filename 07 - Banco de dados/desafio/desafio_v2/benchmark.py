@@ -0,0 +1,287 @@
+import csv
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import fields
+from itertools import islice
+from pathlib import Path
+
+from bd import ProvedorConexoes, criar_bd, criar_conexao
+from dominio import PessoaFisica, PessoaJuridica
+from servico import ClienteServico, ler_arquivo_clientes
+
+
+def conexao_sem_ajustes(caminho: Path) -> sqlite3.Connection:
+    # Como criar_conexao abria antes: journal DELETE, synchronous FULL e cache de 2 MiB
+    return sqlite3.connect(caminho)
+
+
+def gerar_clientes(quantidade: int, inicio: int = 0) -> list[PessoaFisica]:
+    return [
+        PessoaFisica(
+            nome=f"Cliente {numero}",
+            cpf=f"{numero:011d}",
+            renda_mensal=1000.0 + numero % 5000,
+            email=f"cliente{numero}@email.com",
+            telefone=f"11 9{numero:08d}",
+            status="ativo",
+        )
+        for numero in range(inicio, inicio + quantidade)
+    ]
+
+
+def inserir(servico: ClienteServico, cliente: PessoaFisica) -> None:
+    # Mesmos comandos de ClienteServico.criar_cliente, sem os input()
+    cliente_id = servico._criar_cliente(cliente=cliente)
+    servico.cursor.execute(
+        "INSERT INTO pessoa_fisica (cliente_id, nome, cpf, renda_mensal) VALUES (?,?,?,?)",
+        (cliente_id, cliente.nome, cliente.cpf, cliente.renda_mensal),
+    )
+
+
+def medir(
+    conexao: sqlite3.Connection, quantidade_commits: int, quantidade_lote: int, leituras: int
+) -> dict[str, float]:
+    cursor = conexao.cursor()
+    cursor.row_factory = sqlite3.Row
+    criar_bd(cursor=cursor)
+    servico = ClienteServico(cursor=cursor)
+
+    # Um commit por cliente, como o menu do main()
+    inicio = time.perf_counter()
+    for cliente in gerar_clientes(quantidade_commits):
+        inserir(servico, cliente)
+        conexao.commit()
+    tempo_commits = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for cliente in gerar_clientes(quantidade_lote, inicio=quantidade_commits):
+        inserir(servico, cliente)
+    conexao.commit()
+    tempo_lote = time.perf_counter() - inicio
+
+    total = quantidade_commits + quantidade_lote
+    inicio = time.perf_counter()
+    for numero in range(leituras):
+        servico.filtrar_cliente(f"{numero * 7919 % total:011d}")
+    tempo_leituras = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    cursor.execute("SELECT * FROM pessoa_fisica pf INNER JOIN cliente c ON c.id = pf.cliente_id;")
+    linhas = len(cursor.fetchall())
+    tempo_listagem = time.perf_counter() - inicio
+
+    return {
+        "commits": quantidade_commits / tempo_commits,
+        "lote": quantidade_lote / tempo_lote,
+        "leituras": leituras / tempo_leituras,
+        "listagem": linhas / tempo_listagem,
+    }
+
+
+def medir_threads(caminho: Path, threads: int, leituras_por_thread: int, total: int) -> float:
+    # Leituras concorrentes, cada thread com a sua conexão do provedor, enquanto outra thread grava
+    provedor = ProvedorConexoes(caminho)
+    parar = threading.Event()
+
+    def escrever():
+        numero = total
+        while not parar.is_set():
+            with provedor.transacao() as cursor:
+                inserir(ClienteServico(cursor=cursor), gerar_clientes(1, inicio=numero)[0])
+            numero += 1
+
+    def ler():
+        servico = ClienteServico(cursor=provedor.conexao().cursor())
+        for numero in range(leituras_por_thread):
+            servico.filtrar_cliente(f"{numero * 7919 % total:011d}")
+
+    escritor = threading.Thread(target=escrever)
+    leitores = [threading.Thread(target=ler) for _ in range(threads)]
+    escritor.start()
+    inicio = time.perf_counter()
+    for leitor in leitores:
+        leitor.start()
+    for leitor in leitores:
+        leitor.join()
+    tempo = time.perf_counter() - inicio
+    parar.set()
+    escritor.join()
+    provedor.fechar()
+    return threads * leituras_por_thread / tempo
+
+
+def benchmark_conexoes(quantidade_commits=2_000, quantidade_lote=100_000, leituras=100_000, threads=4):
+    print(
+        f"=== SQLite: {quantidade_commits:,} clientes com commit próprio, {quantidade_lote:,} em um commit, "
+        f"{leituras:,} buscas por CPF ==="
+    )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultados = {}
+        for descricao, abrir in (("Sem ajustes", conexao_sem_ajustes), ("criar_conexao (WAL)", criar_conexao)):
+            caminho = Path(diretorio) / f"{len(resultados)}.sqlite"
+            conexao = abrir(caminho)
+            resultados[descricao] = medir(conexao, quantidade_commits, quantidade_lote, leituras)
+            conexao.close()
+
+        print(f"{'(linhas/s)':<22}{'commit por cliente':>20}{'um commit':>14}{'busca por CPF':>16}{'listagem':>14}")
+        for descricao, taxas in resultados.items():
+            print(
+                f"{descricao:<22}{taxas['commits']:>20,.0f}{taxas['lote']:>14,.0f}"
+                f"{taxas['leituras']:>16,.0f}{taxas['listagem']:>14,.0f}"
+            )
+
+        total = quantidade_commits + quantidade_lote
+        taxa_threads = medir_threads(Path(diretorio) / "1.sqlite", threads, leituras // threads, total)
+        print(f"Buscas com {threads} threads (ProvedorConexoes) e uma gravando: {taxa_threads:,.0f}/s")
+
+
+CAMPOS_ARQUIVO = (
+    "email",
+    "telefone",
+    "status",
+    "nome",
+    "cpf",
+    "renda_mensal",
+    "nome_fantasia",
+    "cnpj",
+    "faturamento_anual",
+)
+
+
+def gerar_linhas_arquivo(quantidade: int, inicio: int = 0):
+    # Nove pessoas físicas para cada pessoa jurídica
+    for numero in range(inicio, inicio + quantidade):
+        if numero % 10:
+            yield {
+                "email": f"cliente{numero}@email.com",
+                "telefone": f"11 9{numero:08d}",
+                "status": "ativo",
+                "nome": f"Cliente {numero}",
+                "cpf": f"{numero:011d}",
+                "renda_mensal": 1000.0 + numero % 5000,
+            }
+        else:
+            yield {
+                "email": f"empresa{numero}@email.com",
+                "telefone": f"11 3{numero:07d}",
+                "status": "ativo",
+                "nome_fantasia": f"Empresa {numero}",
+                "cnpj": f"{numero:014d}",
+                "faturamento_anual": 100000.0 + numero % 50000,
+            }
+
+
+def cliente_da_linha(classe: type, linha: dict):
+    # No CSV, cada linha traz também as colunas (vazias) do outro tipo de cliente
+    return classe(**{campo.name: linha.get(campo.name) for campo in fields(classe)})
+
+
+def escrever_arquivos(diretorio: Path, quantidade: int) -> tuple[Path, Path]:
+    arquivo_csv = diretorio / "clientes.csv"
+    with open(arquivo_csv, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_ARQUIVO)
+        escritor.writeheader()
+        escritor.writerows(gerar_linhas_arquivo(quantidade))
+
+    arquivo_jsonl = diretorio / "clientes.jsonl"
+    with open(arquivo_jsonl, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(json.dumps(linha) + "\n" for linha in gerar_linhas_arquivo(quantidade))
+
+    return arquivo_csv, arquivo_jsonl
+
+
+def benchmark_importacao(quantidade=1_000_000, quantidade_interativa=100_000):
+    print(f"=== Importação de {quantidade:,} clientes (ClienteServico.importar_arquivo) ===")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        diretorio = Path(diretorio)
+        arquivo_csv, arquivo_jsonl = escrever_arquivos(diretorio, quantidade)
+
+        # Só a leitura e a validação do CSV: o limite para qualquer forma de gravar
+        inicio = time.perf_counter()
+        lidas = sum(1 for _ in ler_arquivo_clientes(arquivo_csv))
+        print(f"{'Leitura do CSV, sem gravar':<34}: {lidas / (time.perf_counter() - inicio):12,.0f} linhas/s")
+
+        # Antes: as mesmas linhas do CSV, cada uma como criar_cliente (consulta do documento, um INSERT
+        # por tabela e cursor.lastrowid), num commit só
+        conexao = criar_conexao(diretorio / "interativo.sqlite")
+        cursor = conexao.cursor()
+        cursor.row_factory = sqlite3.Row
+        servico = ClienteServico(cursor=cursor)
+        criar_bd(cursor=servico.cursor)
+        inicio = time.perf_counter()
+        for linha in islice(ler_arquivo_clientes(arquivo_csv), quantidade_interativa):
+            if servico.filtrar_cliente(linha.get("cpf") or linha["cnpj"]):
+                continue
+            if linha.get("cpf"):
+                cliente = cliente_da_linha(PessoaFisica, linha)
+                cliente_id = servico._criar_cliente(cliente=cliente)
+                servico.cursor.execute(
+                    "INSERT INTO pessoa_fisica (cliente_id, nome, cpf, renda_mensal) VALUES (?,?,?,?)",
+                    (cliente_id, cliente.nome, cliente.cpf, cliente.renda_mensal),
+                )
+            else:
+                cliente = cliente_da_linha(PessoaJuridica, linha)
+                cliente_id = servico._criar_cliente(cliente=cliente)
+                servico.cursor.execute(
+                    "INSERT INTO pessoa_juridica (cliente_id, nome_fantasia, cnpj, faturamento_anual) VALUES (?,?,?,?)",
+                    (cliente_id, cliente.nome_fantasia, cliente.cnpj, cliente.faturamento_anual),
+                )
+        conexao.commit()
+        taxa_interativa = quantidade_interativa / (time.perf_counter() - inicio)
+        conexao.close()
+        print(f"{'Um cliente por vez (lastrowid)':<34}: {taxa_interativa:12,.0f} linhas/s")
+
+        for arquivo in (arquivo_csv, arquivo_jsonl):
+            conexao = criar_conexao(diretorio / f"{arquivo.suffix[1:]}.sqlite")
+            servico = ClienteServico(cursor=conexao.cursor())
+            criar_bd(cursor=servico.cursor)
+            resultado = servico.importar_arquivo(arquivo)
+            print(f"{'importar_arquivo ' + arquivo.name:<34}: {resultado}")
+
+            # Cada cliente com exatamente um registro de pessoa física ou jurídica
+            servico.cursor.execute(
+                """
+                SELECT COUNT(*) FROM cliente c
+                LEFT JOIN pessoa_fisica pf ON pf.cliente_id = c.id
+                LEFT JOIN pessoa_juridica pj ON pj.cliente_id = c.id
+                WHERE (pf.cliente_id IS NULL) = (pj.cliente_id IS NULL);
+                """
+            )
+            assert servico.cursor.fetchone()[0] == 0
+            conexao.close()
+
+        # Reimportar: todos os documentos já existem e são ignorados
+        conexao = criar_conexao(diretorio / "csv.sqlite")
+        resultado = ClienteServico(cursor=conexao.cursor()).importar_arquivo(arquivo_csv)
+        print(f"{'Reimportação do mesmo CSV':<34}: {resultado}")
+
+        # Arquivo com erro na última linha: nada é importado, e a transação aberta antes continua
+        arquivo_invalido = diretorio / "invalido.jsonl"
+        with open(arquivo_invalido, "w", encoding="utf-8") as arquivo:
+            arquivo.writelines(json.dumps(linha) + "\n" for linha in gerar_linhas_arquivo(1_000, inicio=quantidade))
+            arquivo.write("{sem fechar\n")
+        cursor = conexao.cursor()
+        cursor.execute("SELECT COUNT(*) FROM cliente;")
+        total_antes = cursor.fetchone()[0]
+        cursor.execute("INSERT INTO cliente (email, telefone, status) VALUES ('externo', '0', 'ativo');")
+        try:
+            # Lotes pequenos: os primeiros já foram gravados quando a linha inválida é lida
+            ClienteServico(cursor=cursor).importar_arquivo(arquivo_invalido, tamanho_lote=100)
+        except ValueError as exc:
+            print(f"{'Importação com linha inválida':<34}: {exc}")
+        assert conexao.in_transaction
+        conexao.commit()
+        cursor.execute("SELECT COUNT(*) FROM cliente;")
+        assert cursor.fetchone()[0] == total_antes + 1, "A importação inválida deixou clientes gravados"
+        conexao.close()
+
+
+if __name__ == "__main__":
+    benchmark_conexoes()
+    print()
+    benchmark_importacao()
@@ -10,6 +10,7 @@ def menu():
     ================ MENU ================
     [1]\tNovo cliente
     [2]\tListar clientes
+    [3]\tImportar clientes (CSV/JSON-lines)
     [0]\tSair
     => """
     return input(textwrap.dedent(menu))
@@ -31,6 +32,8 @@ def main():
                 conexao.commit()
             case "2":
                 servico.listar_clientes()
+            case "3":
+                servico.importar_clientes()
             case "0":
                 break
             case _:
@@ -1,7 +1,94 @@
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
 from sqlite3 import Cursor
 
 from dominio import Cliente, PessoaFisica, PessoaJuridica
 
+FORMATOS_JSON_LINHAS = (".jsonl", ".ndjson")
+
+# Campos obrigatórios de cada linha do arquivo, conforme o documento informado; o último é numérico
+CAMPOS_PESSOA_FISICA = ("email", "telefone", "nome", "renda_mensal")
+CAMPOS_PESSOA_JURIDICA = ("email", "telefone", "faturamento_anual")
+
+
+@dataclass
+class ResultadoImportacao:
+    importados: int = 0
+    ignorados: int = 0
+    segundos: float = 0.0
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        return (self.importados + self.ignorados) / self.segundos if self.segundos else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.importados:,} clientes importados, {self.ignorados:,} ignorados (documento já cadastrado) "
+            f"em {self.segundos:.1f} s ({self.linhas_por_segundo:,.0f} linhas/s)"
+        )
+
+
+def ler_arquivo_clientes(caminho: Path | str) -> Iterator[dict]:
+    """Lê os clientes de um CSV com cabeçalho ou de um JSON-lines, uma linha por vez.
+
+    Campos: email, telefone e status (opcional, "ativo" se vazio), mais nome, cpf e renda_mensal para
+    pessoa física ou nome_fantasia, cnpj e faturamento_anual para pessoa jurídica. Uma linha malformada
+    ou sem algum campo obrigatório gera ValueError com o número da linha.
+    """
+    caminho = Path(caminho)
+    formato = caminho.suffix.lower()
+    if formato != ".csv" and formato not in FORMATOS_JSON_LINHAS:
+        raise ValueError(f"Formato não suportado: {caminho.name} (use .csv, .jsonl ou .ndjson)")
+
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        if formato == ".csv":
+            leitor = csv.DictReader(arquivo)
+            for linha in leitor:
+                yield _validar_linha(linha, leitor.line_num)
+        else:
+            for numero, texto in enumerate(arquivo, start=1):
+                if not texto.strip():
+                    continue
+                try:
+                    linha = json.loads(texto)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Linha {numero}: JSON inválido ({exc.msg})") from None
+                yield _validar_linha(linha, numero)
+
+
+def _validar_linha(linha: dict, numero: int) -> dict:
+    if not isinstance(linha, dict):
+        raise ValueError(f"Linha {numero}: esperado um objeto com os dados do cliente")
+    if linha.get("cpf"):
+        obrigatorios = CAMPOS_PESSOA_FISICA
+    elif linha.get("cnpj"):
+        obrigatorios = CAMPOS_PESSOA_JURIDICA
+    else:
+        raise ValueError(f"Linha {numero}: cliente sem CPF ou CNPJ")
+
+    # No CSV, colunas ausentes no cabeçalho ou na linha chegam como None
+    faltando = [campo for campo in obrigatorios if linha.get(campo) in (None, "")]
+    if faltando:
+        raise ValueError(f"Linha {numero}: campo(s) obrigatório(s) ausente(s): {', '.join(faltando)}")
+
+    campo = obrigatorios[-1]
+    try:
+        linha[campo] = float(linha[campo])
+    except (TypeError, ValueError):
+        raise ValueError(f"Linha {numero}: {campo} não é um número: {linha[campo]!r}") from None
+    return linha
+
+
+def _em_lotes(linhas: Iterable[dict], tamanho_lote: int) -> Iterator[list[dict]]:
+    linhas = iter(linhas)
+    while lote := list(islice(linhas, tamanho_lote)):
+        yield lote
+
 
 class ClienteServico:
     def __init__(self, cursor: Cursor) -> None:
@@ -71,6 +158,107 @@ class ClienteServico:
 
         print("\n=== Cliente criado com sucesso! ===")
 
+    def importar_clientes(self) -> None:
+        caminho = input("Informe o arquivo de clientes (.csv ou .jsonl): ")
+        try:
+            resultado = self.importar_arquivo(caminho)
+        except (OSError, ValueError) as exc:
+            print(f"\n@@@ Não foi possível importar os clientes: {exc} @@@")
+            return
+
+        print(f"\n=== {resultado} ===")
+
+    def importar_arquivo(self, caminho: Path | str, tamanho_lote: int = 50_000) -> ResultadoImportacao:
+        """Importa todos os clientes do arquivo, ou nenhum; lê e grava de tamanho_lote em tamanho_lote.
+
+        Clientes cujo CPF/CNPJ já está cadastrado (ou repetido no arquivo) são ignorados. A importação
+        roda em um SAVEPOINT: um erro desfaz só o que ela gravou, e uma transação já aberta por quem
+        chamou continua aberta. Sem transação aberta, os clientes ficam gravados ao final.
+        """
+        resultado = ResultadoImportacao()
+        inicio = time.perf_counter()
+        conexao = self.cursor.connection
+        self.cursor.execute("SAVEPOINT importacao;")
+        try:
+            for lote in _em_lotes(ler_arquivo_clientes(caminho), tamanho_lote):
+                self._importar_lote(lote, resultado)
+        except BaseException:
+            # Alguns erros do SQLite já desfazem a transação inteira, e o SAVEPOINT junto
+            if conexao.in_transaction:
+                self.cursor.execute("ROLLBACK TO importacao;")
+                self.cursor.execute("RELEASE importacao;")
+            raise
+        self.cursor.execute("RELEASE importacao;")
+
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def _importar_lote(self, linhas: list[dict], resultado: ResultadoImportacao) -> None:
+        documentos = [self._documento(linha) for linha in linhas]
+        cadastrados = self._documentos_cadastrados(documentos)
+        # Ids atribuídos aqui, em sequência, no lugar do cursor.lastrowid de cada INSERT. Se outra conexão
+        # gravar clientes entre esta leitura e os INSERTs, o SQLite recusa a escrita (SQLITE_BUSY) e a
+        # importação é desfeita
+        proximo_id = self._proximo_id_cliente()
+
+        clientes, pessoas_fisicas, pessoas_juridicas = [], [], []
+        for linha, documento in zip(linhas, documentos):
+            if documento in cadastrados:
+                resultado.ignorados += 1
+                continue
+            cadastrados.add(documento)
+
+            cliente_id = proximo_id + len(clientes)
+            clientes.append((cliente_id, linha["email"], linha["telefone"], linha.get("status") or "ativo"))
+            if linha.get("cpf"):
+                pessoas_fisicas.append((cliente_id, linha["nome"], documento, linha["renda_mensal"]))
+            else:
+                pessoas_juridicas.append(
+                    (cliente_id, linha.get("nome_fantasia") or None, documento, linha["faturamento_anual"])
+                )
+
+        self.cursor.executemany(
+            "INSERT INTO cliente (id, email, telefone, status) VALUES (?,?,?,?);",
+            clientes,
+        )
+        self.cursor.executemany(
+            "INSERT INTO pessoa_fisica (cliente_id, nome, cpf, renda_mensal) VALUES (?,?,?,?);",
+            pessoas_fisicas,
+        )
+        self.cursor.executemany(
+            "INSERT INTO pessoa_juridica (cliente_id, nome_fantasia, cnpj, faturamento_anual) VALUES (?,?,?,?);",
+            pessoas_juridicas,
+        )
+        resultado.importados += len(clientes)
+
+    def _documento(self, linha: dict) -> str:
+        # Linhas já validadas por ler_arquivo_clientes: sempre há CPF ou CNPJ
+        return str(linha.get("cpf") or linha.get("cnpj"))
+
+    def _documentos_cadastrados(self, documentos: list[str]) -> set[str]:
+        # Uma consulta por lote: a lista de documentos vai como um único parâmetro JSON
+        self.cursor.execute(
+            """
+            SELECT cpf FROM pessoa_fisica WHERE cpf IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT cnpj FROM pessoa_juridica WHERE cnpj IN (SELECT value FROM json_each(?));
+            """,
+            (json.dumps(documentos),) * 2,
+        )
+        return {linha[0] for linha in self.cursor.fetchall()}
+
+    def _proximo_id_cliente(self) -> int:
+        # Como o AUTOINCREMENT: depois do maior id já usado, mesmo que o cliente tenha sido apagado
+        self.cursor.execute(
+            """
+            SELECT MAX(
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'cliente'), 0),
+                COALESCE((SELECT MAX(id) FROM cliente), 0)
+            ) + 1;
+            """
+        )
+        return self.cursor.fetchone()[0]
+
     def listar_clientes(self) -> None:
         self.cursor.execute("SELECT * FROM pessoa_fisica pf INNER JOIN cliente c ON c.id = pf.cliente_id;")
         clientes = self.cursor.fetchall()
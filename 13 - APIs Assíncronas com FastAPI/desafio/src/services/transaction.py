@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from databases.interfaces import Record
 
 from src.database import database
@@ -19,29 +21,33 @@ class TransactionService:
         if not account:
             raise AccountNotFoundError
 
+        # Balance math in integer cents: NUMERIC(10, 2) values stay exact, no float rounding drift
+        balance_cents = round(account.balance * 100)
+        amount_cents = round(transaction.amount * 100)
+
         if transaction.type == TransactionType.WITHDRAWAL:
-            balance = float(account.balance) - transaction.amount
-            if balance < 0:
+            balance_cents -= amount_cents
+            if balance_cents < 0:
                 raise BusinessError("Operation not carried out due to lack of balance")
         else:
-            balance = float(account.balance) + transaction.amount
+            balance_cents += amount_cents
 
         # Create transaction entry
-        transaction_id = await self.__register_transaction(transaction)
+        transaction_id = await self.__register_transaction(transaction, amount_cents)
         # Update account balance
-        await self.__update_account_balance(transaction.account_id, balance)
+        await self.__update_account_balance(transaction.account_id, balance_cents)
 
         query = transactions.select().where(transactions.c.id == transaction_id)
         return await database.fetch_one(query)
 
-    async def __update_account_balance(self, account_id: int, balance: float) -> None:
-        command = accounts.update().where(accounts.c.id == account_id).values(balance=balance)
+    async def __update_account_balance(self, account_id: int, balance_cents: int) -> None:
+        command = accounts.update().where(accounts.c.id == account_id).values(balance=Decimal(balance_cents) / 100)
         await database.execute(command)
 
-    async def __register_transaction(self, transaction: TransactionIn) -> int:
+    async def __register_transaction(self, transaction: TransactionIn, amount_cents: int) -> int:
         command = transactions.insert().values(
             account_id=transaction.account_id,
             type=transaction.type,
-            amount=transaction.amount,
+            amount=Decimal(amount_cents) / 100,
         )
         return await database.execute(command)
@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import numpy as np
+
+from banco_gu_V2 import Historico
+
+# ==============================================================================
+# ANÁLISES VETORIZADAS SOBRE O LIVRO-RAZÃO DO BANCO
+# Requer NumPy (pip install numpy); a aplicação em banco_gu_V2.py não depende deste módulo.
+# ==============================================================================
+
+MICROSSEGUNDOS_POR_DIA = 86_400_000_000
+EPOCA_DIAS = np.datetime64("1970-01-01", "D")
+
+
+class LivroRazao:
+    """Todas as transações do banco em colunas NumPy, uma linha por transação.
+
+    Colunas: valores (centavos, int64), datas (µs desde 1970, int64), tipos (código em
+    Historico._tipos_transacao, uint8) e conta (posição em `contas`, int32). As linhas de uma mesma
+    conta são contíguas e em ordem cronológica, como no Historico de onde vieram.
+    """
+
+    __slots__ = ("valores", "datas", "tipos", "conta", "contas")
+
+    def __init__(self, valores, datas, tipos, conta, contas):
+        self.valores = valores
+        self.datas = datas
+        self.tipos = tipos
+        self.conta = conta
+        self.contas = contas
+
+    def __len__(self):
+        return len(self.valores)
+
+    @classmethod
+    def do_banco(cls, contas):
+        contas = list(contas)
+        valores, datas, tipos, quantidades = [], [], [], []
+
+        for conta in contas:
+            quantidade = 0
+            for parte_valores, parte_datas, parte_tipos, nomes_tipos in conta.historico._partes():
+                if not len(parte_valores):
+                    continue
+                # Visões sem cópia sobre os arrays do Historico e os segmentos mapeados em disco
+                codigos = np.frombuffer(parte_tipos, dtype=np.uint8)
+                if nomes_tipos is not Historico._tipos_transacao:
+                    # Segmentos selados guardam seus próprios nomes de tipo: traduz para os códigos atuais
+                    codigos = _codigos_atuais(nomes_tipos)[codigos]
+                valores.append(np.frombuffer(parte_valores, dtype=np.int64))
+                datas.append(np.frombuffer(parte_datas, dtype=np.int64))
+                tipos.append(codigos)
+                quantidade += len(parte_valores)
+            quantidades.append(quantidade)
+
+        if not valores:
+            vazio = np.empty(0, dtype=np.int64)
+            return cls(vazio, vazio, np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int32), contas)
+
+        conta = np.repeat(np.arange(len(contas), dtype=np.int32), quantidades)
+        return cls(np.concatenate(valores), np.concatenate(datas), np.concatenate(tipos), conta, contas)
+
+    def codigos(self, *nomes_tipos):
+        return [Historico._tipos_transacao.index(nome) for nome in nomes_tipos if nome in Historico._tipos_transacao]
+
+    def entradas(self):
+        # 1 nas linhas de tipos que entram no saldo (Historico._TIPOS_ENTRADA), 0 nas demais
+        entrada = np.zeros(256, dtype=np.intp)
+        entrada[self.codigos(*Historico._TIPOS_ENTRADA)] = 1
+        return entrada[self.tipos]
+
+
+def _codigos_atuais(nomes_tipos):
+    return np.array([Historico._codigo_tipo(nome) for nome in nomes_tipos], dtype=np.uint8)
+
+
+def _somar_por_grupo(grupos, pesos, quantidade_grupos):
+    # bincount soma em float64, exato para totais de até 2**53 centavos (R$ 90 trilhões)
+    return np.bincount(grupos, weights=pesos, minlength=quantidade_grupos).round().astype(np.int64)
+
+
+def resumo_diario(livro):
+    """Entradas, saídas (centavos) e quantidade de transações por dia, em arrays alinhados.
+
+    `periodo` é um array datetime64[D] com os dias que tiveram movimento.
+    """
+    if not len(livro):
+        vazio = np.empty(0, dtype=np.int64)
+        return {"periodo": vazio.astype("datetime64[D]"), "entradas": vazio, "saidas": vazio, "quantidade": vazio}
+
+    dias = livro.datas // MICROSSEGUNDOS_POR_DIA
+    primeiro = int(dias.min())
+    quantidade_dias = int(dias.max()) - primeiro + 1
+
+    # Um único agrupamento por (dia, é entrada): a coluna 1 soma as entradas e a coluna 0 as saídas
+    grupos = (dias - primeiro) * 2 + livro.entradas()
+    somas = _somar_por_grupo(grupos, livro.valores, 2 * quantidade_dias).reshape(-1, 2)
+    quantidades = np.bincount(grupos, minlength=2 * quantidade_dias).reshape(-1, 2).sum(axis=1)
+
+    # Só os dias com movimento
+    com_movimento = np.flatnonzero(quantidades)
+    return {
+        "periodo": EPOCA_DIAS + primeiro + com_movimento,
+        "entradas": somas[com_movimento, 1],
+        "saidas": somas[com_movimento, 0],
+        "quantidade": quantidades[com_movimento],
+    }
+
+
+def resumo_mensal(livro):
+    """Como resumo_diario, agrupando por mês (`periodo` em datetime64[M])."""
+    # Parte do resumo diário, que tem no máximo um item por dia, em vez de converter cada transação
+    diario = resumo_diario(livro)
+    meses, inicio_mes = np.unique(diario["periodo"].astype("datetime64[M]"), return_index=True)
+    if not len(meses):
+        return dict(diario, periodo=meses)
+
+    resumo = {chave: np.add.reduceat(diario[chave], inicio_mes) for chave in ("entradas", "saidas", "quantidade")}
+    resumo["periodo"] = meses
+    return resumo
+
+
+def maiores_contas(livro, n=10):
+    """As n contas com maior volume movimentado (soma de todos os valores), da maior para a menor.
+
+    Retorna uma lista de (conta, volume em centavos).
+    """
+    volumes = _somar_por_grupo(livro.conta, livro.valores, len(livro.contas))
+    n = min(n, len(volumes))
+    if n == 0:
+        return []
+
+    maiores = np.argpartition(volumes, len(volumes) - n)[-n:]
+    maiores = maiores[np.argsort(volumes[maiores])[::-1]]
+    return [(livro.contas[indice], int(volumes[indice])) for indice in maiores]
+
+
+def velocidade_saques(livro, quantidade=3, janela_minutos=60):
+    """Contas com `quantidade` saques ou mais dentro de qualquer janela de `janela_minutos`.
+
+    Retorna uma lista de (conta, data do primeiro saque da janela, número de janelas suspeitas).
+    """
+    if quantidade < 2:
+        # Com um saque só, toda conta que sacou seria suspeita: a comparação abaixo precisa de um par
+        raise ValueError(f"quantidade deve ser pelo menos 2, recebido {quantidade}.")
+
+    saques = np.isin(livro.tipos, livro.codigos("Saque"))
+    conta = livro.conta[saques]
+    datas = livro.datas[saques]
+    if len(datas) < quantidade:
+        return []
+
+    # As linhas de cada conta já estão em ordem cronológica: compara cada saque com o
+    # (quantidade - 1)-ésimo seguinte, que só conta se for da mesma conta
+    passo = quantidade - 1
+    fim = len(datas) - passo
+    suspeitas = (conta[passo:] == conta[:fim]) & (datas[passo:] - datas[:fim] <= janela_minutos * 60_000_000)
+    posicoes = np.flatnonzero(suspeitas)
+    if not len(posicoes):
+        return []
+
+    contas_suspeitas, primeiras, janelas = np.unique(conta[posicoes], return_index=True, return_counts=True)
+    return [
+        (livro.contas[indice], Historico._EPOCA + timedelta(microseconds=int(datas[posicoes[primeira]])), int(total))
+        for indice, primeira, total in zip(contas_suspeitas, primeiras, janelas)
+    ]
@@ -1,44 +1,261 @@
+import time
+
+# Início da importação do módulo: primeira marca do relatório de inicialização da interface
+INICIO_IMPORTACAO = time.perf_counter()
+
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import font as tkfont, messagebox, simpledialog
 import textwrap
 from abc import ABC, abstractclassmethod, abstractproperty
-from datetime import datetime
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_EVEN, Decimal
 import functools
+import atexit
+import itertools
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
 
 # ==============================================================================
 # 0. DECORADOR DE LOG EM ARQUIVO
 # ==============================================================================
 
-def log_transacao(funcao):
+# "texto": log.txt legível | "json": log.jsonl (uma linha por registro) + índice log.jsonl.idx
+FORMATO_LOG = "texto"
+
+# Só são registradas chamadas com nível >= NIVEL_LOG (níveis do módulo logging); None desliga o log
+NIVEL_LOG = logging.INFO
+
+# Índice lateral do log JSON: (número da conta, posição em bytes do registro no log)
+ENTRADA_INDICE = struct.Struct("<qq")
+
+# Posições agrupadas por conta, lidas do .idx na primeira consulta a um log (ler_log_conta) e depois
+# acrescentadas pelo EscritorLog a cada gravação: caminho absoluto do log -> {número da conta: array}
+_indices_log = {}
+_trava_indices_log = threading.Lock()
+
+
+def _agrupar_indice(posicoes, dados):
+    for numero_conta, posicao in ENTRADA_INDICE.iter_unpack(dados):
+        posicoes[numero_conta].append(posicao)
+
+
+class EscritorLog:
+    def __init__(self, caminho, registros_por_escrita=100, intervalo_ms=1000, fsync=False, limite_buffer=100_000):
+        # Modos de durabilidade: escreve a cada N registros, a cada intervalo_ms
+        # ou no encerramento do programa; fsync força a gravação no disco.
+        self.caminho = caminho
+        self.registros_por_escrita = registros_por_escrita
+        self.intervalo_ms = intervalo_ms
+        self.fsync = fsync
+        self.limite_buffer = limite_buffer
+        self.descartados = 0
+        # Registros cujo formatador levantou exceção; no lugar deles vai uma linha de falha
+        self.falhas_formatacao = 0
+        self._buffer = []
+        self._trava_buffer = threading.Lock()
+        self._trava_arquivo = threading.Lock()
+        self._acordar = threading.Event()
+        self._encerrado = False
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        atexit.register(self.fechar)
+
+    @property
+    def caminho_indice(self):
+        return f"{self.caminho}.idx"
+
+    def tem_espaco(self):
+        if len(self._buffer) < self.limite_buffer:
+            return True
+
+        self.descartados += 1
+        return False
+
+    def escrever(self, formatar, *dados):
+        # O registro só é formatado pela thread de escrita: formatar(*dados) -> (texto, contas)
+        with self._trava_buffer:
+            self._buffer.append((formatar, dados))
+            buffer_cheio = len(self._buffer) >= self.registros_por_escrita
+
+        if buffer_cheio:
+            self._acordar.set()
+
+    def descarregar(self):
+        with self._trava_buffer:
+            registros, self._buffer = self._buffer, []
+
+        if not registros:
+            return
+
+        with self._trava_arquivo:
+            try:
+                indice = bytearray()
+                with open(self.caminho, "ab") as arquivo:
+                    posicao = arquivo.tell()
+                    for formatar, dados_registro in registros:
+                        try:
+                            registro, contas = formatar(*dados_registro)
+                        except Exception as exc:
+                            # Um registro com defeito não pode parar a thread de escrita
+                            self.falhas_formatacao += 1
+                            registro, contas = self._registro_falha(formatar, exc), ()
+                        dados = registro.encode("utf-8")
+                        arquivo.write(dados)
+                        for numero_conta in contas:
+                            indice += ENTRADA_INDICE.pack(numero_conta, posicao)
+                        posicao += len(dados)
+
+                    if self.fsync:
+                        arquivo.flush()
+                        os.fsync(arquivo.fileno())
+
+                if indice:
+                    # Arquivo e índice em memória juntos: uma leitura do .idx nunca conta uma entrada duas vezes
+                    with _trava_indices_log:
+                        with open(self.caminho_indice, "ab") as arquivo_indice:
+                            arquivo_indice.write(indice)
+                            if self.fsync:
+                                arquivo_indice.flush()
+                                os.fsync(arquivo_indice.fileno())
+                        posicoes = _indices_log.get(os.path.abspath(self.caminho))
+                        if posicoes is not None:
+                            _agrupar_indice(posicoes, indice)
+            except OSError as exc:
+                print(f"ERRO AO ESCREVER LOG: {exc}")
+
+    def _registro_falha(self, formatar, exc):
+        nome = getattr(formatar, "__name__", repr(formatar))
+        if self.caminho.endswith(".jsonl"):
+            registro = {"data": datetime.now().isoformat(timespec="seconds"), "erro_log": f"{nome}: {exc!r}"}
+            return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+        return f"[LOG {datetime.now():%d-%m-%y %H:%M}]\nERRO AO FORMATAR REGISTRO: {nome}: {exc!r}\n---\n"
+
+    def fechar(self):
+        if self._encerrado:
+            return
+
+        self._encerrado = True
+        self._acordar.set()
+        self._thread.join()
+        self.descarregar()
+
+    def _executar(self):
+        while not self._encerrado:
+            self._acordar.wait(self.intervalo_ms / 1000)
+            self._acordar.clear()
+            self.descarregar()
+
+
+escritor_log = EscritorLog("log.jsonl" if FORMATO_LOG == "json" else "log.txt")
+
+
+def ler_log_conta(caminho, numero_conta):
+    """Lê apenas os registros JSON de uma conta, saltando direto para eles pelo índice.
+
+    O .idx é lido uma vez por log; as consultas seguintes usam as posições já agrupadas por conta.
+    """
+    chave = os.path.abspath(caminho)
+    with _trava_indices_log:
+        posicoes_por_conta = _indices_log.get(chave)
+        if posicoes_por_conta is None:
+            posicoes_por_conta = defaultdict(functools.partial(array, "q"))
+            with open(f"{caminho}.idx", "rb") as arquivo_indice:
+                _agrupar_indice(posicoes_por_conta, arquivo_indice.read())
+            _indices_log[chave] = posicoes_por_conta
+        posicoes = posicoes_por_conta.get(numero_conta, array("q"))[:]
+
+    with open(caminho, "rb") as arquivo:
+        for posicao in posicoes:
+            arquivo.seek(posicao)
+            yield json.loads(arquivo.readline())
+
+
+def _identificador_log(valor):
+    # Identificadores estáveis no lugar de reprs como <__main__.ContaCorrente object at 0x...>
+    if isinstance(valor, Conta):
+        return {"agencia": valor.agencia, "numero": valor.numero}
+    if isinstance(valor, PessoaFisica):
+        return {"cpf": valor.cpf}
+    if isinstance(valor, Transacao):
+        return {"tipo": valor.__class__.__name__, "valor": _identificador_log(valor.valor)}
+    if isinstance(valor, Dinheiro):
+        return f"{valor:.2f}"
+    if isinstance(valor, type):
+        return valor.__name__
+    if isinstance(valor, (list, tuple)):
+        return [_identificador_log(item) for item in valor]
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    return str(valor)
+
+
+def _registro_json(nome_funcao, data_hora, args, resultado):
+    contas = {valor.numero for valor in (*args, resultado) if isinstance(valor, Conta)}
+    registro = {
+        "data": data_hora.isoformat(timespec="seconds"),
+        "funcao": nome_funcao,
+        "contas": sorted(contas),
+        "args": _identificador_log(args),
+        "retorno": _identificador_log(resultado),
+    }
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n", contas
+
+
+def _registro_texto(nome_funcao, data_hora, args, resultado):
+    args_formatados = [f"{arg}" for i, arg in enumerate(args) if i != 0]
+
+    if isinstance(resultado, tuple):
+        valor_retornado = f"Sucesso: {resultado[0]} | Mensagem: '{resultado[1]}'"
+    else:
+        valor_retornado = f"'{resultado}'"
+
+    log_entry = textwrap.dedent(f"""\
+        [LOG {data_hora:%d-%m-%y %H:%M}]
+        Função: {nome_funcao}
+        Args: ({', '.join(args_formatados)})
+        Retorno: {valor_retornado}
+        ---
+    """)
+    return log_entry, ()
+
+
+def log_transacao(funcao=None, *, nivel=logging.INFO, amostragem=1):
+    # Uso: @log_transacao ou @log_transacao(nivel=logging.DEBUG, amostragem=100).
+    # nivel e amostragem (registra 1 a cada N chamadas) também podem ser alterados
+    # depois, ex.: Conta.depositar.amostragem = 1000 durante uma carga em massa.
+    if funcao is None:
+        return functools.partial(log_transacao, nivel=nivel, amostragem=amostragem)
+
+    chamadas = itertools.count()
+
     @functools.wraps(funcao)
     def wrapper(*args, **kwargs):
-        data_hora = datetime.now().strftime("%d-%m-%y %H:%M"), 
-        nome_funcao = funcao.__name__
-        
         resultado = funcao(*args, **kwargs)
-        
-        args_formatados = [f"{arg}" for i, arg in enumerate(args) if i != 0] 
-        
-        if isinstance(resultado, tuple):
-             valor_retornado = f"Sucesso: {resultado[0]} | Mensagem: '{resultado[1]}'"
-        else:
-             valor_retornado = f"'{resultado}'"
 
-        log_entry = textwrap.dedent(f"""\
-            [LOG {data_hora}]
-            Função: {nome_funcao}
-            Args: ({', '.join(args_formatados)})
-            Retorno: {valor_retornado}
-            ---
-        """)
+        if NIVEL_LOG is None or wrapper.nivel < NIVEL_LOG:
+            return resultado
+        if wrapper.amostragem > 1 and next(chamadas) % wrapper.amostragem:
+            return resultado
+        if not escritor_log.tem_espaco():
+            return resultado
 
-        try:
-            with open("log.txt", "a") as file:
-                file.write(log_entry)
-        except Exception as e:
-            print(f"ERRO AO ESCREVER LOG: {e}") 
+        formatar = _registro_json if FORMATO_LOG == "json" else _registro_texto
+        escritor_log.escrever(formatar, funcao.__name__, datetime.now(), args, resultado)
 
         return resultado
+
+    wrapper.nivel = nivel
+    wrapper.amostragem = amostragem
     return wrapper
 
 
@@ -46,39 +263,128 @@ def log_transacao(funcao):
 # 1. MODELO DE DADOS AVANÇADO (LÓGICA DE NEGÓCIO)
 # ==============================================================================
 
+# --- Valores Monetários (centavos inteiros) ---
+
+class Dinheiro(int):
+    """Valor em centavos inteiros: contas exatas, com a velocidade de int.
+
+    Reais só entram (Dinheiro.de_reais) e saem (f"R$ {valor:.2f}") nas bordas do sistema.
+    Operações entre valores devolvem int comum, também em centavos.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def de_reais(cls, valor):
+        if isinstance(valor, Dinheiro):
+            return valor
+        if isinstance(valor, (str, Decimal)):
+            centavos = Decimal(valor).scaleb(2).to_integral_value(rounding=ROUND_HALF_EVEN)
+            return cls(centavos)
+        return cls(round(valor * 100))
+
+    @property
+    def reais(self):
+        return Decimal(int(self)).scaleb(-2)
+
+    def __format__(self, formato):
+        # Especificações numéricas (".2f", ",.2f", ">12.2f"...) formatam o valor em reais
+        if formato.endswith(("f", "F")):
+            return format(self.reais, formato)
+        return super().__format__(formato)
+
+    def __str__(self):
+        return f"{self:.2f}"
+
+    def __repr__(self):
+        return f"Dinheiro('{self:.2f}')"
+
+
 # --- ITERADOR para a Lista de Contas ---
 class ContasIterador:
-    # ... (código ContasIterador permanece o mesmo)
-    def __init__(self, contas):
+    """Resumos das contas (resumo_conta), em ordem.
+
+    Aceita fatias e páginas sem percorrer as contas anteriores: iterador[1000:1050] e
+    iterador.pagina(20, 50) devolvem outro ContasIterador só com a janela pedida.
+    """
+
+    def __init__(self, contas, indices=None):
         self.contas = contas
+        self._indices = range(len(contas)) if indices is None else indices
         self._index = 0
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        try:
-            conta = self.contas[self._index]
-            self._index += 1
-            return f"""\
-            Agência:\t{conta.agencia}
-            Número:\t\t{conta.numero}
-            Titular:\t{conta.cliente.nome}
-            Saldo:\t\tR$ {conta.saldo:.2f}
-        """
-        except IndexError:
+        if self._index >= len(self._indices):
             raise StopIteration
+        conta = self.contas[self._indices[self._index]]
+        self._index += 1
+        return resumo_conta(conta)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, indice):
+        # Índices relativos à janela deste iterador; fatiar um range não copia nada
+        if isinstance(indice, slice):
+            return ContasIterador(self.contas, self._indices[indice])
+        return resumo_conta(self.contas[self._indices[indice]])
+
+    def pagina(self, numero, tamanho=50):
+        inicio = numero * tamanho
+        return self[inicio:inicio + tamanho]
+
+    def quantidade_paginas(self, tamanho=50):
+        return -(-len(self) // tamanho)
+
+
+# Posições em Conta._resumo: [saldo, nome do titular, resumo, linha da lista, chave de busca]
+RESUMO_TEXTO, RESUMO_LINHA, RESUMO_CHAVE = 2, 3, 4
+
+
+def _textos_conta(conta):
+    # Textos da conta já montados para o saldo e o nome atuais; descartados quando um dos dois muda.
+    # Cada texto só é montado na primeira vez em que é pedido.
+    saldo = conta._saldo
+    nome = conta.cliente.nome
+    textos = conta._resumo
+    if textos is None or textos[0] != saldo or textos[1] != nome:
+        textos = conta._resumo = [saldo, nome, None, None, None]
+    return textos
+
+
+def resumo_conta(conta):
+    """Resumo de várias linhas da conta, já sem recuo.
+
+    O texto fica guardado na conta junto com o saldo e o nome do titular usados para montá-lo, e só é
+    refeito quando um dos dois muda: listar de novo as mesmas contas não formata nada.
+    """
+    textos = _textos_conta(conta)
+    if textos[RESUMO_TEXTO] is None:
+        textos[RESUMO_TEXTO] = (
+            f"Agência:\t{conta.agencia}\n"
+            f"Número:\t\t{conta.numero}\n"
+            f"Titular:\t{textos[1]}\n"
+            f"Saldo:\t\tR$ {Dinheiro(textos[0]):.2f}\n"
+        )
+    return textos[RESUMO_TEXTO]
 
 # --- Classes de Cliente e Pessoa ---
 
 class Cliente:
+    # Cliente, Conta, Historico e Transacao declaram __slots__: com milhões de contas e movimentos em memória,
+    # cada objeto deixa de carregar um __dict__ próprio (ver benchmark_memoria_objetos)
+    __slots__ = ("endereco", "contas")
+
     def __init__(self, endereco):
         self.endereco = endereco
         self.contas = []
 
     @log_transacao
     def realizar_transacao(self, conta, transacao):
-        transacao.registrar(conta) 
+        return transacao.registrar(conta)
 
     def adicionar_conta(self, conta):
         self.contas.append(conta)
@@ -88,6 +394,8 @@ class Cliente:
         raise NotImplementedError("A classe filha deve implementar o nome.")
 
 class PessoaFisica(Cliente):
+    __slots__ = ("_nome", "data_nascimento", "_cpf")
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self._nome = nome
@@ -105,12 +413,16 @@ class PessoaFisica(Cliente):
 # --- Classes de Conta ---
 
 class Conta:
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico", "_resumo")
+
     def __init__(self, numero, cliente):
         self._saldo = 0
         self._numero = numero
         self._agencia = "0001"
         self._cliente = cliente
         self._historico = Historico()
+        # Textos da conta para o saldo e o nome atuais (resumo_conta, formatar_linha_conta, chave_busca_conta)
+        self._resumo = None
 
     @classmethod
     @log_transacao
@@ -119,7 +431,7 @@ class Conta:
 
     @property
     def saldo(self):
-        return self._saldo
+        return Dinheiro(self._saldo)
 
     @property
     def numero(self):
@@ -137,76 +449,539 @@ class Conta:
     def historico(self):
         return self._historico
 
+    # Regras de negócio compartilhadas por sacar/depositar e por processar_lote.
+    # Retornam o motivo da recusa ou None quando a operação é permitida.
+    def _recusa_limites(self, valor, numero_saques):
+        return None
+
+    def _recusa_saldo(self, valor, saldo):
+        if valor > saldo:
+            return "Você não tem saldo suficiente."
+        elif valor <= 0:
+            return "O valor informado é inválido."
+        return None
+
+    def _recusa_deposito(self, valor):
+        if valor <= 0:
+            return "O valor informado é inválido."
+        return None
+
+    def _recusa_transferencia(self, valor, destino, numero_transferencias):
+        if destino is self:
+            return "A conta de destino deve ser diferente da conta de origem."
+        return None
+
     @log_transacao
     def sacar(self, valor):
-        saldo = self.saldo
-        excedeu_saldo = valor > saldo
+        valor = Dinheiro.de_reais(valor)
+        motivo_recusa = self._recusa_saldo(valor, self._saldo)
 
-        if excedeu_saldo:
-            return False, "Você não tem saldo suficiente."
-        elif valor <= 0:
-            return False, "O valor informado é inválido."
+        if motivo_recusa:
+            return False, motivo_recusa
         else:
             self._saldo -= valor
             return True, f"Saque de R$ {valor:.2f} realizado com sucesso."
 
     @log_transacao
     def depositar(self, valor):
-        if valor > 0:
+        valor = Dinheiro.de_reais(valor)
+        motivo_recusa = self._recusa_deposito(valor)
+
+        if motivo_recusa:
+            return False, motivo_recusa
+        else:
             self._saldo += valor
             return True, f"Depósito de R$ {valor:.2f} realizado com sucesso."
+
+    @log_transacao
+    def transferir(self, valor, destino):
+        # Débito e crédito só acontecem juntos: todas as regras são verificadas antes
+        valor = Dinheiro.de_reais(valor)
+        numero_transferencias = self.historico.quantidade_transacoes(Transferencia.__name__)
+        motivo_recusa = self._recusa_transferencia(valor, destino, numero_transferencias)
+        motivo_recusa = motivo_recusa or self._recusa_saldo(valor, self._saldo)
+
+        if motivo_recusa:
+            return False, motivo_recusa
         else:
-            return False, "O valor informado é inválido."
+            self._saldo -= valor
+            destino._saldo += valor
+            return True, f"Transferência de R$ {valor:.2f} para a conta {destino.numero} realizada com sucesso."
 
 
 class ContaCorrente(Conta):
+    __slots__ = ("_limite", "_limite_saques")
+
     def __init__(self, numero, cliente, limite=500, limite_saques=3):
         super().__init__(numero, cliente)
-        self._limite = limite
+        self._limite = Dinheiro.de_reais(limite)
         self._limite_saques = limite_saques
 
-    @log_transacao
-    def sacar(self, valor):
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == Saque.__name__]
-        )
-
+    def _recusa_limites(self, valor, numero_saques):
         excedeu_limite = valor > self._limite
         excedeu_saques = numero_saques >= self._limite_saques
 
         if excedeu_limite:
-            return False, f"O valor do saque excede o limite de R$ {self._limite:.2f}."
+            return f"O valor do saque excede o limite de R$ {self._limite:.2f}."
         elif excedeu_saques:
-            return False, "Número máximo de saques diários excedido."
+            return "Número máximo de saques diários excedido."
+        return None
+
+    def _recusa_transferencia(self, valor, destino, numero_transferencias):
+        if valor > self._limite:
+            return f"O valor da transferência excede o limite de R$ {self._limite:.2f}."
+        elif numero_transferencias >= self._limite_saques:
+            return "Número máximo de transferências diárias excedido."
+        return super()._recusa_transferencia(valor, destino, numero_transferencias)
+
+    @log_transacao
+    def sacar(self, valor):
+        valor = Dinheiro.de_reais(valor)
+        numero_saques = self.historico.quantidade_transacoes(Saque.__name__)
+        motivo_recusa = self._recusa_limites(valor, numero_saques)
+
+        if motivo_recusa:
+            return False, motivo_recusa
         else:
             return super().sacar(valor) 
 
 # --- Historico ---
 
 class Historico:
-    # ... (código Historico, Transacao, Saque, Deposito permanecem o mesmo)
+    __slots__ = (
+        "_valores",
+        "_datas",
+        "_tipos",
+        "_saldos",
+        "_entradas",
+        "_saldo_acumulado",
+        "_entradas_acumuladas",
+        "_soma_por_tipo",
+        "_quantidade_por_tipo",
+        "_quantidade_por_dia",
+        "_segmentos",
+        "_contrapartes",
+        "_versao",
+    )
+
+    _EPOCA = datetime(1970, 1, 1)
+    _tipos_transacao = []
+    _trava_tipos = threading.Lock()
+    # Tipos que somam ao saldo; os demais (Saque, Transferencia) subtraem
+    _TIPOS_ENTRADA = ("Deposito", "Recebimento")
+
     def __init__(self):
-        self._transacoes = []
+        # Livro-razão colunar: uma posição por transação em cada array (valores em centavos)
+        self._valores = array("q")
+        self._datas = array("q")
+        self._tipos = array("B")
+        # Somas acumuladas após cada transação (saldo movimentado e total de entradas): com elas,
+        # saldo em uma data e totais de um período saem de buscas binárias em _datas
+        self._saldos = array("q")
+        self._entradas = array("q")
+        self._saldo_acumulado = 0
+        self._entradas_acumuladas = 0
+        self._soma_por_tipo = {}
+        self._quantidade_por_tipo = {}
+        self._quantidade_por_dia = {}
+        # Trechos antigos selados em disco (SegmentoHistorico), do mais antigo para o mais recente
+        self._segmentos = []
+        # Entradas de transferência: posição no histórico -> (número da outra conta, posição da
+        # entrada correspondente no histórico dela). Posições contam desde a transação mais antiga,
+        # então não mudam quando parte do histórico é selada.
+        self._contrapartes = {}
+        # Ímpar enquanto transações são anexadas: quem lê o histórico de outra thread, sem a trava
+        # da conta (o snapshot da persistência), repete a leitura até pegar um número par e igual
+        # antes e depois (ver estado_snapshot)
+        self._versao = 0
+
+    def __len__(self):
+        return sum(len(segmento) for segmento in self._segmentos) + len(self._valores)
 
     @property
     def transacoes(self):
-        return self._transacoes
+        return list(self.gerar_relatorio())
+
+    @classmethod
+    def _codigo_tipo(cls, tipo):
+        if tipo not in cls._tipos_transacao:
+            # Lista compartilhada por todas as contas: duas threads não podem registrar o mesmo tipo
+            with cls._trava_tipos:
+                if tipo not in cls._tipos_transacao:
+                    cls._tipos_transacao.append(tipo)
+        return cls._tipos_transacao.index(tipo)
+
+    def _partes(self):
+        # (valores, datas, tipos, nomes dos tipos): segmentos selados e depois a cauda em memória
+        for segmento in self._segmentos:
+            yield segmento.valores, segmento.datas, segmento.tipos, segmento.nomes_tipos
+        yield self._valores, self._datas, self._tipos, self._tipos_transacao
+
+    def _partes_acumuladas(self):
+        for segmento in self._segmentos:
+            yield segmento.datas, segmento.saldos, segmento.entradas
+        yield self._datas, self._saldos, self._entradas
+
+    @classmethod
+    def _marca_tempo(cls, data, fim_do_dia=False):
+        if not isinstance(data, datetime):
+            horario = datetime.max.time() if fim_do_dia else datetime.min.time()
+            data = datetime.combine(data, horario)
+        return (data - cls._EPOCA) // timedelta(microseconds=1)
 
     def adicionar_transacao(self, transacao):
-        self._transacoes.append(
-            {
-                "tipo": transacao.__class__.__name__,
-                "valor": transacao.valor,
-                "data": datetime.now().strftime("%d-%m-%y %H:%M"),  
+        tipo = transacao.__class__.__name__
+        data = datetime.now()
+
+        self._versao += 1
+        try:
+            self._valores.append(transacao.valor)
+            self._datas.append(self._marca_tempo(data))
+            self._tipos.append(self._codigo_tipo(tipo))
+            self._acumular((tipo,), (transacao.valor,))
+
+            # Contadores incrementais: evitam percorrer todo o histórico a cada saque
+            self._quantidade_por_tipo[tipo] = self._quantidade_por_tipo.get(tipo, 0) + 1
+            quantidade_dia = self._quantidade_por_dia.setdefault(data.date(), {})
+            quantidade_dia[tipo] = quantidade_dia.get(tipo, 0) + 1
+        finally:
+            self._versao += 1
+
+    def adicionar_transacoes(self, tipos, valores, data=None):
+        """Anexa um lote de transações de uma só vez, todas com a data do lote."""
+        data = data or datetime.now()
+        codigos = {tipo: self._codigo_tipo(tipo) for tipo in set(tipos)}
+
+        self._versao += 1
+        try:
+            self._valores.extend(valores)
+            self._datas.extend(array("q", [self._marca_tempo(data)]) * len(valores))
+            self._tipos.extend(codigos[tipo] for tipo in tipos)
+            self._acumular(tipos, valores)
+
+            quantidade_dia = self._quantidade_por_dia.setdefault(data.date(), {})
+            for tipo, quantidade in Counter(tipos).items():
+                self._quantidade_por_tipo[tipo] = self._quantidade_por_tipo.get(tipo, 0) + quantidade
+                quantidade_dia[tipo] = quantidade_dia.get(tipo, 0) + quantidade
+        finally:
+            self._versao += 1
+
+    def estado_snapshot(self):
+        """Cópia coerente do histórico para o snapshot, mesmo com outra thread anexando transações.
+
+        Retorna (segmentos, quantidade em memória, por_tipo, soma_por_tipo, saldo_acumulado,
+        entradas_acumuladas, contrapartes, por_dia). Os arrays só crescem, então as primeiras
+        quantidade posições de cada um já são as do estado copiado.
+        """
+        while True:
+            versao = self._versao
+            if versao % 2 == 0:
+                try:
+                    estado = (
+                        list(self._segmentos),
+                        len(self._tipos),
+                        dict(self._quantidade_por_tipo),
+                        dict(self._soma_por_tipo),
+                        self._saldo_acumulado,
+                        self._entradas_acumuladas,
+                        dict(self._contrapartes),
+                        {data: dict(quantidades) for data, quantidades in self._quantidade_por_dia.items()},
+                    )
+                except RuntimeError:
+                    # Dicionário alterado durante a cópia: a versão também mudou
+                    estado = None
+                if estado is not None and self._versao == versao:
+                    return estado
+            time.sleep(0)
+
+    def _acumular(self, tipos, valores):
+        saldo, entradas = self._saldo_acumulado, self._entradas_acumuladas
+        saldos, totais_entradas = [], []
+
+        for tipo, valor in zip(tipos, valores):
+            self._soma_por_tipo[tipo] = self._soma_por_tipo.get(tipo, 0) + valor
+            if tipo in self._TIPOS_ENTRADA:
+                saldo += valor
+                entradas += valor
+            else:
+                saldo -= valor
+            saldos.append(saldo)
+            totais_entradas.append(entradas)
+
+        self._saldos.extend(saldos)
+        self._entradas.extend(totais_entradas)
+        self._saldo_acumulado, self._entradas_acumuladas = saldo, entradas
+
+    def vincular(self, indice, numero_conta, indice_contraparte):
+        """Liga a transação na posição indice à entrada indice_contraparte do histórico da conta numero_conta."""
+        self._contrapartes[indice] = (numero_conta, indice_contraparte)
+
+    def contraparte(self, indice):
+        """(número da conta, posição no histórico dela) da outra ponta de uma transferência, ou None."""
+        if indice < 0:
+            indice += len(self)
+        return self._contrapartes.get(indice)
+
+    def anexar(self, outro, nomes_tipos, acumulados_base=None):
+        """Anexa as transações em memória de outro Historico, montado a partir das somas acumuladas deste.
+
+        nomes_tipos é a lista de tipos (Historico._tipos_transacao) do processo em que outro foi montado.
+        acumulados_base é o (saldo acumulado, entradas acumuladas) deste quando outro foi montado: se este
+        recebeu transações desde então, as somas acumuladas de outro são deslocadas pela diferença.
+        """
+        desvio_saldo = desvio_entradas = 0
+        if acumulados_base is not None:
+            desvio_saldo = self._saldo_acumulado - acumulados_base[0]
+            desvio_entradas = self._entradas_acumuladas - acumulados_base[1]
+        saldos = outro._saldos
+        if desvio_saldo:
+            saldos = array("q", [saldo + desvio_saldo for saldo in saldos])
+        entradas = outro._entradas
+        if desvio_entradas:
+            entradas = array("q", [entrada + desvio_entradas for entrada in entradas])
+
+        deslocamento = len(self)
+        for indice, contraparte in outro._contrapartes.items():
+            self._contrapartes[deslocamento + indice] = contraparte
+
+        tabela_tipos = bytearray(range(256))
+        tabela_tipos[: len(nomes_tipos)] = bytes(self._codigo_tipo(tipo) for tipo in nomes_tipos)
+
+        self._versao += 1
+        try:
+            self._valores.extend(outro._valores)
+            self._datas.extend(outro._datas)
+            self._saldos.extend(saldos)
+            self._entradas.extend(entradas)
+            self._tipos.frombytes(outro._tipos.tobytes().translate(tabela_tipos))
+            self._saldo_acumulado = outro._saldo_acumulado + desvio_saldo
+            self._entradas_acumuladas = outro._entradas_acumuladas + desvio_entradas
+
+            # Somas e contadores de outro começam do zero: são acrescentados aos deste
+            for tipo, soma in outro._soma_por_tipo.items():
+                self._soma_por_tipo[tipo] = self._soma_por_tipo.get(tipo, 0) + soma
+            for tipo, quantidade in outro._quantidade_por_tipo.items():
+                self._quantidade_por_tipo[tipo] = self._quantidade_por_tipo.get(tipo, 0) + quantidade
+            for data, quantidades in outro._quantidade_por_dia.items():
+                quantidade_dia = self._quantidade_por_dia.setdefault(data, {})
+                for tipo, quantidade in quantidades.items():
+                    quantidade_dia[tipo] = quantidade_dia.get(tipo, 0) + quantidade
+        finally:
+            self._versao += 1
+
+    def _acumulado_ate(self, marca):
+        # (saldo, entradas) acumulados até a última transação com data <= marca
+        acumulado = (0, 0)
+        for datas, saldos, entradas in self._partes_acumuladas():
+            if not len(datas) or datas[0] > marca:
+                break
+            indice = bisect_right(datas, marca) - 1
+            acumulado = (saldos[indice], entradas[indice])
+        return acumulado
+
+    def saldo_em(self, data):
+        """Saldo movimentado pelas transações do histórico até o fim de data (busca binária)."""
+        return Dinheiro(self._acumulado_ate(self._marca_tempo(data, fim_do_dia=True))[0])
+
+    def totais(self, data_inicio=None, data_fim=None):
+        """Entradas, saídas, saldo e quantidade por tipo do período (sem datas: do histórico todo).
+
+        Valores vêm das somas acumuladas, em O(log n). A quantidade por tipo de um período soma os
+        contadores diários, um por dia do intervalo.
+        """
+        if data_inicio is None and data_fim is None:
+            saldo, entradas = self._saldo_acumulado, self._entradas_acumuladas
+            return {
+                "entradas": Dinheiro(entradas),
+                "saidas": Dinheiro(entradas - saldo),
+                "saldo": Dinheiro(saldo),
+                "quantidade_por_tipo": dict(self._quantidade_por_tipo),
             }
+
+        saldo_inicio, entradas_inicio = (0, 0)
+        if data_inicio is not None:
+            saldo_inicio, entradas_inicio = self._acumulado_ate(self._marca_tempo(data_inicio) - 1)
+        saldo_fim, entradas_fim = self._saldo_acumulado, self._entradas_acumuladas
+        if data_fim is not None:
+            saldo_fim, entradas_fim = self._acumulado_ate(self._marca_tempo(data_fim, fim_do_dia=True))
+
+        quantidades = {}
+        if self._quantidade_por_dia:
+            dia = min(self._quantidade_por_dia) if data_inicio is None else data_inicio
+            ultimo_dia = max(self._quantidade_por_dia) if data_fim is None else data_fim
+            dia = dia.date() if isinstance(dia, datetime) else dia
+            ultimo_dia = ultimo_dia.date() if isinstance(ultimo_dia, datetime) else ultimo_dia
+            while dia <= ultimo_dia:
+                for tipo, quantidade in self._quantidade_por_dia.get(dia, {}).items():
+                    quantidades[tipo] = quantidades.get(tipo, 0) + quantidade
+                dia += timedelta(days=1)
+
+        entradas = entradas_fim - entradas_inicio
+        saldo = saldo_fim - saldo_inicio
+        return {
+            "entradas": Dinheiro(entradas),
+            "saidas": Dinheiro(entradas - saldo),
+            "saldo": Dinheiro(saldo),
+            "quantidade_por_tipo": quantidades,
+        }
+
+    def totais_mes(self, ano, mes):
+        primeiro_dia = date(ano, mes, 1)
+        ultimo_dia = date(ano + mes // 12, mes % 12 + 1, 1) - timedelta(days=1)
+        return self.totais(primeiro_dia, ultimo_dia)
+
+    def soma_transacoes(self, tipo_transacao):
+        return Dinheiro(self._soma_por_tipo.get(tipo_transacao, 0))
+
+    def quantidade_transacoes(self, tipo_transacao=None, data=None):
+        quantidades = self._quantidade_por_tipo if data is None else self._quantidade_por_dia.get(data, {})
+
+        if tipo_transacao is None:
+            return sum(quantidades.values())
+
+        return quantidades.get(tipo_transacao, 0)
+
+    def gerar_relatorio(self, tipo_transacao=None, data_inicio=None, data_fim=None):
+        marca_inicio = None if data_inicio is None else self._marca_tempo(data_inicio)
+        marca_fim = None if data_fim is None else self._marca_tempo(data_fim, fim_do_dia=True)
+
+        contrapartes = self._contrapartes
+        posicao_parte = 0
+        for valores, datas, tipos, nomes_tipos in self._partes():
+            # Posição da primeira transação desta parte no histórico inteiro
+            base, posicao_parte = posicao_parte, posicao_parte + len(valores)
+            codigo = None
+            if tipo_transacao is not None:
+                nomes = [nome.lower() for nome in nomes_tipos]
+                if tipo_transacao.lower() not in nomes:
+                    continue
+                codigo = nomes.index(tipo_transacao.lower())
+
+            # Datas gravadas em ordem crescente: o intervalo sai de uma busca binária
+            inicio, fim = 0, len(valores)
+            if marca_inicio is not None:
+                inicio = bisect_left(datas, marca_inicio)
+            if marca_fim is not None:
+                fim = bisect_right(datas, marca_fim)
+
+            for indice in range(inicio, fim):
+                if codigo is None or tipos[indice] == codigo:
+                    yield {
+                        "tipo": nomes_tipos[tipos[indice]],
+                        "valor": Dinheiro(valores[indice]),
+                        "data": self._EPOCA + timedelta(microseconds=datas[indice]),
+                        "contraparte": contrapartes.get(base + indice),
+                    }
+
+    def transacao(self, indice):
+        """Transação na posição indice (0 é a mais antiga), no formato de gerar_relatorio."""
+        if indice < 0:
+            indice += len(self)
+
+        contraparte = self._contrapartes.get(indice)
+        for valores, datas, tipos, nomes_tipos in self._partes():
+            if 0 <= indice < len(valores):
+                return {
+                    "tipo": nomes_tipos[tipos[indice]],
+                    "valor": Dinheiro(valores[indice]),
+                    "data": self._EPOCA + timedelta(microseconds=datas[indice]),
+                    "contraparte": contraparte,
+                }
+            indice -= len(valores)
+
+        raise IndexError("Posição fora do histórico.")
+
+    def selar(self, caminho, antes_de=None):
+        """Move as transações anteriores a antes_de (todas, se None) para um segmento lido via mmap.
+
+        O segmento é somente leitura; gerar_relatorio e os contadores continuam cobrindo todo o
+        histórico. Retorna o SegmentoHistorico criado, ou None se não havia o que selar.
+        """
+        quantidade = len(self._valores)
+        if antes_de is not None:
+            quantidade = bisect_left(self._datas, self._marca_tempo(antes_de))
+        if not quantidade:
+            return None
+
+        segmento = SegmentoHistorico.gravar(
+            caminho,
+            self._valores[:quantidade],
+            self._datas[:quantidade],
+            self._saldos[:quantidade],
+            self._entradas[:quantidade],
+            self._tipos[:quantidade],
         )
+        self._segmentos.append(segmento)
+
+        # Cópias do restante no tamanho exato: os arrays antigos, grandes, são liberados
+        self._valores = self._valores[quantidade:]
+        self._datas = self._datas[quantidade:]
+        self._saldos = self._saldos[quantidade:]
+        self._entradas = self._entradas[quantidade:]
+        self._tipos = self._tipos[quantidade:]
+        return segmento
+
+
+class SegmentoHistorico:
+    """Trecho selado do Historico em um arquivo binário de largura fixa, lido via mmap.
+
+    Layout: cabeçalho (assinatura, quantidade, tamanho dos nomes de tipo), nomes em JSON
+    completados até múltiplo de 8 bytes, e as colunas valores (centavos, int64), datas (int64), saldos e
+    entradas acumulados (centavos, int64) e tipos (byte).
+    """
+
+    CABECALHO = struct.Struct("<4sQI")
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        assinatura, self._quantidade, tamanho_nomes = self.CABECALHO.unpack_from(self._mapa)
+        if assinatura != b"BSEG":
+            raise ValueError(f"Segmento de histórico inválido: {caminho}")
+
+        inicio = self.CABECALHO.size
+        self.nomes_tipos = json.loads(self._mapa[inicio : inicio + tamanho_nomes])
+
+        # Visões sobre o arquivo mapeado: as páginas só são lidas do disco quando acessadas
+        dados = memoryview(self._mapa)
+        inicio += tamanho_nomes
+        self.valores = dados[inicio : inicio + 8 * self._quantidade].cast("q")
+        inicio += 8 * self._quantidade
+        self.datas = dados[inicio : inicio + 8 * self._quantidade].cast("q")
+        inicio += 8 * self._quantidade
+        self.saldos = dados[inicio : inicio + 8 * self._quantidade].cast("q")
+        inicio += 8 * self._quantidade
+        self.entradas = dados[inicio : inicio + 8 * self._quantidade].cast("q")
+        inicio += 8 * self._quantidade
+        self.tipos = dados[inicio : inicio + self._quantidade]
+
+    def __len__(self):
+        return self._quantidade
+
+    @classmethod
+    def gravar(cls, caminho, valores, datas, saldos, entradas, tipos):
+        nomes = json.dumps(Historico._tipos_transacao).encode("utf-8")
+        nomes += b" " * (-len(nomes) % 8)
+
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(cls.CABECALHO.pack(b"BSEG", len(valores), len(nomes)))
+            arquivo.write(nomes)
+            valores.tofile(arquivo)
+            datas.tofile(arquivo)
+            saldos.tofile(arquivo)
+            entradas.tofile(arquivo)
+            tipos.tofile(arquivo)
+        os.replace(temporario, caminho)
+
+        return cls(caminho)
 
-    def gerar_relatorio(self, tipo_transacao=None):
-        for transacao in self._transacoes:
-            if tipo_transacao is None or transacao["tipo"].lower() == tipo_transacao.lower():
-                yield transacao
 
 class Transacao(ABC):
+    __slots__ = ()
+
     @property
     @abstractproperty
     def valor(self):
@@ -215,67 +990,1250 @@ class Transacao(ABC):
     @abstractclassmethod
     def registrar(self, conta):
         pass
+
+    def contas_envolvidas(self, conta):
+        # Contas que precisam estar travadas durante registrar (ver ExecutorTransacoes)
+        return (conta,)
    
 
 class Saque(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
-        self._valor = valor
+        self._valor = Dinheiro.de_reais(valor)
 
     @property
     def valor(self):
         return self._valor
 
     def registrar(self, conta):
-        sucesso_transacao, _ = conta.sacar(self.valor) 
+        sucesso_transacao, mensagem = conta.sacar(self.valor)
 
         if sucesso_transacao:
             conta.historico.adicionar_transacao(self)
+            if persistencia is not None:
+                persistencia.registrar_movimentos(conta, [Saque.__name__], [self.valor])
+
+        return sucesso_transacao, mensagem
 
 
 class Deposito(Transacao):
+    __slots__ = ("_valor",)
+
     def __init__(self, valor):
-        self._valor = valor
+        self._valor = Dinheiro.de_reais(valor)
 
     @property
     def valor(self):
         return self._valor
 
     def registrar(self, conta):
-        sucesso_transacao, _ = conta.depositar(self.valor) 
+        sucesso_transacao, mensagem = conta.depositar(self.valor)
 
         if sucesso_transacao:
             conta.historico.adicionar_transacao(self)
+            if persistencia is not None:
+                persistencia.registrar_movimentos(conta, [Deposito.__name__], [self.valor])
+
+        return sucesso_transacao, mensagem
+
+
+class Transferencia(Transacao):
+    __slots__ = ("_valor", "_destino")
+
+    # Tipo da entrada gravada no Historico da conta de destino
+    TIPO_CREDITO = "Recebimento"
+
+    def __init__(self, valor, destino):
+        self._valor = Dinheiro.de_reais(valor)
+        self._destino = destino
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @property
+    def destino(self):
+        return self._destino
+
+    def contas_envolvidas(self, conta):
+        # O ExecutorTransacoes trava as duas em ordem de (agência, número), qualquer que seja o sentido:
+        # transferências opostas entre as mesmas contas não se bloqueiam mutuamente
+        return (conta, self._destino)
+
+    def registrar(self, conta):
+        sucesso_transacao, mensagem = conta.transferir(self.valor, self.destino)
+
+        if sucesso_transacao:
+            # Mesma data/hora e mesmo valor nos dois históricos, e cada entrada aponta para a outra
+            data = datetime.now()
+            origem, destino = conta.historico, self.destino.historico
+            indice_origem = len(origem)
+            origem.adicionar_transacoes([Transferencia.__name__], [self.valor], data)
+            indice_destino = len(destino)
+            destino.adicionar_transacoes([self.TIPO_CREDITO], [self.valor], data)
+            origem.vincular(indice_origem, self.destino.numero, indice_destino)
+            destino.vincular(indice_destino, conta.numero, indice_origem)
+            if persistencia is not None:
+                persistencia.registrar_transferencia(conta, self.destino, self.valor)
+
+        return sucesso_transacao, mensagem
+
+
+# --- Processamento em Lote ---
+
+def processar_lote(movimentos):
+    """Aplica movimentos (conta, tipo, valor) em uma passada, com as mesmas regras de sacar/depositar.
+
+    tipo pode ser a classe (Saque/Deposito) ou o nome ("saque"/"deposito"). Saldo e contagem de
+    saques são acompanhados por conta durante o lote; ao final, cada conta recebe o novo saldo e
+    o histórico é anexado de uma vez. Os movimentos do lote não passam pelo log_transacao.
+    Retorna (quantidade_aceitos, [(posicao, motivo_recusa), ...]).
+    """
+    estados = {}
+    aceitos, recusados = _validar_lote(movimentos, estados)
+
+    for conta, (saldo, _, tipos, valores) in estados.items():
+        _aplicar_lote(conta, saldo, tipos, valores)
+
+    return aceitos, recusados
+
+
+def _validar_lote(movimentos, estados):
+    # Aplica as regras aos movimentos acumulando, em estados, [saldo, saques, tipos, valores] por conta.
+    # Contas sem estado partem do saldo e da contagem de saques atuais.
+    recusados = []
+    aceitos = 0
+    nomes_tipo = {
+        Saque: Saque.__name__,
+        Deposito: Deposito.__name__,
+        "saque": Saque.__name__,
+        "deposito": Deposito.__name__,
+    }
+
+    for posicao, (conta, tipo, valor) in enumerate(movimentos):
+        if conta is None:
+            recusados.append((posicao, "Conta não encontrada."))
+            continue
+
+        valor = Dinheiro.de_reais(valor)
+        estado = estados.get(conta)
+        if estado is None:
+            numero_saques = conta.historico.quantidade_transacoes(Saque.__name__)
+            estado = estados[conta] = [conta._saldo, numero_saques, [], array("q")]
+
+        saldo, numero_saques, tipos, valores = estado
+        nome_tipo = nomes_tipo.get(tipo) or nomes_tipo.get(str(tipo).lower())
+
+        if nome_tipo == Saque.__name__:
+            motivo_recusa = conta._recusa_limites(valor, numero_saques) or conta._recusa_saldo(valor, saldo)
+            if not motivo_recusa:
+                estado[0] = saldo - valor
+                estado[1] = numero_saques + 1
+        elif nome_tipo == Deposito.__name__:
+            motivo_recusa = conta._recusa_deposito(valor)
+            if not motivo_recusa:
+                estado[0] = saldo + valor
+        else:
+            motivo_recusa = f"Tipo de transação desconhecido: {tipo}."
+
+        if motivo_recusa:
+            recusados.append((posicao, motivo_recusa))
+        else:
+            tipos.append(nome_tipo)
+            valores.append(valor)
+            aceitos += 1
+
+    return aceitos, recusados
+
+
+def _aplicar_lote(conta, saldo, tipos, valores):
+    conta._saldo = saldo
+    if valores:
+        conta.historico.adicionar_transacoes(tipos, valores)
+        if persistencia is not None:
+            persistencia.registrar_movimentos(conta, tipos, valores)
+
+
+# --- Reprodução de Movimentos em Processos ---
+
+def reproduzir_movimentos(contas, movimentos, processos=None, fatias_por_processo=4, executor=None):
+    """Aplica movimentos (numero_conta, tipo, valor) com as regras de processar_lote, em vários processos.
+
+    Os movimentos são divididos em fatias pelo número da conta, preservando a ordem de cada conta;
+    cada fatia é validada em um processo do pool sobre cópias das contas envolvidas, e o que cada
+    fatia movimentou (diferença de saldo e transações novas) é somado às contas de contas
+    (RegistroContas) neste processo, que é o único a gravar na persistência. Movimentos feitos nas
+    contas enquanto as fatias rodam são preservados; com executor (ExecutorTransacoes), cada conta
+    recebe seu resultado sob a trava dele. Como em processar_lote, transferências não são aceitas.
+    Retorna (quantidade_aceitos, [(posicao, motivo_recusa), ...]) em ordem de posição.
+    """
+    processos = processos or os.cpu_count() or 1
+    quantidade_fatias = processos * fatias_por_processo
+    # Por fatia: posições originais, números das contas, tipos e valores
+    fatias = [(array("q"), array("q"), [], []) for _ in range(quantidade_fatias)]
+    recusados = []
+
+    for posicao, (numero, tipo, valor) in enumerate(movimentos):
+        posicoes, numeros, tipos, valores = fatias[numero % quantidade_fatias]
+        posicoes.append(posicao)
+        numeros.append(numero)
+        tipos.append(tipo)
+        valores.append(valor)
+
+    # Importado só aqui: concurrent.futures.process traz o multiprocessing e atrasaria a abertura da interface
+    from concurrent.futures import ProcessPoolExecutor
+
+    aceitos = 0
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo_reproducao) as pool:
+        futuros = []
+        for posicoes, numeros, tipos, valores in fatias:
+            if posicoes:
+                encontradas = filter(None, map(contas.buscar, set(numeros)))
+                copias = {copia[0]: copia for copia in map(_estado_para_copia, encontradas)}
+                futuro = pool.submit(_reproduzir_fatia, list(copias.values()), numeros, tipos, valores)
+                futuros.append((posicoes, copias, futuro))
+
+        # Cada conta aparece em uma única fatia: soma o que o processo montou ao estado atual da conta
+        for posicoes, copias, futuro in futuros:
+            aceitos_fatia, recusados_fatia, resultados, nomes_tipos = futuro.result()
+            for numero, (saldo, historico) in resultados.items():
+                conta = contas.buscar(numero)
+                _, saldo_inicial, _, saldo_acumulado, entradas_acumuladas, *_ = copias[numero]
+                acumulados_base = (saldo_acumulado, entradas_acumuladas)
+                argumentos = (conta, saldo - saldo_inicial, historico, nomes_tipos, acumulados_base)
+                if executor is None:
+                    _mesclar_reproducao(*argumentos)
+                else:
+                    executor.executar([conta], _mesclar_reproducao, *argumentos)
+            aceitos += aceitos_fatia
+            recusados.extend((posicoes[posicao], motivo) for posicao, motivo in recusados_fatia)
+
+    recusados.sort()
+    return aceitos, recusados
+
+
+def _mesclar_reproducao(conta, diferenca_saldo, historico, nomes_tipos, acumulados_base):
+    conta._saldo += diferenca_saldo
+    conta.historico.anexar(historico, nomes_tipos, acumulados_base)
+    if persistencia is not None:
+        tipos = [nomes_tipos[codigo] for codigo in historico._tipos]
+        persistencia.registrar_movimentos(conta, tipos, historico._valores)
+
+
+def _iniciar_processo_reproducao():
+    # Processos criados por fork herdam a persistência aberta: só o processo principal grava no diário
+    global persistencia
+    persistencia = None
+
+
+def _estado_para_copia(conta):
+    historico = conta.historico
+    return (
+        conta.numero,
+        conta._saldo,
+        historico.quantidade_transacoes(Saque.__name__),
+        historico._saldo_acumulado,
+        historico._entradas_acumuladas,
+        int(conta._limite),
+        conta._limite_saques,
+    )
+
+
+def _reproduzir_fatia(copias, numeros, tipos, valores):
+    # Executado no processo do pool: valida e aplica a fatia a cópias sem cliente, com o saldo, os
+    # limites, a contagem de saques e as somas acumuladas das originais. Os históricos das cópias
+    # (só com as transações novas) voltam para serem anexados às contas originais.
+    estados = {}
+    contas = {}
+    for numero, saldo, numero_saques, saldo_acumulado, entradas_acumuladas, limite, limite_saques in copias:
+        conta = contas[numero] = ContaCorrente(numero, None, Dinheiro(limite), limite_saques)
+        conta.historico._saldo_acumulado = saldo_acumulado
+        conta.historico._entradas_acumuladas = entradas_acumuladas
+        estados[conta] = [saldo, numero_saques, [], array("q")]
+
+    aceitos, recusados = _validar_lote(zip(map(contas.get, numeros), tipos, valores), estados)
+
+    resultados = {}
+    for conta, (saldo, _, tipos_conta, valores_conta) in estados.items():
+        if valores_conta:
+            _aplicar_lote(conta, saldo, tipos_conta, valores_conta)
+            resultados[conta.numero] = (conta._saldo, conta.historico)
+    return aceitos, recusados, resultados, Historico._tipos_transacao
+
+
+# --- Execução Concorrente (uma trava por conta) ---
+
+class ExecutorTransacoes:
+    """Processa movimentos em um pool de threads, travando só as contas envolvidas.
+
+    Operações em várias contas adquirem as travas sempre na mesma ordem (agência, número),
+    então duas operações sobre as mesmas contas nunca ficam esperando uma pela outra.
+    """
+
+    def __init__(self, max_threads=None):
+        self._pool = ThreadPoolExecutor(max_workers=max_threads)
+        self._travas = {}
+        self._trava_travas = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fechar()
+
+    def trava(self, conta):
+        trava = self._travas.get(conta)
+        if trava is None:
+            with self._trava_travas:
+                trava = self._travas.setdefault(conta, threading.Lock())
+        return trava
+
+    def executar(self, contas, operacao, *args):
+        """Executa operacao(*args) na thread atual, com as travas de todas as contas informadas."""
+        ordenadas = sorted(set(contas), key=lambda conta: (conta.agencia, conta.numero, id(conta)))
+        travas = [self.trava(conta) for conta in ordenadas]
+
+        for trava in travas:
+            trava.acquire()
+        try:
+            return operacao(*args)
+        finally:
+            for trava in reversed(travas):
+                trava.release()
+
+    def submeter(self, conta, transacao):
+        """Agenda transacao.registrar(conta) no pool e retorna o Future.
+
+        As travas são as de transacao.contas_envolvidas(conta): só a conta, ou origem e destino
+        em uma Transferencia.
+        """
+        contas = transacao.contas_envolvidas(conta)
+        return self._pool.submit(self.executar, contas, transacao.registrar, conta)
+
+    def processar(self, movimentos):
+        """Agenda movimentos (conta, transacao) e espera todos terminarem."""
+        futuros = [self.submeter(conta, transacao) for conta, transacao in movimentos]
+        for futuro in futuros:
+            futuro.result()
+        return len(futuros)
+
+    def fechar(self):
+        self._pool.shutdown(wait=True)
+
+
+# --- Trabalhador em Segundo Plano (operações fora da thread da interface) ---
+
+class TrabalhadorBanco:
+    """Executa operações de domínio em uma única thread, na ordem em que foram submetidas.
+
+    O resultado de cada operação fica guardado até entregar_resultados(), que a interface chama
+    periodicamente (via after) na própria thread, onde os ao_concluir são executados. Se a operação
+    levantar uma exceção, ela vai para o ao_erro do pedido, ou para o ao_erro do trabalhador. Pedidos
+    com a mesma chave que ainda esperam na fila são agrupados: a operação roda uma vez e todos os
+    ao_concluir recebem o mesmo resultado.
+    """
+
+    def __init__(self, ao_erro=None):
+        self.ao_erro = ao_erro
+        self._fila = queue.Queue()
+        self._resultados = queue.Queue()
+        self._pendentes = {}
+        self._trava = threading.Lock()
+        self.executadas = 0
+        self.agrupadas = 0
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def submeter(self, operacao, *args, ao_concluir=None, ao_erro=None, chave=None):
+        with self._trava:
+            pedido = self._pendentes.get(chave) if chave is not None else None
+            if pedido is not None:
+                # Ainda não começou: o novo pedido só espera pelo mesmo resultado
+                pedido[2].append((ao_concluir, ao_erro))
+                self.agrupadas += 1
+                return
+
+            pedido = (operacao, args, [(ao_concluir, ao_erro)], chave)
+            if chave is not None:
+                self._pendentes[chave] = pedido
+        self._fila.put(pedido)
+
+    def pendentes(self):
+        return self._fila.qsize()
+
+    def entregar_resultados(self):
+        """Executa, na thread atual, os ao_concluir/ao_erro das operações já terminadas e retorna quantas foram.
+
+        Sem nenhum ao_erro para tratar uma exceção, ela é levantada aqui, depois de entregues os
+        resultados que já estavam prontos.
+        """
+        entregues = 0
+        sem_tratamento = None
+        while True:
+            try:
+                callbacks, resultado, erro = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            entregues += 1
+            for ao_concluir, ao_erro in callbacks:
+                if erro is None:
+                    if ao_concluir is not None:
+                        ao_concluir(resultado)
+                    continue
+
+                ao_erro = ao_erro or self.ao_erro
+                if ao_erro is not None:
+                    ao_erro(erro)
+                else:
+                    sem_tratamento = sem_tratamento or erro
+
+        if sem_tratamento is not None:
+            raise sem_tratamento
+        return entregues
+
+    def fechar(self):
+        """Espera as operações já submetidas terminarem e encerra a thread."""
+        self._fila.put(None)
+        self._thread.join()
+
+    def _executar(self):
+        while True:
+            pedido = self._fila.get()
+            if pedido is None:
+                return
+
+            operacao, args, callbacks, chave = pedido
+            with self._trava:
+                # A partir daqui um pedido com a mesma chave entra na fila: o resultado desta
+                # execução pode já estar desatualizado para ele
+                if chave is not None:
+                    self._pendentes.pop(chave, None)
+
+            try:
+                resultado, erro = operacao(*args), None
+            except Exception as exc:
+                resultado, erro = None, exc
+            self.executadas += 1
+            self._resultados.put((callbacks, resultado, erro))
+
+
+# --- Extrato em Páginas ---
+
+# Define as larguras fixas em caracteres para um alinhamento perfeito (Courier é monospace)
+LARGURA_DATA = 20  # [DD-MM-AAAA HH:MM:SS] -> 20 caracteres
+LARGURA_TIPO = 15  # Deposito: / Saque: / Transferencia:
+LARGURA_VALOR = 12 # R$ 999.999,99
+
+# Total de caracteres por linha: 20 + 15 + 12 = 47. Um total de ~50 é seguro para o pop-up.
+
+def formatar_linha_extrato(transacao):
+    data_formatada = f"[{transacao['data']:%d-%m-%y %H:%M}]".ljust(LARGURA_DATA)
+    tipo_formatado = f"{transacao['tipo']}:".ljust(LARGURA_TIPO)
+    valor_formatado = f"R$ {transacao['valor']:.2f}".rjust(LARGURA_VALOR)
+    linha = f"{data_formatada} {tipo_formatado} {valor_formatado}"
+    if transacao["contraparte"] is not None:
+        # Transferencia: conta de destino; Recebimento: conta de origem
+        linha += f"  conta {transacao['contraparte'][0]}"
+    return linha
+
+
+def formatar_linha_conta(conta):
+    # Guardada na conta como o resumo_conta: rolar e reabrir a lista só formata contas alteradas
+    textos = _textos_conta(conta)
+    if textos[RESUMO_LINHA] is None:
+        textos[RESUMO_LINHA] = f"{conta.agencia}-{conta.numero} | {textos[1]} | R$ {Dinheiro(textos[0]):.2f}"
+    return textos[RESUMO_LINHA]
+
+
+def chave_busca_conta(conta):
+    # Texto em que a busca da lista de contas procura: agência-número, nome do titular e CPF
+    textos = _textos_conta(conta)
+    if textos[RESUMO_CHAVE] is None:
+        textos[RESUMO_CHAVE] = f"{conta.agencia}-{conta.numero} {textos[1]} {conta.cliente.cpf}".lower()
+    return textos[RESUMO_CHAVE]
+
+
+# --- Registro de Clientes (índice por CPF) ---
+
+class RegistroClientes:
+    def __init__(self, persistencia=None):
+        # Diário que recebe cada cliente adicionado (None: só em memória)
+        self.persistencia = persistencia
+        self._clientes = {}
+
+    def __iter__(self):
+        return iter(self._clientes.values())
+
+    def __len__(self):
+        return len(self._clientes)
+
+    def adicionar(self, cliente):
+        self._clientes[cliente.cpf] = cliente
+        if self.persistencia is not None:
+            self.persistencia.registrar_cliente(cliente)
+
+    def buscar(self, cpf):
+        return self._clientes.get(cpf)
+
+
+# --- Registro de Contas (índice por agência/número e por cliente) ---
+
+class RegistroContas:
+    def __init__(self, agencia="0001", persistencia=None):
+        self.agencia = agencia
+        # Diário que recebe cada conta adicionada (None: só em memória)
+        self.persistencia = persistencia
+        self._contas = []
+        self._contas_por_chave = {}
+        self._contas_por_cliente = {}
+        self._proximo_numero = 1
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def __len__(self):
+        return len(self._contas)
+
+    def __getitem__(self, indice):
+        return self._contas[indice]
+
+    def proximo_numero(self):
+        return self._proximo_numero
+
+    def adicionar(self, conta):
+        self._contas.append(conta)
+        self._contas_por_chave[(conta.agencia, conta.numero)] = conta
+        self._contas_por_cliente.setdefault(conta.cliente, []).append(conta)
+        self._proximo_numero = max(self._proximo_numero, conta.numero + 1)
+        if self.persistencia is not None:
+            self.persistencia.registrar_conta(conta)
+
+    def buscar(self, numero, agencia=None):
+        return self._contas_por_chave.get((agencia or self.agencia, numero))
+
+    def contas_do_cliente(self, cliente):
+        return self._contas_por_cliente.get(cliente, [])
+
+
+# --- Persistência (snapshot + WAL) ---
+
+# Diário de movimentos (WAL): cabeçalho do arquivo (assinatura, geração) seguido de registros
+# (tipo, tamanho, crc32) + conteúdo. Só é anexado; o snapshot guarda o estado compacto até a
+# geração em que o diário foi iniciado.
+CABECALHO_WAL = struct.Struct("<4sQ")
+CABECALHO_REGISTRO = struct.Struct("<BII")
+# Bloco de movimentos de uma conta: número da conta, posição do primeiro movimento no Historico,
+# data em microssegundos, saldo após o bloco, quantidade de movimentos; depois os códigos de tipo
+# (1 byte cada) e os valores (centavos, int64). Saldos e valores em centavos inteiros, como no Historico.
+# Pela posição, a reaplicação pula blocos que o snapshot já contém (ver PersistenciaBanco._salvar_snapshot).
+CABECALHO_MOVIMENTOS = struct.Struct("<qqqqI")
+# Diários com a assinatura antiga (BWAL) têm blocos sem a posição: são sempre anexados
+CABECALHO_MOVIMENTOS_SEM_POSICAO = struct.Struct("<qqqI")
+ASSINATURA_WAL = b"BWL2"
+# Snapshot: assinatura, geração, tamanho dos metadados JSON; depois os arrays de cada Historico
+CABECALHO_SNAPSHOT = struct.Struct("<4sQQ")
+
+REGISTRO_CLIENTE = 1
+REGISTRO_CONTA = 2
+REGISTRO_MOVIMENTOS = 3
+# Os dois blocos de uma transferência (origem, destino); na reaplicação as entradas são ligadas
+# (Historico.vincular) como em Transferencia.registrar
+REGISTRO_TRANSFERENCIA = 4
+
+# Códigos fixos no diário: os códigos de Historico._tipos_transacao dependem da ordem de uso
+TIPOS_DIARIO = ("Saque", "Deposito", "Transferencia", "Recebimento")
+
+# Diretório usado pelo BancoApp para o snapshot e o diário
+DIRETORIO_DADOS = "dados_banco"
+
+# Persistência ativa; None mantém o estado só em memória
+persistencia = None
+
+
+class PersistenciaBanco:
+    def __init__(self, diretorio, agencia="0001", movimentos_por_snapshot=50_000, fsync=False):
+        self.diretorio = diretorio
+        self.agencia = agencia
+        self.movimentos_por_snapshot = movimentos_por_snapshot
+        self.fsync = fsync
+        self.clientes = None
+        self.contas = None
+        self.geracao = 0
+        self.movimentos_desde_snapshot = 0
+        self._arquivo_wal = None
+        # Protege só o arquivo do diário e a troca por um snapshot novo; saldos e históricos são
+        # alterados sob as travas das contas (ExecutorTransacoes). Reentrante: registrar_movimentos
+        # pode disparar salvar_snapshot.
+        self.trava = threading.RLock()
+
+    @property
+    def caminho_snapshot(self):
+        return os.path.join(self.diretorio, "estado.snapshot")
+
+    @property
+    def caminho_wal(self):
+        return os.path.join(self.diretorio, "movimentos.wal")
+
+    def carregar(self):
+        """Carrega o último snapshot e reaplica apenas a cauda do diário escrita depois dele."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.clientes = RegistroClientes()
+        self.contas = RegistroContas(self.agencia)
+
+        if os.path.exists(self.caminho_snapshot):
+            self._carregar_snapshot()
+
+        posicao_valida = self._reaplicar_wal()
+        if posicao_valida is None:
+            self._iniciar_wal()
+        else:
+            self._arquivo_wal = open(self.caminho_wal, "r+b")
+            # Descarta um registro incompleto deixado por uma interrupção no meio da escrita
+            self._arquivo_wal.truncate(posicao_valida)
+            self._arquivo_wal.seek(posicao_valida)
+
+        # Só depois da reconstrução: o que foi lido do disco não volta para diário nenhum, nem para o
+        # de outra persistência aberta no processo; daqui em diante, os cadastros vão para este diário
+        self.clientes.persistencia = self
+        self.contas.persistencia = self
+        return self.clientes, self.contas
+
+    def registrar_cliente(self, cliente):
+        dados = [cliente.nome, cliente.data_nascimento, cliente.cpf, cliente.endereco]
+        with self.trava:
+            self._escrever(REGISTRO_CLIENTE, json.dumps(dados, ensure_ascii=False).encode("utf-8"))
+
+    def registrar_conta(self, conta):
+        dados = [conta.numero, conta.agencia, conta.cliente.cpf, conta._limite, conta._limite_saques]
+        with self.trava:
+            self._escrever(REGISTRO_CONTA, json.dumps(dados, ensure_ascii=False).encode("utf-8"))
+
+    def registrar_movimentos(self, conta, tipos, valores):
+        conteudo = self._bloco_movimentos(conta, tipos, valores)
+        with self.trava:
+            self._escrever(REGISTRO_MOVIMENTOS, conteudo)
+            self._contar_movimentos(len(valores))
+
+    def registrar_transferencia(self, origem, destino, valor):
+        # Os dois lados em um único registro: na reaplicação, ou entram os dois ou nenhum
+        conteudo = self._bloco_movimentos(origem, [Transferencia.__name__], [valor])
+        conteudo += self._bloco_movimentos(destino, [Transferencia.TIPO_CREDITO], [valor])
+        with self.trava:
+            self._escrever(REGISTRO_TRANSFERENCIA, conteudo)
+            self._contar_movimentos(2)
+
+    def salvar_snapshot(self):
+        """Grava o estado compacto e inicia um diário novo, vazio, na geração seguinte."""
+        with self.trava:
+            self._salvar_snapshot()
+
+    def _salvar_snapshot(self):
+        # Outras threads continuam alterando contas; só os registros no diário esperam a trava. Um
+        # movimento já copiado aqui cujo registro ainda não foi gravado vai para o diário novo, e a
+        # reaplicação o reconhece pela posição no Historico e só atualiza o saldo.
+        geracao = self.geracao + 1
+        clientes = list(self.clientes)
+        contas = list(self.contas)
+        estados = [conta.historico.estado_snapshot() for conta in contas]
+        metadados = {
+            "tipos": list(Historico._tipos_transacao),
+            "clientes": [
+                [cliente.nome, cliente.data_nascimento, cliente.cpf, cliente.endereco] for cliente in clientes
+            ],
+            "contas": [
+                {
+                    "numero": conta.numero,
+                    "agencia": conta.agencia,
+                    "cpf": conta.cliente.cpf,
+                    "limite": conta._limite,
+                    "limite_saques": conta._limite_saques,
+                    "saldo": conta._saldo,
+                    "segmentos": [os.path.relpath(segmento.caminho, self.diretorio) for segmento in segmentos],
+                    "transacoes": transacoes,
+                    "por_tipo": por_tipo,
+                    "soma_por_tipo": soma_por_tipo,
+                    "saldo_acumulado": saldo_acumulado,
+                    "entradas_acumuladas": entradas_acumuladas,
+                    "contrapartes": [
+                        [indice, numero, indice_contraparte]
+                        for indice, (numero, indice_contraparte) in contrapartes.items()
+                    ],
+                    "por_dia": {data.isoformat(): quantidades for data, quantidades in por_dia.items()},
+                }
+                for conta, (
+                    segmentos,
+                    transacoes,
+                    por_tipo,
+                    soma_por_tipo,
+                    saldo_acumulado,
+                    entradas_acumuladas,
+                    contrapartes,
+                    por_dia,
+                ) in zip(contas, estados)
+            ],
+        }
+        dados_metadados = json.dumps(metadados, ensure_ascii=False).encode("utf-8")
+
+        # Escrita em arquivo temporário + os.replace: um snapshot nunca fica pela metade
+        temporario = f"{self.caminho_snapshot}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO_SNAPSHOT.pack(b"BSNP", geracao, len(dados_metadados)))
+            arquivo.write(dados_metadados)
+            for conta, (_, transacoes, *_) in zip(contas, estados):
+                historico = conta.historico
+                historico._valores[:transacoes].tofile(arquivo)
+                historico._datas[:transacoes].tofile(arquivo)
+                historico._saldos[:transacoes].tofile(arquivo)
+                historico._entradas[:transacoes].tofile(arquivo)
+                historico._tipos[:transacoes].tofile(arquivo)
+            self._sincronizar(arquivo)
+        os.replace(temporario, self.caminho_snapshot)
+
+        # Se o programa parar antes daqui, o diário antigo (geração anterior) é ignorado na carga
+        self.geracao = geracao
+        self._iniciar_wal()
+        self.movimentos_desde_snapshot = 0
+
+    def selar_historicos(self, antes_de=None):
+        """Sela em segmentos o histórico anterior a antes_de de todas as contas e grava um snapshot.
+
+        Troca os arrays dos históricos: não pode rodar com operações em andamento em outras threads.
+        """
+        pasta = os.path.join(self.diretorio, "segmentos")
+        os.makedirs(pasta, exist_ok=True)
+
+        with self.trava:
+            for conta in self.contas:
+                sequencia = len(conta.historico._segmentos)
+                caminho = os.path.join(pasta, f"conta-{conta.agencia}-{conta.numero}-{sequencia:04d}.seg")
+                conta.historico.selar(caminho, antes_de)
+
+            # O snapshot passa a apontar para os segmentos em vez de repetir as transações seladas
+            self._salvar_snapshot()
+
+    def fechar(self):
+        with self.trava:
+            if self._arquivo_wal is None:
+                return
+
+            # Só gera um snapshot novo se o diário tiver algo além do cabeçalho
+            if self._arquivo_wal.tell() > CABECALHO_WAL.size:
+                self._salvar_snapshot()
+            self._arquivo_wal.close()
+            self._arquivo_wal = None
+
+    def _bloco_movimentos(self, conta, tipos, valores):
+        # Chamado logo após o Historico receber os movimentos, ainda sob a trava da conta: a data é a da
+        # última transação e os movimentos ocupam as últimas posições do histórico
+        historico = conta.historico
+        posicao = len(historico) - len(valores)
+        bloco = CABECALHO_MOVIMENTOS.pack(conta.numero, posicao, historico._datas[-1], conta._saldo, len(valores))
+        bloco += bytes(TIPOS_DIARIO.index(tipo) for tipo in tipos)
+        bloco += array("q", valores).tobytes()
+        return bloco
+
+    def _contar_movimentos(self, quantidade):
+        self.movimentos_desde_snapshot += quantidade
+        if self.movimentos_desde_snapshot >= self.movimentos_por_snapshot:
+            self.salvar_snapshot()
+
+    def _sincronizar(self, arquivo):
+        arquivo.flush()
+        if self.fsync:
+            os.fsync(arquivo.fileno())
+
+    def _escrever(self, tipo, conteudo):
+        cabecalho = CABECALHO_REGISTRO.pack(tipo, len(conteudo), zlib.crc32(conteudo))
+        self._arquivo_wal.write(cabecalho + conteudo)
+        self._sincronizar(self._arquivo_wal)
+
+    def _iniciar_wal(self):
+        if self._arquivo_wal is not None:
+            self._arquivo_wal.close()
+
+        temporario = f"{self.caminho_wal}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO_WAL.pack(ASSINATURA_WAL, self.geracao))
+            self._sincronizar(arquivo)
+        os.replace(temporario, self.caminho_wal)
+
+        self._arquivo_wal = open(self.caminho_wal, "r+b")
+        self._arquivo_wal.seek(0, os.SEEK_END)
+
+    def _carregar_snapshot(self):
+        with open(self.caminho_snapshot, "rb") as arquivo:
+            assinatura, self.geracao, tamanho_metadados = CABECALHO_SNAPSHOT.unpack(
+                arquivo.read(CABECALHO_SNAPSHOT.size)
+            )
+            if assinatura != b"BSNP":
+                raise ValueError(f"Snapshot inválido: {self.caminho_snapshot}")
+            metadados = json.loads(arquivo.read(tamanho_metadados))
+
+            for dados in metadados["clientes"]:
+                self.clientes.adicionar(PessoaFisica(*dados))
+
+            # Os códigos de tipo do snapshot são convertidos para os deste processo
+            codigos = [Historico._codigo_tipo(tipo) for tipo in metadados["tipos"]]
+            tabela_tipos = bytearray(range(256))
+            tabela_tipos[: len(codigos)] = bytes(codigos)
+
+            for dados in metadados["contas"]:
+                conta = self._criar_conta(
+                    dados["numero"], dados["agencia"], dados["cpf"], dados["limite"], dados["limite_saques"]
+                )
+                conta._saldo = dados["saldo"]
+
+                historico = conta.historico
+                historico._segmentos = [
+                    SegmentoHistorico(os.path.join(self.diretorio, caminho)) for caminho in dados.get("segmentos", [])
+                ]
+                historico._valores.fromfile(arquivo, dados["transacoes"])
+                historico._datas.fromfile(arquivo, dados["transacoes"])
+                historico._saldos.fromfile(arquivo, dados["transacoes"])
+                historico._entradas.fromfile(arquivo, dados["transacoes"])
+                historico._tipos.frombytes(arquivo.read(dados["transacoes"]).translate(tabela_tipos))
+                historico._quantidade_por_tipo = dados["por_tipo"]
+                historico._soma_por_tipo = dados["soma_por_tipo"]
+                historico._saldo_acumulado = dados["saldo_acumulado"]
+                historico._entradas_acumuladas = dados["entradas_acumuladas"]
+                historico._contrapartes = {
+                    indice: (numero, indice_contraparte)
+                    for indice, numero, indice_contraparte in dados.get("contrapartes", [])
+                }
+                historico._quantidade_por_dia = {
+                    datetime.fromisoformat(data).date(): quantidades for data, quantidades in dados["por_dia"].items()
+                }
+
+    def _reaplicar_wal(self):
+        # Retorna a posição do fim do último registro válido, ou None se o diário deve ser reiniciado
+        if not os.path.exists(self.caminho_wal):
+            return None
+
+        with open(self.caminho_wal, "rb") as arquivo:
+            dados = arquivo.read()
+
+        if len(dados) < CABECALHO_WAL.size:
+            return None
+        assinatura, geracao = CABECALHO_WAL.unpack_from(dados)
+        if assinatura not in (ASSINATURA_WAL, b"BWAL"):
+            raise ValueError(f"Diário de movimentos inválido: {self.caminho_wal}")
+        if geracao < self.geracao:
+            # Diário anterior ao snapshot: tudo o que ele contém já está no snapshot
+            return None
+        if geracao > self.geracao:
+            raise ValueError(f"Diário da geração {geracao} sem o snapshot correspondente.")
+
+        posicao = CABECALHO_WAL.size
+        while posicao + CABECALHO_REGISTRO.size <= len(dados):
+            tipo, tamanho, crc = CABECALHO_REGISTRO.unpack_from(dados, posicao)
+            inicio = posicao + CABECALHO_REGISTRO.size
+            conteudo = dados[inicio : inicio + tamanho]
+            if len(conteudo) < tamanho or zlib.crc32(conteudo) != crc:
+                break
+
+            self._aplicar_registro(tipo, conteudo, com_posicao=assinatura == ASSINATURA_WAL)
+            posicao = inicio + tamanho
+
+        return posicao
+
+    def _aplicar_registro(self, tipo, conteudo, com_posicao=True):
+        # Registros gravados enquanto o snapshot era montado podem já estar nele: são reconhecidos e pulados
+        if tipo == REGISTRO_CLIENTE:
+            dados = json.loads(conteudo)
+            if self.clientes.buscar(dados[2]) is None:
+                self.clientes.adicionar(PessoaFisica(*dados))
+        elif tipo == REGISTRO_CONTA:
+            dados = json.loads(conteudo)
+            if self.contas.buscar(dados[0], dados[1]) is None:
+                self._criar_conta(*dados)
+        elif tipo in (REGISTRO_MOVIMENTOS, REGISTRO_TRANSFERENCIA):
+            # Um registro pode ter blocos de várias contas (os dois lados de uma transferência)
+            lados = []
+            posicao = 0
+            while posicao < len(conteudo):
+                if com_posicao:
+                    numero, posicao_historico, marca_tempo, saldo, quantidade = CABECALHO_MOVIMENTOS.unpack_from(
+                        conteudo, posicao
+                    )
+                    inicio = posicao + CABECALHO_MOVIMENTOS.size
+                else:
+                    numero, marca_tempo, saldo, quantidade = CABECALHO_MOVIMENTOS_SEM_POSICAO.unpack_from(
+                        conteudo, posicao
+                    )
+                    posicao_historico = None
+                    inicio = posicao + CABECALHO_MOVIMENTOS_SEM_POSICAO.size
+                posicao = inicio + quantidade + 8 * quantidade
+
+                conta = self.contas.buscar(numero)
+                # O saldo do bloco é sempre o mais recente, mesmo quando os movimentos já estão no snapshot
+                conta._saldo = saldo
+                if posicao_historico is None:
+                    posicao_historico = len(conta.historico)
+                lados.append((conta, posicao_historico))
+                if posicao_historico < len(conta.historico):
+                    continue
+
+                tipos = [TIPOS_DIARIO[codigo] for codigo in conteudo[inicio : inicio + quantidade]]
+                valores = array("q", conteudo[inicio + quantidade : posicao])
+                data = Historico._EPOCA + timedelta(microseconds=marca_tempo)
+                conta.historico.adicionar_transacoes(tipos, valores, data)
+                self.movimentos_desde_snapshot += quantidade
+
+            if tipo == REGISTRO_TRANSFERENCIA:
+                (origem, indice_origem), (destino, indice_destino) = lados
+                origem.historico.vincular(indice_origem, destino.numero, indice_destino)
+                destino.historico.vincular(indice_destino, origem.numero, indice_origem)
+
+    def _criar_conta(self, numero, agencia, cpf, limite, limite_saques):
+        cliente = self.clientes.buscar(cpf)
+        conta = ContaCorrente(numero, cliente, limite=Dinheiro(limite), limite_saques=limite_saques)
+        conta._agencia = agencia
+        cliente.adicionar_conta(conta)
+        self.contas.adicionar(conta)
+        return conta
+
+
+def abrir_persistencia(diretorio, **opcoes):
+    """Carrega o estado salvo em diretorio e passa a gravar as próximas alterações nele.
+
+    Retorna (clientes, contas). Clientes, contas e movimentos registrados a partir daí vão para
+    o diário; a cada movimentos_por_snapshot movimentos, e no encerramento, um snapshot compacto
+    é gravado e o diário recomeça vazio.
+    """
+    global persistencia
+
+    if persistencia is not None:
+        persistencia.fechar()
+        persistencia = None
+
+    nova_persistencia = PersistenciaBanco(diretorio, **opcoes)
+    clientes, contas = nova_persistencia.carregar()
+    atexit.register(nova_persistencia.fechar)
+
+    persistencia = nova_persistencia
+    return clientes, contas
 
 
 # ==============================================================================
 # 2. INTERFACE GRÁFICA (TKINTER) - MUDANÇA NO EXTRATO
 # ==============================================================================
 
+# --- Lista Virtual (só as linhas visíveis são montadas) ---
+
+class FiltroIncremental:
+    """Busca por texto em linhas obtidas sob demanda, feita em lotes para não travar a interface.
+
+    chave(indice) devolve o texto pesquisável da linha, já em minúsculas. Quando o novo texto
+    estende o anterior, a busca parte só das linhas que já combinavam com ele.
+    """
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.texto = ""
+        self.indices = None  # None: sem filtro, todas as linhas
+        self.concluido = True
+        self._candidatos = iter(())
+
+    def iniciar(self, texto, quantidade):
+        texto = texto.strip().lower()
+        if not texto:
+            self.texto, self.indices, self.concluido = "", None, True
+            return
+
+        if self.concluido and self.indices is not None and texto.startswith(self.texto):
+            candidatos = self.indices
+        else:
+            candidatos = range(quantidade)
+
+        self.texto = texto
+        self.indices = array("q")
+        self.concluido = False
+        self._candidatos = iter(candidatos)
+
+    def avancar(self, tamanho_lote):
+        """Examina até tamanho_lote linhas candidatas; retorna True quando a busca terminou."""
+        lote = list(itertools.islice(self._candidatos, tamanho_lote))
+        texto, chave = self.texto, self.chave
+        self.indices.extend(indice for indice in lote if texto in chave(indice))
+        self.concluido = len(lote) < tamanho_lote
+        return self.concluido
+
+
+class ListaVirtual(tk.Frame):
+    """Lista rolável que só monta o texto das linhas que cabem na tela.
+
+    quantidade() informa o total de linhas e linha(indice) monta uma linha sob demanda, então o
+    custo de desenhar não depende do tamanho da lista. Com chave_busca, um campo de busca filtra
+    as linhas aos poucos (FiltroIncremental), até TEMPO_BUSCA segundos por ciclo ocioso do Tk.
+    """
+
+    LOTE_BUSCA = 1_000
+    TEMPO_BUSCA = 0.02
+
+    def __init__(self, master, quantidade, linha, chave_busca=None, ao_escolher=None, largura=60, altura=20):
+        super().__init__(master)
+        self._quantidade = quantidade
+        self._linha = linha
+        self._ao_escolher = ao_escolher
+        self._primeira = 0
+        self._filtro = FiltroIncremental(chave_busca) if chave_busca else None
+        self._busca_agendada = None
+
+        if self._filtro:
+            self._texto_busca = tk.StringVar()
+            campo_busca = tk.Entry(self, textvariable=self._texto_busca)
+            campo_busca.pack(fill="x")
+            self._texto_busca.trace_add("write", lambda *args: self._buscar())
+            self._contador = tk.Label(self, anchor="w")
+            self._contador.pack(fill="x", pady=(0, 5))
+
+        quadro = tk.Frame(self)
+        quadro.pack(fill="both", expand=True)
+        self._barra = tk.Scrollbar(quadro, orient="vertical", command=self._rolar)
+        self._barra.pack(side="right", fill="y")
+        fonte = ('Courier', 10)
+        self._altura_linha = tkfont.Font(font=fonte).metrics("linespace")
+        self._lista = tk.Listbox(
+            quadro, font=fonte, width=largura, height=altura, activestyle="none", exportselection=False
+        )
+        self._lista.pack(side="left", fill="both", expand=True)
+
+        # A Listbox só tem as linhas visíveis: a rolagem é feita trocando as linhas, não rolando o widget
+        self._lista.bind("<Configure>", lambda e: self.atualizar())
+        self._lista.bind("<MouseWheel>", lambda e: self._rolar("scroll", -1 if e.delta > 0 else 1, "units"))
+        self._lista.bind("<Button-4>", lambda e: self._rolar("scroll", -1, "units"))
+        self._lista.bind("<Button-5>", lambda e: self._rolar("scroll", 1, "units"))
+        self._lista.bind("<Prior>", lambda e: self._rolar("scroll", -1, "pages"))
+        self._lista.bind("<Next>", lambda e: self._rolar("scroll", 1, "pages"))
+        if ao_escolher:
+            self._lista.bind("<Double-Button-1>", lambda e: self.escolher())
+            self._lista.bind("<Return>", lambda e: self.escolher())
+
+        self.atualizar()
+
+    def total(self):
+        if self._filtro is None or self._filtro.indices is None:
+            return self._quantidade()
+        return len(self._filtro.indices)
+
+    def indice(self, posicao):
+        if self._filtro is None or self._filtro.indices is None:
+            return posicao
+        return self._filtro.indices[posicao]
+
+    def _linhas_visiveis(self):
+        return max(1, self._lista.winfo_height() // self._altura_linha)
+
+    def atualizar(self):
+        total = self.total()
+        visiveis = self._linhas_visiveis()
+        self._primeira = max(0, min(self._primeira, total - visiveis))
+        fim = min(total, self._primeira + visiveis)
+
+        self._lista.delete(0, "end")
+        self._lista.insert("end", *(self._linha(self.indice(posicao)) for posicao in range(self._primeira, fim)))
+        if total:
+            self._barra.set(self._primeira / total, fim / total)
+        else:
+            self._barra.set(0, 1)
+
+        if self._filtro:
+            texto = f"{total:,} de {self._quantidade():,}".replace(",", ".")
+            self._contador.config(text=texto if self._filtro.concluido else texto + " (buscando...)")
+
+    def _rolar(self, acao, quantidade, unidade=None):
+        if acao == "moveto":
+            self._primeira = int(float(quantidade) * self.total())
+        else:
+            passo = self._linhas_visiveis() if unidade == "pages" else 1
+            self._primeira += int(quantidade) * passo
+        self.atualizar()
+        return "break"
+
+    def escolher(self):
+        selecao = self._lista.curselection()
+        if selecao:
+            self._ao_escolher(self.indice(self._primeira + selecao[0]))
+
+    def _buscar(self):
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+            self._busca_agendada = None
+
+        self._filtro.iniciar(self._texto_busca.get(), self._quantidade())
+        self._primeira = 0
+        self._continuar_busca()
+
+    def _continuar_busca(self):
+        self._busca_agendada = None
+        inicio = time.perf_counter()
+        while not self._filtro.concluido and time.perf_counter() - inicio < self.TEMPO_BUSCA:
+            self._filtro.avancar(self.LOTE_BUSCA)
+
+        if not self._filtro.concluido:
+            self._busca_agendada = self.after_idle(self._continuar_busca)
+        self.atualizar()
+
+    def destroy(self):
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+        super().destroy()
+
+
+# --- Monitor do Laço de Eventos ---
+
+class MonitorLaco:
+    """Mede quanto cada tique periódico da interface atrasa em relação ao horário previsto.
+
+    O atraso é o tempo em que o laço de eventos do Tk ficou ocupado sem atender a janela;
+    maior_atraso guarda o pior caso (em segundos) desde o último reiniciar().
+    """
+
+    def __init__(self, intervalo_ms):
+        self.intervalo_ms = intervalo_ms
+        self.ultimo_atraso = 0.0
+        self.maior_atraso = 0.0
+        self._previsto = None
+
+    def registrar_tique(self):
+        agora = time.perf_counter()
+        if self._previsto is not None:
+            self.ultimo_atraso = max(0.0, agora - self._previsto)
+            self.maior_atraso = max(self.maior_atraso, self.ultimo_atraso)
+        self._previsto = agora + self.intervalo_ms / 1000
+
+    def reiniciar(self):
+        self.maior_atraso = 0.0
+
+
+# Intervalo, em ms, da entrega dos resultados do TrabalhadorBanco e da medição do laço de eventos
+INTERVALO_TRABALHADOR_MS = 20
+
+# Inicialização rápida: a janela aparece só com as ações de conta e o status; o gerenciamento e os
+# dados salvos são montados/carregados depois do primeiro quadro desenhado (after_idle)
+INICIO_RAPIDO = True
+
+# Imprime no console a duração de cada etapa da inicialização e o tempo até o primeiro quadro
+# (para medir a abertura; desligado no uso normal)
+RELATORIO_INICIO = False
+
 class BancoApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, inicio_rapido=None):
+        self.inicio_rapido = INICIO_RAPIDO if inicio_rapido is None else inicio_rapido
+        self.marcas_inicio = [("início", INICIO_IMPORTACAO)]
+        self.tempo_primeiro_quadro = None
+        self._marcar_inicio("importação")
+
         super().__init__()
         self.title("Sistema Bancário - GUI Responsiva")
         self.geometry("400x600") 
         self.minsize(300, 400) 
+        self._marcar_inicio("janela")
         
         self.AGENCIA = "0001"
-        self.clientes = []
-        self.contas = []
+        self.clientes = self.contas = None
         self.conta_selecionada = None 
+
+        # Depósitos, saques, transferências e cadastros rodam no trabalhador, fora da thread da interface
+        self.trabalhador = TrabalhadorBanco(ao_erro=self._erro_operacao)
+        self.monitor_laco = MonitorLaco(INTERVALO_TRABALHADOR_MS)
+        self.protocol("WM_DELETE_WINDOW", self._fechar)
         
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         
         self.setup_ui()
+        self._marcar_inicio("interface")
+
+        # O primeiro Expose da janela agenda a marca do primeiro quadro para depois do desenho. Uma janela
+        # que abre minimizada ou coberta pode não receber Expose: o after(0) garante que o carregamento
+        # comece quando o laço de eventos começar, e só o primeiro dos dois agenda _apos_primeiro_quadro
+        self._primeiro_quadro_agendado = False
+        self.bind("<Expose>", self._ao_expor_janela)
+        self.after(0, self._ao_expor_janela)
+
+        if self.inicio_rapido:
+            self.status_label.config(text="Carregando dados...")
+        else:
+            self._carregar_dados()
+
+    def _marcar_inicio(self, etapa):
+        self.marcas_inicio.append((etapa, time.perf_counter()))
+
+    def _ao_expor_janela(self, event=None):
+        if self._primeiro_quadro_agendado:
+            return
+        self._primeiro_quadro_agendado = True
+        self.unbind("<Expose>")
+        self.after_idle(self._apos_primeiro_quadro)
+
+    def _apos_primeiro_quadro(self):
+        self._marcar_inicio("primeiro quadro")
+        self.tempo_primeiro_quadro = self.marcas_inicio[-1][1] - INICIO_IMPORTACAO
+        self._acompanhar_trabalhador()
+
+        if self.inicio_rapido:
+            self._montar_gerenciamento()
+            self._carregar_dados()
+
+        if RELATORIO_INICIO:
+            print(self.relatorio_inicio())
+
+    def _carregar_dados(self):
+        # Estado salvo em disco: último snapshot + movimentos registrados depois dele
+        self.clientes, self.contas = abrir_persistencia(DIRETORIO_DADOS, agencia=self.AGENCIA)
         self.carregar_dados_iniciais()
+        self._marcar_inicio("dados")
+
+    def _acompanhar_trabalhador(self):
+        # O próximo tique é agendado antes de entregar: um ao_concluir que abre um messagebox roda um
+        # laço de eventos aninhado, e os tiques continuam nele sem duplicar o agendamento
+        self.monitor_laco.registrar_tique()
+        self.after(INTERVALO_TRABALHADOR_MS, self._acompanhar_trabalhador)
+        self.trabalhador.entregar_resultados()
+
+    def metricas(self):
+        """Indicadores de responsividade da interface, para monitoramento."""
+        return {
+            "maior_atraso_ms": self.monitor_laco.maior_atraso * 1000,
+            "ultimo_atraso_ms": self.monitor_laco.ultimo_atraso * 1000,
+            "operacoes_pendentes": self.trabalhador.pendentes(),
+            "operacoes_executadas": self.trabalhador.executadas,
+            "pedidos_agrupados": self.trabalhador.agrupadas,
+        }
+
+    def _fechar(self):
+        # Termina as operações já pedidas antes de a persistência ser fechada no encerramento
+        self.trabalhador.fechar()
+        self.destroy()
+
+    def relatorio_inicio(self):
+        """Duração de cada etapa da inicialização, na ordem em que aconteceram, e o tempo até o primeiro quadro."""
+        modo = "rápida" if self.inicio_rapido else "completa"
+        etapas = " | ".join(
+            f"{etapa} {(marca - anterior) * 1000:.1f} ms"
+            for (_, anterior), (etapa, marca) in zip(self.marcas_inicio, self.marcas_inicio[1:])
+        )
+        relatorio = f"Inicialização {modo}: {etapas}"
+        if self.tempo_primeiro_quadro is not None:
+            relatorio += f" | até o primeiro quadro: {self.tempo_primeiro_quadro * 1000:.1f} ms"
+        return relatorio
 
     # ... (código carregar_dados_iniciais e setup_ui permanecem o mesmo)
     def carregar_dados_iniciais(self):
+        # Dados de demonstração só na primeira execução; depois, o estado vem da persistência
+        if self.contas:
+            self.conta_selecionada = self.contas[0]
+            self.atualizar_status()
+            return
+
         cliente_teste = PessoaFisica("Valdeci Boldan", "01-01-1990", "12345678900", "Rua A, 1 - Centro - Cidade/SP")
-        self.clientes.append(cliente_teste)
+        self.clientes.adicionar(cliente_teste)
         
         conta_teste = ContaCorrente.nova_conta(cliente_teste, 1) 
-        self.contas.append(conta_teste)
+        self.contas.adicionar(conta_teste)
         cliente_teste.adicionar_conta(conta_teste)
         
         transacao_dep1 = Deposito(100.00)
@@ -318,12 +2276,29 @@ class BancoApp(tk.Tk):
 
         btn_depositar = tk.Button(frame_botoes_conta, text="Depositar", command=self.handle_depositar, height=2)
         btn_sacar = tk.Button(frame_botoes_conta, text="Sacar", command=self.handle_sacar, height=2)
+        btn_transferir = tk.Button(frame_botoes_conta, text="Transferir", command=self.handle_transferir, height=2)
         btn_extrato = tk.Button(frame_botoes_conta, text="Extrato", command=self.handle_extrato, height=2)
         
         btn_depositar.pack(fill='x', pady=2)
         btn_sacar.pack(fill='x', pady=2)
+        btn_transferir.pack(fill='x', pady=2)
         btn_extrato.pack(fill='x', pady=2)
         
+        self.status_label = tk.Label(scrollable_frame, text="", font=('Arial', 14, 'bold'), fg="blue", justify=tk.LEFT)
+        self.status_label.grid(row=4, column=0, pady=(15, 5), sticky="ew", padx=pad_x)
+
+        self._scrollable_frame = scrollable_frame
+        if self.inicio_rapido:
+            # Gerenciamento fica para depois do primeiro quadro (_apos_primeiro_quadro), nas linhas 2, 3 e 5
+            return
+
+        self._montar_gerenciamento()
+        self.update_idletasks()
+
+    def _montar_gerenciamento(self):
+        scrollable_frame = self._scrollable_frame
+        pad_x = 20
+
         tk.Label(scrollable_frame, text="Gerenciamento:", font=('Arial', 16, 'bold'), justify=tk.LEFT).grid(row=2, column=0, pady=(15, 5), sticky="w", padx=pad_x)
         
         frame_botoes_gerencia = tk.Frame(scrollable_frame)
@@ -338,28 +2313,33 @@ class BancoApp(tk.Tk):
         btn_nova_conta.pack(fill='x', pady=2)
         btn_listar_contas.pack(fill='x', pady=2)
         
-        self.status_label = tk.Label(scrollable_frame, text="", font=('Arial', 14, 'bold'), fg="blue", justify=tk.LEFT)
-        self.status_label.grid(row=4, column=0, pady=(15, 5), sticky="ew", padx=pad_x)
-        
         btn_selecionar = tk.Button(scrollable_frame, text="Mudar Conta Selecionada", command=self.handle_mudar_conta, height=2)
         btn_selecionar.grid(row=5, column=0, sticky="ew", padx=pad_x, pady=(5, 20))
-        
-        self.update_idletasks()
     
     # ... (código atualizar_status e _filtrar_cliente permanecem o mesmo)
     def atualizar_status(self):
         if self.conta_selecionada:
-            conta = self.conta_selecionada
-            status_text = f"Conta Selecionada: {conta.numero}\n"
-            status_text += f"Titular: {conta.cliente.nome}\n"
-            status_text += f"Saldo: R$ {conta.saldo:.2f}"
-            self.status_label.config(text=status_text)
+            # Calculado no trabalhador; pedidos seguidos que ainda estão na fila viram um só
+            self.trabalhador.submeter(
+                self._texto_status, self.conta_selecionada,
+                ao_concluir=lambda texto: self.status_label.config(text=texto), chave="status",
+            )
         else:
             self.status_label.config(text="Nenhuma conta selecionada.")
+
+    @staticmethod
+    def _texto_status(conta):
+        status_text = f"Conta Selecionada: {conta.numero}\n"
+        status_text += f"Titular: {conta.cliente.nome}\n"
+        status_text += f"Saldo: R$ {conta.saldo:.2f}\n"
+        # Totais do mês pelas somas acumuladas do Historico, sem percorrer as transações
+        hoje = date.today()
+        totais_mes = conta.historico.totais_mes(hoje.year, hoje.month)
+        status_text += f"No mês: +R$ {totais_mes['entradas']:.2f} / -R$ {totais_mes['saidas']:.2f}"
+        return status_text
             
     def _filtrar_cliente(self, cpf):
-        clientes_filtrados = [c for c in self.clientes if c.cpf == cpf]
-        return clientes_filtrados[0] if clientes_filtrados else None
+        return self.clientes.buscar(cpf)
 
     # --- Handlers de Ação (d, s, nu, nc, lc) permanecem os mesmos ---
     # ... (handle_depositar, handle_sacar, handle_criar_usuario, etc.)
@@ -371,15 +2351,12 @@ class BancoApp(tk.Tk):
 
         valor = simpledialog.askfloat("Depósito", "Informe o valor do depósito:")
         if valor is not None:
-            sucesso, mensagem = self.conta_selecionada.depositar(valor)
-            
-            if sucesso:
-                transacao = Deposito(valor)
-                self.conta_selecionada.cliente.realizar_transacao(self.conta_selecionada, transacao)
-                self.atualizar_status()
-                messagebox.showinfo("Sucesso", mensagem)
-            else:
-                 messagebox.showerror("Erro de Depósito", mensagem)
+            conta = self.conta_selecionada
+            self.trabalhador.submeter(
+                conta.cliente.realizar_transacao, conta, Deposito(valor),
+                ao_concluir=lambda resultado: self._concluir_transacao(resultado, "Erro de Depósito"),
+                ao_erro=lambda erro: self._erro_operacao(erro, "Erro de Depósito"),
+            )
 
 
     def handle_sacar(self):
@@ -389,19 +2366,57 @@ class BancoApp(tk.Tk):
             
         valor = simpledialog.askfloat("Saque", "Informe o valor do saque:")
         if valor is not None:
-            sucesso, mensagem = self.conta_selecionada.sacar(valor)
-            
-            if sucesso:
-                transacao = Saque(valor)
-                self.conta_selecionada.cliente.realizar_transacao(self.conta_selecionada, transacao)
-                self.atualizar_status()
-                messagebox.showinfo("Sucesso", mensagem)
-            else:
-                 messagebox.showerror("Erro de Saque", mensagem)
+            conta = self.conta_selecionada
+            self.trabalhador.submeter(
+                conta.cliente.realizar_transacao, conta, Saque(valor),
+                ao_concluir=lambda resultado: self._concluir_transacao(resultado, "Erro de Saque"),
+                ao_erro=lambda erro: self._erro_operacao(erro, "Erro de Saque"),
+            )
+
+
+    def handle_transferir(self):
+        if not self.conta_selecionada:
+            messagebox.showwarning("Atenção", "Selecione uma conta primeiro.")
+            return
+
+        numero_destino = simpledialog.askinteger("Transferência", "Informe o número da conta de destino:")
+        if numero_destino is None: return
+
+        destino = self.contas.buscar(numero_destino)
+        if not destino:
+            messagebox.showerror("Erro", "Conta de destino não encontrada.")
+            return
+
+        valor = simpledialog.askfloat("Transferência", "Informe o valor da transferência:")
+        if valor is not None:
+            conta = self.conta_selecionada
+            self.trabalhador.submeter(
+                conta.cliente.realizar_transacao, conta, Transferencia(valor, destino),
+                ao_concluir=lambda resultado: self._concluir_transacao(resultado, "Erro de Transferência"),
+                ao_erro=lambda erro: self._erro_operacao(erro, "Erro de Transferência"),
+            )
+
+    def _concluir_transacao(self, resultado, titulo_erro):
+        # Executado na thread da interface quando o trabalhador termina a transação
+        sucesso, _ = resultado
+        if sucesso:
+            self.atualizar_status()
+        self._mostrar_resultado(resultado, titulo_erro)
+
+    def _mostrar_resultado(self, resultado, titulo_erro):
+        sucesso, mensagem = resultado
+        if sucesso:
+            messagebox.showinfo("Sucesso", mensagem)
+        else:
+            messagebox.showerror(titulo_erro, mensagem)
+
+    def _erro_operacao(self, erro, titulo="Erro"):
+        # Exceção levantada por uma operação no trabalhador, mostrada na thread da interface
+        messagebox.showerror(titulo, f"Não foi possível concluir a operação: {erro}")
 
 
     # NOVO MÉTODO PARA CRIAR O POP-UP DE EXTRATO PERSONALIZADO
-    def _mostrar_extrato_personalizado(self, extrato_str, saldo_atual):
+    def _mostrar_extrato_personalizado(self, historico, saldo_atual, totais):
         # 1. Cria a nova janela (Toplevel)
         extrato_window = tk.Toplevel(self)
         extrato_window.title("Extrato da Conta (Data/Hora)")
@@ -412,40 +2427,40 @@ class BancoApp(tk.Tk):
         main_frame = tk.Frame(extrato_window, padx=10, pady=10)
         main_frame.pack(fill="both", expand=True)
 
-        # 3. Widget Text (permite formatação e exibe o extrato)
-        # O width=500 é apenas uma sugestão, a largura final será ajustada pelo resize.
-        text_widget = tk.Text(main_frame, wrap="none", height=30, width=60, font=('Courier', 10), bd=2)
-        text_widget.pack(fill="both", expand=True)
-        
-        # 4. Construção do conteúdo final (usando espaçamento fixo para garantir alinhamento)
+        # 3. Construção do conteúdo (usando espaçamento fixo para garantir alinhamento)
         cabecalho = "================================================\n"
         cabecalho += "============== EXTRATO DETALHADO ==============\n"
-        cabecalho += "================================================\n"
+        cabecalho += "================================================"
         
-        rodape = "\n"
-        rodape += "================================================\n"
+        rodape = "================================================\n"
+        rodape += f"Total de Entradas: R$ {totais['entradas']:.2f}".rjust(48) + "\n"
+        rodape += f"Total de Saídas: R$ {totais['saidas']:.2f}".rjust(48) + "\n"
         rodape += f"Saldo Atual: R$ {saldo_atual:.2f}".rjust(48) + "\n"
-        rodape += "================================================\n"
-
-        conteudo = cabecalho + extrato_str + rodape
-        
-        text_widget.insert("1.0", conteudo)
-        text_widget.config(state="disabled") # Torna o texto somente leitura
+        rodape += "================================================"
+
+        tk.Label(main_frame, text=cabecalho, font=('Courier', 10), justify=tk.LEFT).pack()
+
+        # 4. Lista virtual: só as movimentações visíveis são lidas do Historico e formatadas, então
+        # o extrato abre na hora mesmo com milhões de transações; a busca filtra pelo texto da linha
+        if len(historico):
+            def linha(indice):
+                return formatar_linha_extrato(historico.transacao(indice))
+
+            # Largura extra para o número da outra conta nas linhas de transferência
+            ListaVirtual(
+                main_frame,
+                lambda: len(historico),
+                linha,
+                chave_busca=lambda indice: linha(indice).lower(),
+                largura=68,
+            ).pack(fill="both", expand=True)
+        else:
+            tk.Label(main_frame, text="Não foram realizadas movimentações.", font=('Courier', 10)).pack(pady=10)
 
-        # 5. Adiciona um Scrollbar horizontal se necessário
-        x_scrollbar = tk.Scrollbar(main_frame, orient='horizontal', command=text_widget.xview)
-        text_widget.config(xscrollcommand=x_scrollbar.set)
-        x_scrollbar.pack(side="bottom", fill="x")
+        tk.Label(main_frame, text=rodape, font=('Courier', 10), justify=tk.LEFT).pack()
 
-        # 6. Botão OK
+        # 5. Botão OK
         tk.Button(main_frame, text="OK", command=extrato_window.destroy, width=10).pack(pady=5)
-        
-        # 7. Ajusta a largura da janela para o conteúdo (Opcional, mas ajuda no desktop)
-        extrato_window.update_idletasks()
-        # Calcula a largura necessária baseada na linha mais longa (que é o cabeçalho/rodapé)
-        largura_necessaria = text_widget.winfo_reqwidth()
-        altura_necessaria = extrato_window.winfo_reqheight()
-        extrato_window.geometry(f"{largura_necessaria}x{altura_necessaria}")
 
 
     # MÉTODO EXTRATO REESCRITO PARA USAR O POP-UP PERSONALIZADO
@@ -453,43 +2468,9 @@ class BancoApp(tk.Tk):
         if not self.conta_selecionada:
             messagebox.showwarning("Atenção", "Selecione uma conta primeiro.")
             return
-            
-        extrato_list = []
-        tem_transacao = False
-        
-        # Define as larguras fixas em caracteres para um alinhamento perfeito (Courier é monospace)
-        LARGURA_DATA = 20  # [DD-MM-AAAA HH:MM:SS] -> 20 caracteres
-        LARGURA_TIPO = 10  # Deposito: / Saque:
-        LARGURA_VALOR = 12 # R$ 999.999,99
-        
-        # Total de caracteres por linha: 20 + 10 + 12 = 42. Um total de ~50 é seguro para o pop-up.
 
-        for transacao in self.conta_selecionada.historico.gerar_relatorio():
-            tem_transacao = True
-            
-            # Formata a data (LEFT-justified)
-            data_formatada = f"[{transacao['data']}]".ljust(LARGURA_DATA)
-            # Formata o tipo de transação (LEFT-justified)
-            tipo_formatado = f"{transacao['tipo']}:".ljust(LARGURA_TIPO)
-            # Formata o valor (RIGHT-justified)
-            valor_formatado = f"R$ {transacao['valor']:.2f}".rjust(LARGURA_VALOR) 
-
-            # Constrói a linha com espaçamento fixo
-            extrato_list.append(
-                f"{data_formatada} {tipo_formatado} {valor_formatado}"
-            )
-            extrato_list.append("-" * 45) # Separador visual
-
-        if tem_transacao:
-            extrato_list.pop() # Remove o último separador visual
-
-        if not tem_transacao:
-            extrato_str = "Não foram realizadas movimentações."
-        else:
-            extrato_str = "\n".join(extrato_list)
-        
-        # Chama a nova função para exibir o pop-up com o widget Text
-        self._mostrar_extrato_personalizado(extrato_str, self.conta_selecionada.saldo)
+        totais = self.conta_selecionada.historico.totais()
+        self._mostrar_extrato_personalizado(self.conta_selecionada.historico, self.conta_selecionada.saldo, totais)
 
     # ... (handle_criar_usuario, handle_criar_conta, handle_listar_contas, handle_mudar_conta permanecem o mesmo)
 
@@ -506,9 +2487,19 @@ class BancoApp(tk.Tk):
         endereco = simpledialog.askstring("Novo Usuário", "Informe o endereço (logradouro, nro - bairro - cidade/sigla estado):")
 
         if nome and data_nascimento and endereco:
-            novo_cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
-            self.clientes.append(novo_cliente)
-            messagebox.showinfo("Sucesso", f"Usuário {nome} criado com sucesso!")
+            def criar_usuario():
+                # A verificação acima só evita pedir os dados à toa: a que vale é esta, no trabalhador e junto
+                # com a inclusão, então dois pedidos seguidos com o mesmo CPF não passam os dois
+                if self._filtrar_cliente(cpf):
+                    return False, "Já existe usuário com esse CPF!"
+
+                novo_cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
+                self.clientes.adicionar(novo_cliente)
+                return True, f"Usuário {nome} criado com sucesso!"
+
+            self.trabalhador.submeter(
+                criar_usuario, ao_concluir=lambda resultado: self._mostrar_resultado(resultado, "Erro")
+            )
         else:
             messagebox.showwarning("Atenção", "Todos os campos são obrigatórios.")
 
@@ -519,52 +2510,69 @@ class BancoApp(tk.Tk):
         cliente = self._filtrar_cliente(cpf)
 
         if cliente:
-            numero_conta = len(self.contas) + 1
-            nova_conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta) 
-            
-            self.contas.append(nova_conta)
-            cliente.adicionar_conta(nova_conta)
-            
-            messagebox.showinfo("Sucesso", f"Conta {self.AGENCIA}-{numero_conta} criada com sucesso para {cliente.nome}!")
+            def criar_conta():
+                # O número é escolhido no trabalhador: dois pedidos seguidos não recebem o mesmo
+                numero_conta = self.contas.proximo_numero()
+                nova_conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta) 
+                
+                self.contas.adicionar(nova_conta)
+                cliente.adicionar_conta(nova_conta)
+                return numero_conta
+
+            self.trabalhador.submeter(
+                criar_conta,
+                ao_concluir=lambda numero_conta: messagebox.showinfo(
+                    "Sucesso", f"Conta {self.AGENCIA}-{numero_conta} criada com sucesso para {cliente.nome}!"
+                ),
+            )
         else:
             messagebox.showerror("Erro", "Cliente não encontrado.")
 
+    def _janela_contas(self, titulo, ao_escolher=None):
+        # Lista virtual sobre self.contas: só as contas visíveis são formatadas
+        janela = tk.Toplevel(self)
+        janela.title(titulo)
+        janela.transient(self)
+        janela.grab_set()
+
+        main_frame = tk.Frame(janela, padx=10, pady=10)
+        main_frame.pack(fill="both", expand=True)
+
+        lista = ListaVirtual(
+            main_frame,
+            lambda: len(self.contas),
+            lambda indice: formatar_linha_conta(self.contas[indice]),
+            chave_busca=lambda indice: chave_busca_conta(self.contas[indice]),
+            ao_escolher=ao_escolher,
+        )
+        lista.pack(fill="both", expand=True)
+
+        frame_botoes = tk.Frame(main_frame)
+        frame_botoes.pack(pady=5)
+        if ao_escolher:
+            tk.Button(frame_botoes, text="Selecionar", command=lista.escolher, width=10).pack(side="left", padx=5)
+        tk.Button(frame_botoes, text="Fechar", command=janela.destroy, width=10).pack(side="left", padx=5)
+        return janela
+
     def handle_listar_contas(self):
         if not self.contas:
             messagebox.showinfo("Contas", "Nenhuma conta cadastrada.")
             return
 
-        lista_contas = []
-        for conta_detalhes in ContasIterador(self.contas):
-            lista_contas.append(textwrap.dedent(conta_detalhes))
-            
-        contas_str = "=" * 30 + "\n" + ("\n" + "=" * 30 + "\n").join(lista_contas)
-        messagebox.showinfo("Lista de Contas (Iterador)", contas_str)
+        self._janela_contas("Lista de Contas")
         
     def handle_mudar_conta(self):
         if not self.contas:
             messagebox.showwarning("Atenção", "Nenhuma conta cadastrada.")
             return
-            
-        contas_opcoes = [f"{c.agencia}-{c.numero} | Titular: {c.cliente.nome}" for c in self.contas]
-        
-        while True:
-            prompt = "Selecione o número da conta (ex: 1 para a primeira conta):\n" + "\n".join(contas_opcoes)
-            selecao_str = simpledialog.askstring("Mudar Conta", prompt)
-            
-            if selecao_str is None: return 
-            
-            try:
-                indice = int(selecao_str) - 1
-                if 0 <= indice < len(self.contas):
-                    self.conta_selecionada = self.contas[indice]
-                    self.atualizar_status()
-                    messagebox.showinfo("Sucesso", f"Conta {self.conta_selecionada.numero} selecionada.")
-                    break
-                else:
-                    messagebox.showerror("Erro", "Número de conta inválido.")
-            except ValueError:
-                messagebox.showerror("Erro", "Por favor, insira um número válido.")
+
+        def selecionar(indice):
+            self.conta_selecionada = self.contas[indice]
+            self.atualizar_status()
+            janela.destroy()
+            messagebox.showinfo("Sucesso", f"Conta {self.conta_selecionada.numero} selecionada.")
+
+        janela = self._janela_contas("Mudar Conta", ao_escolher=selecionar)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,917 @@
+import ast
+import inspect
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import timeit
+import tracemalloc
+from array import array
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import banco_gu_V2
+from banco_gu_V2 import (
+    Cliente,
+    Conta,
+    ContaCorrente,
+    Deposito,
+    Dinheiro,
+    ExecutorTransacoes,
+    Historico,
+    PersistenciaBanco,
+    PessoaFisica,
+    RegistroClientes,
+    Saque,
+    Transacao,
+    Transferencia,
+)
+
+# ==============================================================================
+# BENCHMARKS DO MODELO DE DADOS
+# Execute com: python benchmark.py
+# ==============================================================================
+
+TAMANHOS_HISTORICO = (10, 1_000, 100_000, 1_000_000)
+TAMANHOS_CLIENTES = (10, 1_000, 100_000, 1_000_000)
+
+
+def criar_conta_com_historico(quantidade, tipo_transacao=Saque):
+    cliente = PessoaFisica("Cliente Benchmark", "01-01-1990", "00000000000", "Rua B, 2 - Centro - Cidade/SP")
+    conta = ContaCorrente(1, cliente)
+
+    transacao = tipo_transacao(1.00)
+    for _ in range(quantidade):
+        conta.historico.adicionar_transacao(transacao)
+
+    return conta
+
+
+def benchmark_limite_saques(repeticoes=5, execucoes=10_000):
+    print("=== Verificação de limite em ContaCorrente.sacar ===")
+
+    # O histórico já está acima do limite de saques: a chamada mede apenas a verificação
+    # dos limites, sem escrita em log nem alteração de saldo.
+    sacar = ContaCorrente.sacar.__wrapped__
+
+    for quantidade in TAMANHOS_HISTORICO:
+        conta = criar_conta_com_historico(quantidade)
+        tempos = timeit.repeat(lambda: sacar(conta, 10.00), number=execucoes, repeat=repeticoes)
+        tempo_medio = min(tempos) / execucoes * 1_000_000
+
+        print(f"{quantidade:>12,} transações: {tempo_medio:8.3f} µs por saque")
+
+
+def medir_memoria(funcao):
+    tracemalloc.start()
+    resultado = funcao()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, memoria
+
+
+def historico_em_dicionarios(quantidade):
+    # Layout anterior do Historico: um dicionário com strings por transação
+    transacoes = []
+    for _ in range(quantidade):
+        transacoes.append(
+            {
+                "tipo": Deposito.__name__,
+                "valor": 1.00,
+                "data": datetime.now().strftime("%d-%m-%y %H:%M"),
+            }
+        )
+    return transacoes
+
+
+def historico_colunar(quantidade):
+    historico = Historico()
+    transacao = Deposito(1.00)
+    for _ in range(quantidade):
+        historico.adicionar_transacao(transacao)
+    return historico
+
+
+def benchmark_memoria_historico(quantidade=1_000_000):
+    print(f"=== Memória do Historico com {quantidade:,} transações ===")
+
+    _, memoria_dicionarios = medir_memoria(lambda: historico_em_dicionarios(quantidade))
+    _, memoria_colunar = medir_memoria(lambda: historico_colunar(quantidade))
+
+    print(f"Lista de dicionários: {memoria_dicionarios / 1024 / 1024:8.1f} MiB")
+    print(f"Arrays colunares:     {memoria_colunar / 1024 / 1024:8.1f} MiB")
+    print(f"Redução:              {memoria_dicionarios / memoria_colunar:8.1f}x")
+
+
+def benchmark_memoria_selada(quantidade=1_000_000):
+    print(f"=== Historico com {quantidade:,} transações selado em segmento (mmap) ===")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        tracemalloc.start()
+        historico = historico_colunar(quantidade)
+        memoria_antes, _ = tracemalloc.get_traced_memory()
+        historico.selar(os.path.join(diretorio, "historico.seg"))
+        memoria_depois, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        inicio = time.perf_counter()
+        total = sum(transacao["valor"] for transacao in historico.gerar_relatorio())
+        tempo_leitura = time.perf_counter() - inicio
+
+        print(f"Em memória:        {memoria_antes / 1024 / 1024:8.1f} MiB")
+        print(f"Selado:            {memoria_depois / 1024 / 1024:8.1f} MiB")
+        print(f"Leitura completa:  {tempo_leitura:8.2f} s (total R$ {total:,.2f})")
+        del historico
+
+
+def recompilar_sem_slots(*classes):
+    """Recompila as classes de banco_gu_V2 a partir do código-fonte, sem __slots__: o layout anterior,
+    com os atributos em um __dict__ por instância. Bases vêm antes das subclasses."""
+    namespace = dict(vars(banco_gu_V2))
+    for classe in classes:
+        arvore = ast.parse(textwrap.dedent(inspect.getsource(classe)))
+        definicao = arvore.body[0]
+        definicao.body = [
+            no for no in definicao.body
+            if not (isinstance(no, ast.Assign) and any(getattr(alvo, "id", None) == "__slots__" for alvo in no.targets))
+        ]
+        # Executadas no mesmo namespace: PessoaFisica herda do Cliente recompilado, Conta cria o Historico recompilado
+        exec(compile(arvore, inspect.getsourcefile(classe), "exec"), namespace)
+    return {classe.__name__: namespace[classe.__name__] for classe in classes}
+
+
+COM_DICIONARIO = recompilar_sem_slots(Cliente, PessoaFisica, Historico, Conta, ContaCorrente, Transacao, Deposito)
+
+
+def criar_contas(quantidade, classe_cliente, classe_conta):
+    contas = []
+    for numero in range(quantidade):
+        cliente = classe_cliente("Cliente Benchmark", "01-01-1990", f"{numero:011d}", "Rua B, 2")
+        conta = classe_conta(numero, cliente)
+        cliente.contas.append(conta)
+        contas.append(conta)
+    return contas
+
+
+def benchmark_memoria_objetos(quantidade_contas=1_000_000, quantidade_transacoes=10_000_000):
+    print("=== Objetos de domínio: __dict__ x __slots__ ===")
+    PessoaFisicaComDicionario = COM_DICIONARIO["PessoaFisica"]
+    ContaCorrenteComDicionario = COM_DICIONARIO["ContaCorrente"]
+    DepositoComDicionario = COM_DICIONARIO["Deposito"]
+
+    _, memoria_antes = medir_memoria(
+        lambda: criar_contas(quantidade_contas, PessoaFisicaComDicionario, ContaCorrenteComDicionario)
+    )
+    _, memoria_depois = medir_memoria(lambda: criar_contas(quantidade_contas, PessoaFisica, ContaCorrente))
+    print(
+        f"{quantidade_contas:>12,} contas:     "
+        f"{memoria_antes / 1024 / 1024:8.1f} MiB -> {memoria_depois / 1024 / 1024:8.1f} MiB"
+    )
+
+    # Um objeto Saque/Deposito por movimento: memória ocupada e custo de criação
+    _, memoria_antes = medir_memoria(lambda: [DepositoComDicionario(1.00) for _ in range(quantidade_transacoes)])
+    _, memoria_depois = medir_memoria(lambda: [Deposito(1.00) for _ in range(quantidade_transacoes)])
+    print(
+        f"{quantidade_transacoes:>12,} transações: "
+        f"{memoria_antes / 1024 / 1024:8.1f} MiB -> {memoria_depois / 1024 / 1024:8.1f} MiB"
+    )
+
+    tempo_antes = min(timeit.repeat(lambda: DepositoComDicionario(1.00), number=1_000_000, repeat=5))
+    tempo_depois = min(timeit.repeat(lambda: Deposito(1.00), number=1_000_000, repeat=5))
+    print(f"Criação de um Deposito:      {tempo_antes:8.3f} µs -> {tempo_depois:8.3f} µs")
+
+
+def benchmark_agregados(quantidade=1_000_000, execucoes=1_000):
+    print(f"=== Saldo em uma data e totais do mês: {quantidade:,} transações ===")
+
+    # Uma transação por minuto, alternando depósitos e saques, a partir de 01/01/2020
+    historico = Historico()
+    inicio = datetime(2020, 1, 1)
+    for indice in range(0, quantidade, 1_000):
+        tipo = Deposito.__name__ if indice % 2_000 == 0 else Saque.__name__
+        historico.adicionar_transacoes([tipo] * 1_000, array("q", [100]) * 1_000, inicio + timedelta(minutes=indice))
+
+    data_consulta = (inicio + timedelta(minutes=quantidade // 2)).date()
+
+    def saldo_percorrendo():
+        saldo = 0
+        for transacao in historico.gerar_relatorio(data_fim=data_consulta):
+            saldo += transacao["valor"] if transacao["tipo"] == Deposito.__name__ else -transacao["valor"]
+        return saldo
+
+    inicio_consulta = time.perf_counter()
+    saldo_esperado = saldo_percorrendo()
+    tempo_percorrendo = time.perf_counter() - inicio_consulta
+
+    tempo_saldo = timeit.timeit(lambda: historico.saldo_em(data_consulta), number=execucoes) / execucoes
+    tempo_mes = timeit.timeit(
+        lambda: historico.totais_mes(data_consulta.year, data_consulta.month), number=execucoes
+    ) / execucoes
+
+    assert historico.saldo_em(data_consulta) == saldo_esperado
+    print(f"Percorrendo gerar_relatorio: {tempo_percorrendo * 1_000_000:12.1f} µs")
+    print(f"saldo_em (somas acumuladas): {tempo_saldo * 1_000_000:12.1f} µs")
+    print(f"totais_mes:                  {tempo_mes * 1_000_000:12.1f} µs")
+
+
+def livro_sintetico(quantidade, quantidade_contas):
+    import numpy as np
+
+    from analise import LivroRazao
+
+    # Linhas agrupadas por conta e em ordem cronológica dentro de cada conta, como em LivroRazao.do_banco,
+    # cobrindo cerca de 5 anos a partir de 01/01/2020
+    gerador = np.random.default_rng(42)
+    por_conta = np.bincount(gerador.integers(0, quantidade_contas, quantidade), minlength=quantidade_contas)
+    conta = np.repeat(np.arange(quantidade_contas, dtype=np.int32), por_conta)
+    # Intervalos em segundos: a soma acumulada de todas as contas não cabe em int64 se for em µs
+    intervalo_medio = 5 * 365 * 86_400 * quantidade_contas // quantidade
+    acumulado = np.cumsum(gerador.integers(0, 2 * intervalo_medio, quantidade))
+    nova_conta = np.ones(quantidade, dtype=bool)
+    nova_conta[1:] = conta[1:] != conta[:-1]
+    inicio_conta = np.maximum.accumulate(np.where(nova_conta, acumulado, 0))
+    datas = Historico._marca_tempo(datetime(2020, 1, 1)) + (acumulado - inicio_conta) * 1_000_000
+
+    for tipo in (Deposito.__name__, Saque.__name__, Transferencia.__name__, "Recebimento"):
+        Historico._codigo_tipo(tipo)
+    tipos = gerador.integers(0, len(Historico._tipos_transacao), quantidade, dtype=np.uint8)
+    valores = gerador.integers(1, 100_000, quantidade)
+    # Números de conta no lugar dos objetos Conta
+    return LivroRazao(valores, datas, tipos, conta, list(range(1, quantidade_contas + 1)))
+
+
+def benchmark_analise(quantidade=50_000_000, quantidade_contas=1_000_000, quantidade_python=1_000_000):
+    try:
+        import analise
+    except ImportError:
+        print("=== Análises vetorizadas: NumPy não instalado (pip install numpy), benchmark ignorado ===")
+        return
+
+    print(f"=== Análises vetorizadas: {quantidade:,} transações em {quantidade_contas:,} contas ===")
+
+    # Exportação a partir dos Historicos reais, comparada ao laço em Python que a substitui
+    contas = [ContaCorrente(numero, None) for numero in range(1, quantidade_python // 100 + 1)]
+    inicio = datetime(2020, 1, 1)
+    for conta in contas:
+        conta.historico.adicionar_transacoes([Deposito.__name__, Saque.__name__] * 50, array("q", [100]) * 100, inicio)
+
+    inicio_execucao = time.perf_counter()
+    entradas_por_mes = {}
+    for conta in contas:
+        for transacao in conta.historico.gerar_relatorio():
+            if transacao["tipo"] == Deposito.__name__:
+                mes = (transacao["data"].year, transacao["data"].month)
+                entradas_por_mes[mes] = entradas_por_mes.get(mes, 0) + transacao["valor"]
+    tempo_python = time.perf_counter() - inicio_execucao
+
+    inicio_execucao = time.perf_counter()
+    livro = analise.LivroRazao.do_banco(contas)
+    resumo = analise.resumo_mensal(livro)
+    tempo_numpy = time.perf_counter() - inicio_execucao
+    assert int(resumo["entradas"].sum()) == sum(entradas_por_mes.values())
+
+    print(f"Resumo mensal de {quantidade_python:,} transações em Python: {tempo_python:8.2f} s")
+    print(f"Exportação + resumo mensal com NumPy:                {tempo_numpy:8.2f} s")
+
+    livro = livro_sintetico(quantidade, quantidade_contas)
+    analises = (
+        ("resumo_diario", lambda: analise.resumo_diario(livro)),
+        ("resumo_mensal", lambda: analise.resumo_mensal(livro)),
+        ("maiores_contas(10)", lambda: analise.maiores_contas(livro, 10)),
+        ("velocidade_saques(3, 60 min)", lambda: analise.velocidade_saques(livro, 3, 60)),
+    )
+    for descricao, funcao in analises:
+        inicio_execucao = time.perf_counter()
+        funcao()
+        print(f"{descricao:<30}: {time.perf_counter() - inicio_execucao:8.2f} s")
+
+
+def benchmark_busca_clientes(repeticoes=5, execucoes=100_000):
+    print("=== Busca de cliente por CPF em RegistroClientes ===")
+
+    clientes = RegistroClientes()
+    for quantidade in TAMANHOS_CLIENTES:
+        for indice in range(len(clientes), quantidade):
+            clientes.adicionar(PessoaFisica("Cliente Benchmark", "01-01-1990", f"{indice:011d}", "Rua B, 2"))
+
+        cpf_procurado = f"{quantidade - 1:011d}"
+        tempos = timeit.repeat(lambda: clientes.buscar(cpf_procurado), number=execucoes, repeat=repeticoes)
+        tempo_medio = min(tempos) / execucoes * 1_000_000
+
+        print(f"{quantidade:>12,} clientes: {tempo_medio:8.3f} µs por busca")
+
+
+def benchmark_decorador_log(execucoes=200_000):
+    print("=== Custo do decorador log_transacao em Conta.depositar ===")
+
+    conta = criar_conta_com_historico(0)
+    depositar_sem_log = Conta.depositar.__wrapped__
+    tempo_base = timeit.timeit(lambda: depositar_sem_log(conta, 1.00), number=execucoes)
+
+    cenarios = (
+        ("log desligado", None, 1),
+        ("amostragem 1 a cada 1000", logging.INFO, 1000),
+        ("todas as chamadas", logging.INFO, 1),
+    )
+    escritor_original = banco_gu_V2.escritor_log
+    for descricao, nivel, amostragem in cenarios:
+        banco_gu_V2.NIVEL_LOG = nivel
+        Conta.depositar.amostragem = amostragem
+        banco_gu_V2.escritor_log = banco_gu_V2.EscritorLog(os.devnull, limite_buffer=execucoes)
+
+        tempo = timeit.timeit(lambda: conta.depositar(1.00), number=execucoes)
+        banco_gu_V2.escritor_log.fechar()
+
+        custo = (tempo - tempo_base) / execucoes * 1_000_000
+        print(f"{descricao:<28}: {custo:8.3f} µs de custo por chamada")
+
+    banco_gu_V2.NIVEL_LOG = logging.INFO
+    Conta.depositar.amostragem = 1
+    banco_gu_V2.escritor_log = escritor_original
+
+
+def benchmark_log_por_conta(quantidade_registros=1_000_000, quantidade_contas=10_000, consultas=100):
+    print(f"=== ler_log_conta: {quantidade_registros:,} registros JSON de {quantidade_contas:,} contas ===")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "log.jsonl")
+        escritor = banco_gu_V2.EscritorLog(caminho, registros_por_escrita=quantidade_registros + 1)
+        contas = [ContaCorrente(numero, None) for numero in range(1, quantidade_contas + 1)]
+        data_hora = datetime(2024, 1, 1)
+        for indice in range(quantidade_registros):
+            conta = contas[indice % quantidade_contas]
+            escritor.escrever(banco_gu_V2._registro_json, "depositar", data_hora, (conta, indice), None)
+        escritor.descarregar()
+
+        numeros = [1 + indice * 7919 % quantidade_contas for indice in range(consultas)]
+
+        # Antes: o .idx inteiro lido e filtrado a cada consulta
+        inicio = time.perf_counter()
+        for numero in numeros:
+            with open(f"{caminho}.idx", "rb") as arquivo_indice:
+                entradas = banco_gu_V2.ENTRADA_INDICE.iter_unpack(arquivo_indice.read())
+            [posicao for conta, posicao in entradas if conta == numero]
+        tempo_varredura = (time.perf_counter() - inicio) / consultas
+
+        inicio = time.perf_counter()
+        lidos = len(list(banco_gu_V2.ler_log_conta(caminho, numeros[0])))
+        tempo_primeira = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for numero in numeros[1:]:
+            for _ in banco_gu_V2.ler_log_conta(caminho, numero):
+                pass
+        tempo_consulta = (time.perf_counter() - inicio) / (consultas - 1)
+
+        # Registros gravados depois da primeira consulta entram no índice em memória
+        escritor.escrever(banco_gu_V2._registro_json, "sacar", data_hora, (contas[numeros[0] - 1],), None)
+        escritor.fechar()
+        assert len(list(banco_gu_V2.ler_log_conta(caminho, numeros[0]))) == lidos + 1
+
+        print(f"Varredura do .idx por consulta:     {tempo_varredura * 1000:8.2f} ms")
+        print(f"Primeira consulta (lê o .idx):       {tempo_primeira * 1000:8.2f} ms")
+        print(f"Consultas seguintes ({lidos} registros): {tempo_consulta * 1000:8.2f} ms")
+
+
+def benchmark_reinicio(movimentos_recentes=1_000, repeticoes=3):
+    print(f"=== Reinício com snapshot + {movimentos_recentes:,} movimentos no diário ===")
+
+    for quantidade in TAMANHOS_HISTORICO:
+        with tempfile.TemporaryDirectory() as diretorio:
+            persistencia = PersistenciaBanco(diretorio, movimentos_por_snapshot=movimentos_recentes + 1)
+            clientes, contas = persistencia.carregar()
+
+            cliente = PessoaFisica("Cliente Benchmark", "01-01-1990", "00000000000", "Rua B, 2")
+            clientes.adicionar(cliente)
+            conta = ContaCorrente(1, cliente)
+            contas.adicionar(conta)
+            cliente.adicionar_conta(conta)
+
+            # Histórico antigo vai para o snapshot; só os movimentos recentes ficam no diário
+            valores = array("q", [Dinheiro.de_reais(1.00)]) * quantidade
+            conta.historico.adicionar_transacoes([Deposito.__name__] * quantidade, valores)
+            persistencia.salvar_snapshot()
+
+            banco_gu_V2.NIVEL_LOG = None
+            banco_gu_V2.persistencia = persistencia
+            for _ in range(movimentos_recentes):
+                Deposito(1.00).registrar(conta)
+            banco_gu_V2.persistencia = None
+            banco_gu_V2.NIVEL_LOG = logging.INFO
+            persistencia._arquivo_wal.close()
+
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                recarregada = PersistenciaBanco(diretorio)
+                recarregada.carregar()
+                tempos.append(time.perf_counter() - inicio)
+                recarregada._arquivo_wal.close()
+
+        print(f"{quantidade:>12,} transações: {min(tempos) * 1000:8.1f} ms para carregar")
+
+
+# Executado em um processo novo: abre a interface e imprime o tempo até o primeiro quadro
+SCRIPT_PRIMEIRO_QUADRO = """
+import banco_gu_V2
+
+banco_gu_V2.RELATORIO_INICIO = False
+app = banco_gu_V2.BancoApp(inicio_rapido={inicio_rapido})
+
+def verificar():
+    if app.tempo_primeiro_quadro is None or app.contas is None:
+        app.after(10, verificar)
+        return
+    print(app.tempo_primeiro_quadro)
+    app.destroy()
+
+app.after(10, verificar)
+app.mainloop()
+"""
+
+
+def medir_em_processo(script, diretorio, repeticoes):
+    ambiente = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", script], cwd=diretorio, env=ambiente, capture_output=True, text=True, check=True
+        )
+        tempos.append(float(saida.stdout.split()[-1]))
+    return min(tempos)
+
+
+def benchmark_inicio(quantidade_contas=10_000, transacoes_por_conta=100, repeticoes=5):
+    print(f"=== Inicialização da interface: {quantidade_contas:,} contas salvas ===")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Banco salvo em disco, como encontrado pela BancoApp ao abrir
+        persistencia = PersistenciaBanco(os.path.join(diretorio, banco_gu_V2.DIRETORIO_DADOS))
+        clientes, contas = persistencia.carregar()
+        valores = array("q", [Dinheiro.de_reais(1.00)]) * transacoes_por_conta
+        for numero in range(1, quantidade_contas + 1):
+            cliente = PessoaFisica("Cliente Benchmark", "01-01-1990", f"{numero:011d}", "Rua B, 2")
+            conta = ContaCorrente(numero, cliente)
+            cliente.adicionar_conta(conta)
+            clientes.adicionar(cliente)
+            contas.adicionar(conta)
+            conta.historico.adicionar_transacoes([Deposito.__name__] * transacoes_por_conta, valores)
+        persistencia.salvar_snapshot()
+        persistencia.fechar()
+
+        script_importacao = (
+            "import time; inicio = time.perf_counter(); import banco_gu_V2; print(time.perf_counter() - inicio)"
+        )
+        tempo_importacao = medir_em_processo(script_importacao, diretorio, repeticoes)
+
+        tempos_carga = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            recarregada = PersistenciaBanco(os.path.join(diretorio, banco_gu_V2.DIRETORIO_DADOS))
+            recarregada.carregar()
+            tempos_carga.append(time.perf_counter() - inicio)
+            recarregada._arquivo_wal.close()
+
+        print(f"Importação de banco_gu_V2:                  {tempo_importacao * 1000:8.1f} ms")
+        print(f"Carga dos dados (adiada no início rápido):  {min(tempos_carga) * 1000:8.1f} ms")
+
+        if not os.environ.get("DISPLAY"):
+            print("Sem DISPLAY: tempo até o primeiro quadro não medido")
+            return
+
+        for descricao, inicio_rapido in (("completo", False), ("rápido", True)):
+            script = SCRIPT_PRIMEIRO_QUADRO.format(inicio_rapido=inicio_rapido)
+            tempo = medir_em_processo(script, diretorio, repeticoes)
+            print(f"Primeiro quadro, início {descricao + ':':<10}          {tempo * 1000:8.1f} ms")
+
+
+def medir_busca(filtro, texto, quantidade):
+    # Mesmo laço de ListaVirtual._continuar_busca, sem a interface: retorna (ciclos, maior ciclo)
+    filtro.iniciar(texto, quantidade)
+    ciclos, maior_ciclo = 0, 0.0
+    while not filtro.concluido:
+        inicio = time.perf_counter()
+        while not filtro.concluido and time.perf_counter() - inicio < banco_gu_V2.ListaVirtual.TEMPO_BUSCA:
+            filtro.avancar(banco_gu_V2.ListaVirtual.LOTE_BUSCA)
+        ciclos += 1
+        maior_ciclo = max(maior_ciclo, time.perf_counter() - inicio)
+    return ciclos, maior_ciclo
+
+
+def benchmark_listas_virtuais(quantidade_contas=100_000, quantidade_transacoes=1_000_000, linhas_visiveis=30):
+    print(f"=== Listas da interface: {quantidade_contas:,} contas e extrato de {quantidade_transacoes:,} linhas ===")
+
+    contas = banco_gu_V2.RegistroContas()
+    for numero in range(1, quantidade_contas + 1):
+        cliente = PessoaFisica(f"Cliente {numero}", "01-01-1990", f"{numero:011d}", "Rua B, 2")
+        contas.adicionar(ContaCorrente(numero, cliente))
+    conta = contas[0]
+    valores = array("q", [Dinheiro.de_reais(1.00)]) * quantidade_transacoes
+    conta.historico.adicionar_transacoes([Deposito.__name__] * quantidade_transacoes, valores)
+
+    def lista_completa():
+        return "\n".join(banco_gu_V2.ContasIterador(contas))
+
+    def lista_visivel():
+        meio = quantidade_contas // 2
+        return [banco_gu_V2.formatar_linha_conta(contas[indice]) for indice in range(meio, meio + linhas_visiveis)]
+
+    def extrato_completo():
+        # Como o extrato era montado antes da lista virtual: o texto de todas as movimentações de uma vez
+        linhas = map(banco_gu_V2.formatar_linha_extrato, conta.historico.gerar_relatorio())
+        return ("\n" + "-" * 45 + "\n").join(linhas)
+
+    def extrato_visivel():
+        meio = quantidade_transacoes // 2
+        return [
+            banco_gu_V2.formatar_linha_extrato(conta.historico.transacao(indice))
+            for indice in range(meio, meio + linhas_visiveis)
+        ]
+
+    medicoes = (
+        ("Lista de contas inteira (ContasIterador)", lista_completa, 1),
+        (f"Lista de contas, {linhas_visiveis} linhas visíveis", lista_visivel, 1_000),
+        ("Extrato inteiro (texto completo)", extrato_completo, 1),
+        (f"Extrato, {linhas_visiveis} linhas visíveis", extrato_visivel, 1_000),
+    )
+    for descricao, funcao, execucoes in medicoes:
+        tempo = timeit.timeit(funcao, number=execucoes) / execucoes
+        print(f"{descricao:<42}: {tempo * 1000:10.3f} ms")
+
+    def chave_conta(indice):
+        return banco_gu_V2.chave_busca_conta(contas[indice])
+
+    def chave_extrato(indice):
+        return banco_gu_V2.formatar_linha_extrato(conta.historico.transacao(indice)).lower()
+
+    buscas = (
+        ("Busca 'cliente 99' nas contas", banco_gu_V2.FiltroIncremental(chave_conta), "cliente 99", quantidade_contas),
+        # As chaves de busca ficam guardadas nas contas: a segunda busca não formata nada
+        ("Busca 'cliente 98' nas contas", banco_gu_V2.FiltroIncremental(chave_conta), "cliente 98", quantidade_contas),
+        ("Busca 'saque' no extrato", banco_gu_V2.FiltroIncremental(chave_extrato), "saque", quantidade_transacoes),
+    )
+    for descricao, filtro, texto, quantidade in buscas:
+        ciclos, maior_ciclo = medir_busca(filtro, texto, quantidade)
+        print(f"{descricao:<42}: {ciclos:6,} ciclos ociosos, o maior com {maior_ciclo * 1000:6.1f} ms")
+
+
+def resumo_sem_cache(conta):
+    # Como ContasIterador montava cada resumo antes, com o textwrap.dedent que quem listava aplicava depois
+    return textwrap.dedent(f"""\
+            Agência:\t{conta.agencia}
+            Número:\t\t{conta.numero}
+            Titular:\t{conta.cliente.nome}
+            Saldo:\t\tR$ {conta.saldo:.2f}
+        """)
+
+
+def benchmark_resumos_contas(quantidade_contas=1_000_000, alteradas=10_000, tamanho_pagina=50):
+    print(f"=== Resumos de {quantidade_contas:,} contas (ContasIterador) ===")
+
+    contas = banco_gu_V2.RegistroContas()
+    for numero in range(1, quantidade_contas + 1):
+        cliente = PessoaFisica(f"Cliente {numero}", "01-01-1990", f"{numero:011d}", "Rua B, 2")
+        contas.adicionar(ContaCorrente(numero, cliente))
+
+    def listar():
+        return list(banco_gu_V2.ContasIterador(contas))
+
+    inicio = time.perf_counter()
+    antes = [resumo_sem_cache(conta) for conta in contas]
+    tempo_sem_cache = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    primeira = listar()
+    tempo_primeira = time.perf_counter() - inicio
+    assert primeira == antes
+
+    inicio = time.perf_counter()
+    listar()
+    tempo_repetida = time.perf_counter() - inicio
+
+    passo = quantidade_contas // alteradas
+    for conta in contas[::passo]:
+        conta._saldo += Dinheiro.de_reais(10.00)
+    inicio = time.perf_counter()
+    depois = listar()
+    tempo_alteradas = time.perf_counter() - inicio
+    assert depois == [resumo_sem_cache(conta) for conta in contas]
+
+    iterador = banco_gu_V2.ContasIterador(contas)
+    ultima = iterador.quantidade_paginas(tamanho_pagina) - 1
+    tempo_pagina = timeit.timeit(lambda: list(iterador.pagina(ultima, tamanho_pagina)), number=1_000) / 1_000
+
+    print(f"Sem cache (f-string + dedent):          {tempo_sem_cache * 1000:10.1f} ms")
+    print(f"Primeira listagem (monta os resumos):   {tempo_primeira * 1000:10.1f} ms")
+    print(f"Listagem repetida:                      {tempo_repetida * 1000:10.1f} ms")
+    print(f"Listagem com {alteradas:,} saldos alterados:  {tempo_alteradas * 1000:10.1f} ms")
+    print(f"Última página de {tamanho_pagina} (pagina({ultima})):  {tempo_pagina * 1000:10.3f} ms")
+
+
+def benchmark_trabalhador(cliques=200, quantidade_historico=1_000_000):
+    print(f"=== Interface: {cliques} depósitos com fsync no diário e {quantidade_historico:,} transações ===")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco_gu_V2.NIVEL_LOG = None
+        clientes, contas = banco_gu_V2.abrir_persistencia(diretorio, fsync=True)
+        cliente = PessoaFisica("Cliente Benchmark", "01-01-1990", "00000000000", "Rua B, 2")
+        clientes.adicionar(cliente)
+        conta = ContaCorrente(1, cliente)
+        contas.adicionar(conta)
+        cliente.adicionar_conta(conta)
+        valores = array("q", [Dinheiro.de_reais(1.00)]) * quantidade_historico
+        conta.historico.adicionar_transacoes([Deposito.__name__] * quantidade_historico, valores)
+
+        # Antes: transação, gravação no diário e texto do status dentro do clique, na thread da interface
+        maior_sincrono = 0.0
+        for _ in range(cliques):
+            inicio = time.perf_counter()
+            cliente.realizar_transacao(conta, Deposito(1.00))
+            banco_gu_V2.BancoApp._texto_status(conta)
+            maior_sincrono = max(maior_sincrono, time.perf_counter() - inicio)
+
+        # Agora: o clique só enfileira; status pedidos em sequência são agrupados
+        trabalhador = banco_gu_V2.TrabalhadorBanco()
+        maior_assincrono = 0.0
+        inicio_total = time.perf_counter()
+        for _ in range(cliques):
+            inicio = time.perf_counter()
+            trabalhador.submeter(cliente.realizar_transacao, conta, Deposito(1.00))
+            trabalhador.submeter(banco_gu_V2.BancoApp._texto_status, conta, chave="status")
+            maior_assincrono = max(maior_assincrono, time.perf_counter() - inicio)
+        trabalhador.fechar()
+        tempo_total = time.perf_counter() - inicio_total
+        trabalhador.entregar_resultados()
+
+        banco_gu_V2.persistencia.fechar()
+        banco_gu_V2.persistencia = None
+        banco_gu_V2.NIVEL_LOG = logging.INFO
+
+    print(f"Maior bloqueio da interface por clique, síncrono:    {maior_sincrono * 1000:8.3f} ms")
+    print(f"Maior bloqueio da interface por clique, trabalhador: {maior_assincrono * 1000:8.3f} ms")
+    print(
+        f"Trabalhador: {trabalhador.executadas} operações em {tempo_total * 1000:.1f} ms, "
+        f"{trabalhador.agrupadas} pedidos de status agrupados"
+    )
+
+
+def criar_contas_estresse(quantidade, limite_saques, saldo_inicial=1_000_000, clientes=None, registro=None):
+    # Com clientes/registro (os de abrir_persistencia), clientes e contas também vão para o diário
+    contas = []
+    for numero in range(1, quantidade + 1):
+        cliente = PessoaFisica("Cliente Benchmark", "01-01-1990", f"{numero:011d}", "Rua B, 2")
+        conta = ContaCorrente(numero, cliente, limite_saques=limite_saques)
+        if registro is not None:
+            clientes.adicionar(cliente)
+            registro.adicionar(conta)
+            cliente.adicionar_conta(conta)
+        Deposito(saldo_inicial).registrar(conta)
+        contas.append(conta)
+    return contas
+
+
+def benchmark_executor_concorrente(threads=32, quantidade_contas=1_000, quantidade_movimentos=200_000):
+    print(f"=== ExecutorTransacoes: {threads} threads, {quantidade_contas:,} contas ===")
+
+    # Valores inteiros e saldo inicial alto: nenhum saque é recusado e as somas são exatas,
+    # então o saldo final não depende da ordem em que as threads executam os movimentos.
+    sorteio = random.Random(42)
+    movimentos = [
+        (sorteio.randrange(quantidade_contas), sorteio.choice((Saque, Deposito)), sorteio.randint(1, 500))
+        for _ in range(quantidade_movimentos)
+    ]
+
+    banco_gu_V2.NIVEL_LOG = None
+
+    contas_serial = criar_contas_estresse(quantidade_contas, limite_saques=quantidade_movimentos)
+    inicio = time.perf_counter()
+    for indice, tipo, valor in movimentos:
+        tipo(valor).registrar(contas_serial[indice])
+    tempo_serial = time.perf_counter() - inicio
+
+    contas_concorrentes = criar_contas_estresse(quantidade_contas, limite_saques=quantidade_movimentos)
+    inicio = time.perf_counter()
+    with ExecutorTransacoes(max_threads=threads) as executor:
+        executor.processar((contas_concorrentes[indice], tipo(valor)) for indice, tipo, valor in movimentos)
+    tempo_concorrente = time.perf_counter() - inicio
+
+    # Com persistência, como no BancoApp: snapshots frequentes trocam o diário enquanto as threads gravam
+    with tempfile.TemporaryDirectory() as diretorio:
+        clientes, registro = banco_gu_V2.abrir_persistencia(diretorio, movimentos_por_snapshot=20_000)
+        contas_persistidas = criar_contas_estresse(
+            quantidade_contas, limite_saques=quantidade_movimentos, clientes=clientes, registro=registro
+        )
+        inicio = time.perf_counter()
+        with ExecutorTransacoes(max_threads=threads) as executor:
+            executor.processar((contas_persistidas[indice], tipo(valor)) for indice, tipo, valor in movimentos)
+        tempo_persistido = time.perf_counter() - inicio
+
+        # Recarrega do último snapshot + diário, sem o snapshot do encerramento: o que sobraria de uma queda
+        banco_gu_V2.persistencia._arquivo_wal.flush()
+        recarga = PersistenciaBanco(diretorio)
+        _, contas_recarregadas = recarga.carregar()
+        recarga._arquivo_wal.close()
+        banco_gu_V2.persistencia.fechar()
+        banco_gu_V2.persistencia = None
+
+    banco_gu_V2.NIVEL_LOG = logging.INFO
+
+    print(f"Serial:                      {tempo_serial:8.2f} s")
+    print(f"Concorrente:                 {tempo_concorrente:8.2f} s")
+    print(f"Concorrente com persistência: {tempo_persistido:7.2f} s")
+    for descricao, contas in (
+        ("concorrente", contas_concorrentes),
+        ("com persistência", contas_persistidas),
+        ("recarregadas do disco", contas_recarregadas),
+    ):
+        divergentes = [
+            conta_serial.numero
+            for conta_serial, conta in zip(contas_serial, contas)
+            if conta_serial.saldo != conta.saldo or len(conta_serial.historico) != len(conta.historico)
+        ]
+        print(f"Contas divergentes do serial ({descricao}): {len(divergentes)}")
+        assert not divergentes, f"Saldos divergentes nas contas {divergentes[:10]}"
+
+
+def benchmark_transferencias(threads=32, quantidade_contas=1_000, quantidade_transferencias=100_000):
+    print(f"=== Transferências no ExecutorTransacoes: {threads} threads, {quantidade_contas:,} contas ===")
+
+    sorteio = random.Random(42)
+    pares = []
+    for _ in range(quantidade_transferencias):
+        origem, destino = sorteio.sample(range(quantidade_contas), 2)
+        pares.append((origem, destino, sorteio.randint(1, 500)))
+
+    banco_gu_V2.NIVEL_LOG = None
+
+    contas_serial = criar_contas_estresse(quantidade_contas, limite_saques=quantidade_transferencias)
+    inicio = time.perf_counter()
+    for origem, destino, valor in pares:
+        Transferencia(valor, contas_serial[destino]).registrar(contas_serial[origem])
+    tempo_serial = time.perf_counter() - inicio
+
+    # Cada transferência trava apenas as duas contas do par, sempre na mesma ordem
+    contas_concorrentes = criar_contas_estresse(quantidade_contas, limite_saques=quantidade_transferencias)
+    inicio = time.perf_counter()
+    with ExecutorTransacoes(max_threads=threads) as executor:
+        executor.processar(
+            (contas_concorrentes[origem], Transferencia(valor, contas_concorrentes[destino]))
+            for origem, destino, valor in pares
+        )
+    tempo_concorrente = time.perf_counter() - inicio
+
+    banco_gu_V2.NIVEL_LOG = logging.INFO
+
+    # Transferências só movem dinheiro entre contas: o total continua o dos depósitos iniciais
+    saldo_total = sum(conta.saldo for conta in contas_concorrentes)
+    divergentes = [
+        conta_serial.numero
+        for conta_serial, conta_concorrente in zip(contas_serial, contas_concorrentes)
+        if conta_serial.saldo != conta_concorrente.saldo
+    ]
+
+    for descricao, tempo in (("Serial", tempo_serial), ("Concorrente", tempo_concorrente)):
+        print(f"{descricao + ':':<12} {tempo:8.2f} s ({quantidade_transferencias / tempo:,.0f} transferências/s)")
+    print(f"Contas com saldo divergente do serial: {len(divergentes)}")
+    assert not divergentes, f"Saldos divergentes nas contas {divergentes[:10]}"
+    assert saldo_total == quantidade_contas * Dinheiro.de_reais(1_000_000), "O total em contas mudou"
+
+    # Cada débito aponta para o crédito na outra conta, e o crédito aponta de volta
+    sem_par = 0
+    for conta in contas_concorrentes:
+        historico = conta.historico
+        for indice in range(len(historico)):
+            debito = historico.transacao(indice)
+            if debito["tipo"] != Transferencia.__name__:
+                continue
+            if debito["contraparte"] is None:
+                sem_par += 1
+                continue
+            numero, indice_credito = debito["contraparte"]
+            credito = contas_concorrentes[numero - 1].historico.transacao(indice_credito)
+            if (
+                credito["tipo"] != Transferencia.TIPO_CREDITO
+                or credito["valor"] != debito["valor"]
+                or credito["contraparte"] != (conta.numero, indice)
+            ):
+                sem_par += 1
+    print(f"Transferências sem a entrada correspondente no destino: {sem_par}")
+    assert not sem_par, "Entradas de transferência sem par"
+
+
+TIPOS_MOVIMENTO = ("saque", "deposito")
+
+
+def benchmark_reproducao(quantidade_contas=10_000, quantidade_movimentos=1_000_000):
+    processos = os.cpu_count() or 1
+    print(
+        f"=== Reprodução de {quantidade_movimentos:,} movimentos em {quantidade_contas:,} contas "
+        f"({processos} núcleo(s)) ==="
+    )
+
+    aleatorio = random.Random(42)
+    # Valores em texto, como lidos de um arquivo de movimentos
+    movimentos = [
+        (aleatorio.randint(1, quantidade_contas), aleatorio.choice(TIPOS_MOVIMENTO), str(aleatorio.randint(1, 500)))
+        for _ in range(quantidade_movimentos)
+    ]
+
+    contas_serial = criar_contas_estresse(quantidade_contas, limite_saques=quantidade_movimentos)
+    inicio = time.perf_counter()
+    banco_gu_V2.processar_lote([(contas_serial[numero - 1], tipo, valor) for numero, tipo, valor in movimentos])
+    tempo_serial = time.perf_counter() - inicio
+    descricao = "processar_lote (serial)"
+    print(f"{descricao:<28}: {tempo_serial:8.2f} s ({quantidade_movimentos / tempo_serial:,.0f} movimentos/s)")
+
+    for quantidade_processos in sorted({1, 2, processos}):
+        contas = banco_gu_V2.RegistroContas()
+        for conta in criar_contas_estresse(quantidade_contas, limite_saques=quantidade_movimentos):
+            contas.adicionar(conta)
+
+        inicio = time.perf_counter()
+        banco_gu_V2.reproduzir_movimentos(contas, movimentos, processos=quantidade_processos)
+        tempo = time.perf_counter() - inicio
+
+        divergentes = [conta.numero for conta, serial in zip(contas, contas_serial) if conta.saldo != serial.saldo]
+        descricao = f"reproduzir ({quantidade_processos} processo(s))"
+        print(f"{descricao:<28}: {tempo:8.2f} s ({quantidade_movimentos / tempo:,.0f} movimentos/s)")
+        assert not divergentes, f"Saldos divergentes nas contas {divergentes[:10]}"
+
+
+def aplicar_movimentos(valores, saldo):
+    # Mesma conta do núcleo: compara com o saldo, debita se couber e credita caso contrário
+    for valor in valores:
+        if valor <= saldo:
+            saldo -= valor
+        else:
+            saldo += valor
+    return saldo
+
+
+def benchmark_dinheiro(quantidade=1_000_000, repeticoes=5):
+    print(f"=== Dinheiro: {quantidade:,} movimentos em float, Decimal e centavos inteiros ===")
+
+    sorteio = random.Random(42)
+    centavos = [sorteio.randint(1, 50_000) for _ in range(quantidade)]
+    saldo_exato = Dinheiro(aplicar_movimentos(centavos, 100_000)).reais
+
+    # (descrição, valores, saldo inicial de R$ 1.000,00, conversão do saldo final para Decimal em reais)
+    representacoes = (
+        ("float", [valor / 100 for valor in centavos], 1_000.00, Decimal),
+        ("Decimal", [Decimal(valor).scaleb(-2) for valor in centavos], Decimal("1000.00"), Decimal),
+        (
+            "centavos (int)",
+            [Dinheiro(valor) for valor in centavos],
+            Dinheiro.de_reais(1_000),
+            lambda saldo: Dinheiro(saldo).reais,
+        ),
+    )
+    for descricao, valores, saldo_inicial, em_reais in representacoes:
+        tempo = min(timeit.repeat(lambda: aplicar_movimentos(valores, saldo_inicial), number=1, repeat=repeticoes))
+        saldo = em_reais(aplicar_movimentos(valores, saldo_inicial))
+        erro = abs(saldo - saldo_exato)
+
+        print(
+            f"{descricao:<15}: {tempo * 1000:8.1f} ms | saldo R$ {saldo:,.2f} | "
+            f"diferença do exato {float(erro):.2e}"
+        )
+
+if __name__ == "__main__":
+    benchmark_limite_saques()
+    print()
+    benchmark_memoria_historico()
+    print()
+    benchmark_memoria_selada()
+    print()
+    benchmark_memoria_objetos()
+    print()
+    benchmark_agregados()
+    print()
+    benchmark_analise()
+    print()
+    benchmark_busca_clientes()
+    print()
+    benchmark_dinheiro()
+    print()
+    benchmark_decorador_log()
+    print()
+    benchmark_log_por_conta()
+    print()
+    benchmark_reinicio()
+    print()
+    benchmark_inicio()
+    print()
+    benchmark_listas_virtuais()
+    print()
+    benchmark_resumos_contas()
+    print()
+    benchmark_trabalhador()
+    print()
+    benchmark_executor_concorrente()
+    print()
+    benchmark_transferencias()
+    print()
+    benchmark_reproducao()